@@ -5,9 +5,16 @@ Backtesting package for gold-quant.
 
 Modules included:
 - backtester.py        : Candle-by-candle simulation engine
+- portfolio.py         : Multi-symbol backtest on a merged timeline with shared equity / kill switch
 - walk_forward.py      : Walk-forward validation loop
-- performance_audit.py : Metrics (PF, DD, expectancy, WFE)
+- performance_audit.py : Vectorized metrics (PF, DD, expectancy, Sharpe, Sortino, Calmar, ulcer, WFE,
+                         rolling and per-month / per-regime breakdowns)
+- monte_carlo.py       : Bootstrap / permutation resampling of trade PnL (drawdown, equity, ruin)
+- optimizer.py         : Grid / random parameter search on cached features
+- profiling.py         : cProfile / sampling profiles and component counters for runs
 """
 
 from .backtester import Backtester
+from .portfolio import PortfolioBacktester
 from .performance_audit import PerformanceAudit
+from .monte_carlo import MonteCarlo
@@ -1,5 +1,7 @@
 # backend/backtest/backtester.py
 
+import os
+import time
 import pandas as pd
 import numpy as np
 import logging
@@ -8,46 +10,116 @@ from core.signal_generator import SignalGenerator
 from risk.risk_manager import RiskManager
 from risk.kill_switch import KillSwitch
 from execution.mt5_executor import MT5Executor
+from execution.trade_logger import LOGS_FOLDER, TradeLogger
+from backtest.profiling import RunProfiler
+
+try:
+    from numba import njit
+except ImportError:  # numba is optional, the NumPy scan is used instead
+    njit = None
+
+# Rules for a bar whose range touches both SL and TP
+BOTH_TOUCHED_RULES = ("sl", "tp", "open")
+
+TRADE_COLUMNS = [
+    "symbol", "direction", "volume", "size", "entry_price", "sl", "tp", "status", "timestamp",
+    "entry_index", "entry_time", "exit_index", "exit_time", "exit_price", "exit_reason", "pnl", "equity"
+]
 
 class Backtester:
-    def __init__(self, df, account_equity=100000, risk_per_trade=0.01, mode="paper"):
+    def __init__(self, df, account_equity=100000, risk_per_trade=0.01, mode="paper",
+                 both_touched="sl", slippage_pct=0.0, seed=None, log_trades=True, symbol="XAUUSD"):
         """
-        df: DataFrame containing OHLC + indicators
+        df: DataFrame containing OHLC + indicators (+ optional 'signal' and 'atr')
         account_equity: starting capital
         risk_per_trade: fraction of equity per trade
         mode: "paper" or "live" (for MT5Executor)
+        both_touched: exit assumed when one bar touches both SL and TP:
+            "sl"   - stop loss first (pessimistic, default)
+            "tp"   - take profit first
+            "open" - whichever level is closer to the bar's open
+        slippage_pct: max random entry slippage passed to MT5Executor (0 = fill at close)
+        seed: seed for the executor's slippage, for reproducible runs
+        log_trades: False to keep simulated orders out of logs/trades.csv
+        symbol: instrument name on orders and trade rows
         """
-        self.df = df.copy()
+        if both_touched not in BOTH_TOUCHED_RULES:
+            raise ValueError(f"both_touched must be one of {BOTH_TOUCHED_RULES}")
+
+        # Not copied: columns this class adds go onto a new frame (see _arrays)
+        self.df = df
+        self.symbol = symbol
+        self.start_equity = account_equity
         self.equity = account_equity
+        self.both_touched = both_touched
         self.risk_manager = RiskManager(account_equity, risk_per_trade)
         self.kill_switch = KillSwitch()
-        self.executor = MT5Executor(mode=mode)
+        trade_logger = None if log_trades else TradeLogger(enabled=False)
+        self.executor = MT5Executor(mode=mode, slippage_pct=slippage_pct, seed=seed, trade_logger=trade_logger)
         self.signals = SignalGenerator()
         self.trades = []
+        self.equity_curve = None
+        self.profile_report = None
         self.kill_switch.reset(self.equity)
 
-        # Logging
+        # Logging (one handler per process, not per instance)
         self.logger = logging.getLogger("Backtester")
-        handler = logging.FileHandler("backend/logs/backtest.log")
-        handler.setFormatter(logging.Formatter("%(asctime)s | %(levelname)s | %(message)s"))
-        self.logger.addHandler(handler)
+        if not self.logger.handlers:
+            handler = logging.FileHandler(os.path.join(LOGS_FOLDER, "backtest.log"), delay=True)
+            handler.setFormatter(logging.Formatter("%(asctime)s | %(levelname)s | %(message)s"))
+            self.logger.addHandler(handler)
         self.logger.setLevel(logging.INFO)
 
-    def run(self):
+    def _arrays(self):
+        """Price, signal and ATR columns as float arrays"""
+        if "signal" not in self.df.columns:
+            self.df = self.df.assign(**self.signals.compute(self.df))
+        return bar_arrays(self.df)
+
+    def run(self, profile=None):
         """
-        Candle-by-candle backtest.
+        Event-driven bar-by-bar backtest.
+
+        One position at a time: a non-zero signal opens a trade at the bar's
+        close, the position is carried over the following bars and closed on
+        the first bar whose high/low reaches SL or TP (gaps fill at the open).
+        Signals while a position is open are ignored. A position still open
+        on the last bar is closed at its close.
+
+        profile: None, True, "cprofile"/"sampling", an output path prefix or a
+                 RunProfiler; profiles the run (see backtest.profiling) and
+                 stores counters and written files in self.profile_report
         """
-        for i, row in self.df.iterrows():
-            signal = self.signals.generate_signal(row)
-            
-            if signal == 0:
-                continue  # no trade
-            
+        if profile:
+            with RunProfiler.from_arg(profile, "backtest") as profiler:
+                trades = self._run()
+            self.profile_report = profiler.report()
+            return trades
+        return self._run()
+
+    def _run(self):
+        opens, high, low, close, signal, atr = self._arrays()
+        n = len(close)
+        index = self.df.index
+        signal_idx = np.flatnonzero(signal)
+        realized = np.zeros(n)
+
+        self.trades = []
+        self.equity = self.start_equity
+        self.kill_switch.reset(self.equity)
+
+        next_free = 0
+        while True:
+            k = np.searchsorted(signal_idx, next_free)
+            if k >= len(signal_idx):
+                break
+            i = int(signal_idx[k])
+            direction = int(signal[i])
+
             # Determine position size
-            atr = row.get("atr", 1)  # fallback ATR
-            entry_price = row["xau_close"]
-            stop_loss, take_profit = self.risk_manager.apply_sl_tp(
-                entry_price, signal, atr
+            entry_price = close[i]
+            stop_loss, take_profit, _, _ = self.risk_manager.apply_sl_tp(
+                entry_price, direction, atr[i]
             )
             size = self.risk_manager.calculate_position_size(entry_price, stop_loss)
 
@@ -58,41 +130,307 @@ class Backtester:
 
             # Execute trade (paper mode)
             trade = self.executor.send_order(
-                symbol="XAUUSD",
-                direction=signal,
+                symbol=self.symbol,
+                direction=direction,
                 volume=size,
                 price=entry_price,
                 sl=stop_loss,
                 tp=take_profit
             )
-            
-            # Update equity (simplified PnL calculation)
-            pnl = self._calculate_pnl(trade)
+
+            # Walk forward bar by bar until SL/TP is hit
+            j, exit_price, reason = self._find_exit(
+                opens, high, low, close, i + 1, direction, stop_loss, take_profit
+            )
+            pnl = (exit_price - trade["entry_price"]) * direction * size
             self.equity += pnl
+            realized[j] += pnl
 
+            trade.update({
+                "size": size,
+                "status": "closed",
+                "entry_index": i,
+                "entry_time": index[i],
+                "exit_index": j,
+                "exit_time": index[j],
+                "exit_price": exit_price,
+                "exit_reason": reason,
+                "pnl": pnl,
+                "equity": self.equity
+            })
             self.trades.append(trade)
             self.logger.info(f"Trade executed: {trade} | PnL: {pnl:.2f} | Equity: {self.equity:.2f}")
 
-        return pd.DataFrame(self.trades)
+            if reason == "end":
+                break
+            # The exit happens inside bar j, so a signal on j's close may re-enter
+            next_free = j
+
+        # Trade rows are written in the background; make this run's rows durable
+        # (process-pool workers exit without running atexit hooks)
+        self.executor.trade_logger.flush()
+        self.equity_curve = pd.Series(self.start_equity + np.cumsum(realized), index=index, name="equity")
+        return pd.DataFrame(self.trades, columns=TRADE_COLUMNS)
 
-    def _calculate_pnl(self, trade):
+    def run_vectorized(self, signal=None):
         """
-        Simplified PnL calculation: closes at TP/SL with fixed outcome.
-        In full version, use candle-by-candle price movement.
+        Array-only equivalent of run() for parameter sweeps.
+
+        Same rules as the event-driven path (one position at a time, SL/TP
+        first touch, gap fills, both_touched rule, kill switch drawdown stop)
+        but computed without a per-trade Python loop and without routing
+        orders through MT5Executor, so nothing is logged and fills are at
+        the signal bar's close (no random slippage).
+
+        signal: optional int array overriding the frame's 'signal' column,
+                so one Backtester can evaluate many signal sets.
         """
-        direction = trade["direction"]
-        entry = trade["entry_price"]
-        sl = trade["sl"]
-        tp = trade["tp"]
-
-        # Simulate hitting TP 50%, SL 30%, otherwise flat
-        rnd = np.random.rand()
-        if rnd < 0.5:
-            exit_price = tp
-        elif rnd < 0.8:
-            exit_price = sl
+        opens, high, low, close, frame_signal, atr = self._arrays()
+        if signal is None:
+            signal = frame_signal
+        signal = np.asarray(signal, dtype=np.int64)
+        n = len(close)
+        index = self.df.index
+
+        # Candidate entries and their SL/TP levels
+        cand = np.flatnonzero(signal)
+        direction = signal[cand]
+        entry = close[cand]
+        _, _, sl_dist, tp_dist = self.risk_manager.apply_sl_tp(0.0, 1, atr[cand])
+        sl = np.where(direction == 1, entry - sl_dist, entry + sl_dist)
+        tp = np.where(direction == 1, entry + tp_dist, entry - tp_dist)
+
+        # First bar touching SL/TP for every candidate, then exit fill
+        exit_idx = _first_touch_batch(high, low, cand + 1, direction, sl, tp)
+        ended = exit_idx < 0
+        exit_idx[ended] = n - 1
+        exit_price, is_sl = resolve_exit_batch(
+            direction, sl, tp, opens, high, low, exit_idx, self.both_touched
+        )
+        exit_price[ended] = close[n - 1]
+        reason = np.where(ended, "end", np.where(is_sl, "sl", "tp"))
+
+        # Keep only entries taken while flat: follow the chain of
+        # "next signal at or after the previous exit" from the first signal
+        nxt = np.searchsorted(cand, exit_idx)
+        nxt[ended] = len(cand)
+        taken = _follow_chain(nxt, len(cand))
+
+        # Position size (same formula as RiskManager.calculate_position_size)
+        risk_amount = self.risk_manager.account_equity * self.risk_manager.risk_per_trade
+        stop_distance = np.abs(entry[taken] - sl[taken])
+        with np.errstate(divide="ignore"):
+            size = np.where(stop_distance == 0, 1.0, np.maximum(risk_amount / stop_distance, 1))
+        pnl = (exit_price[taken] - entry[taken]) * direction[taken] * size
+        equity = np.cumsum(np.concatenate([[self.start_equity], pnl]))[1:]
+
+        # Kill switch: drawdown from peak checked with the equity before each entry
+        if 0.15 < self.kill_switch.min_expectancy:
+            keep = 0
         else:
-            exit_price = entry  # no move
+            before = np.concatenate([[self.start_equity], equity[:-1]])
+            peak = np.maximum.accumulate(before)
+            stop = np.flatnonzero((peak - before) / peak >= self.kill_switch.max_drawdown_pct)
+            keep = stop[0] if len(stop) else len(taken)
+        taken, size, pnl, equity = taken[:keep], size[:keep], pnl[:keep], equity[:keep]
+
+        entry_idx = cand[taken]
+        exit_at = exit_idx[taken]
+        self.equity = equity[-1] if len(equity) else self.start_equity
+        realized = np.bincount(exit_at, weights=pnl, minlength=n)
+        self.equity_curve = pd.Series(self.start_equity + np.cumsum(realized), index=index, name="equity")
+
+        return pd.DataFrame({
+            "symbol": self.symbol,
+            "direction": direction[taken],
+            "volume": size,
+            "size": size,
+            "entry_price": entry[taken],
+            "sl": sl[taken],
+            "tp": tp[taken],
+            "status": "closed",
+            "timestamp": time.time(),
+            "entry_index": entry_idx,
+            "entry_time": index[entry_idx],
+            "exit_index": exit_at,
+            "exit_time": index[exit_at],
+            "exit_price": exit_price[taken],
+            "exit_reason": reason[taken],
+            "pnl": pnl,
+            "equity": equity
+        }, columns=TRADE_COLUMNS)
+
+    def _find_exit(self, opens, high, low, close, start, direction, sl, tp):
+        """
+        First bar from `start` whose range reaches SL or TP.
+        Returns (bar index, exit price, reason) with reason in {"sl", "tp", "end"}.
+        """
+        return find_exit(opens, high, low, close, start, direction, sl, tp, self.both_touched)
+
+
+def bar_arrays(df):
+    """
+    (open, high, low, close, signal, atr) float/int arrays of a frame with
+    xau_* prices and a 'signal' column. Missing high/low fall back to the
+    close, a missing open to the previous close and a missing 'atr' to 1.
+    """
+    n = len(df)
+    close = df["xau_close"].to_numpy(dtype=np.float64)
+    high = df["xau_high"].to_numpy(dtype=np.float64) if "xau_high" in df else close
+    low = df["xau_low"].to_numpy(dtype=np.float64) if "xau_low" in df else close
+    if "xau_open" in df:
+        opens = df["xau_open"].to_numpy(dtype=np.float64)
+    else:
+        opens = np.concatenate([close[:1], close[:-1]])  # previous close as open proxy
+    signal = np.nan_to_num(df["signal"].to_numpy(dtype=np.float64)).astype(np.int64)
+    if "atr" in df:
+        atr = df["atr"].to_numpy(dtype=np.float64)
+    else:
+        atr = np.ones(n)  # fallback ATR
+    return opens, high, low, close, signal, atr
+
+
+def find_exit(opens, high, low, close, start, direction, sl, tp, both_touched="sl"):
+    """
+    First bar from `start` whose range reaches SL or TP.
+    Returns (bar index, exit price, reason) with reason in {"sl", "tp", "end"}.
+    """
+    j = _first_touch(high, low, start, direction, sl, tp)
+    if j < 0:
+        return len(close) - 1, close[-1], "end"
+
+    if direction == 1:
+        hit_sl, hit_tp = low[j] <= sl, high[j] >= tp
+    else:
+        hit_sl, hit_tp = high[j] >= sl, low[j] <= tp
+    return (j,) + resolve_exit(direction, sl, tp, opens[j], hit_sl, hit_tp, both_touched)
+
+
+def resolve_exit(direction, sl, tp, bar_open, hit_sl, hit_tp, both_touched="sl"):
+    """
+    Exit price and reason for a bar that touched SL and/or TP.
+    A bar opening beyond a level (gap) fills at the open.
+    """
+    # Gap through a level: filled at the open
+    if (bar_open - sl) * direction <= 0:
+        return bar_open, "sl"
+    if (bar_open - tp) * direction >= 0:
+        return bar_open, "tp"
+
+    if hit_sl and hit_tp:
+        if both_touched == "tp":
+            hit_sl = False
+        elif both_touched == "open":
+            hit_sl = abs(bar_open - sl) <= abs(tp - bar_open)
+    if hit_sl:
+        return sl, "sl"
+    return tp, "tp"
+
+
+def resolve_exit_batch(direction, sl, tp, opens, high, low, bars, both_touched="sl"):
+    """
+    Array version of resolve_exit for trades exiting on `bars`.
+    Returns (exit prices, True where the exit is a stop loss).
+    """
+    bar_open, bar_high, bar_low = opens[bars], high[bars], low[bars]
+    long = direction == 1
+    hit_sl = np.where(long, bar_low <= sl, bar_high >= sl)
+    hit_tp = np.where(long, bar_high >= tp, bar_low <= tp)
+
+    if both_touched == "sl":
+        is_sl = hit_sl
+    elif both_touched == "tp":
+        is_sl = hit_sl & ~hit_tp
+    else:
+        is_sl = hit_sl & (~hit_tp | (np.abs(bar_open - sl) <= np.abs(tp - bar_open)))
+    price = np.where(is_sl, sl, tp)
+
+    # Gap through a level: filled at the open
+    gap_sl = (bar_open - sl) * direction <= 0
+    gap_tp = ~gap_sl & ((bar_open - tp) * direction >= 0)
+    price = np.where(gap_sl | gap_tp, bar_open, price)
+    is_sl = np.where(gap_sl, True, np.where(gap_tp, False, is_sl))
+    return price, is_sl
+
+
+def _first_touch_batch(high, low, starts, direction, sl, tp, max_cells=4_000_000):
+    """
+    First bar at or after starts[k] reaching sl[k]/tp[k], for every k at once
+    (-1 if never). Scans forward windows of growing width as 2-D
+    (trades x bars) blocks, chunked to at most `max_cells` elements.
+    """
+    n = len(high)
+    result = np.full(len(starts), -1, dtype=np.int64)
+    pending = np.flatnonzero(starts < n)
+    offset, width = 0, 16
+
+    while len(pending) and offset < n:
+        rows = max(1, max_cells // width)
+        still = []
+        for c in range(0, len(pending), rows):
+            chunk = pending[c:c + rows]
+            bars = starts[chunk, None] + offset + np.arange(width)
+            valid = bars < n
+            bars = np.minimum(bars, n - 1)
+            h, l = high[bars], low[bars]
+            long = (direction[chunk] == 1)[:, None]
+            s, t = sl[chunk, None], tp[chunk, None]
+            hit = np.where(long, (l <= s) | (h >= t), (h >= s) | (l <= t)) & valid
+
+            found = hit.any(axis=1)
+            first = hit.argmax(axis=1)
+            result[chunk[found]] = bars[found, first[found]]
+            still.append(chunk[~found & valid[:, -1]])
+        pending = np.concatenate(still)
+        offset += width
+        width = min(width * 2, 4096)
+    return result
+
+
+def _follow_chain(nxt, end):
+    """
+    Indices reached from 0 by repeatedly jumping i -> nxt[i] until `end`.
+    Uses pointer doubling so the work is O(m log m) array operations.
+    """
+    if end == 0:
+        return np.zeros(0, dtype=np.int64)
+    jump = np.append(nxt, end)  # `end` is an absorbing sentinel
+    path = np.array([0])
+    while path[-1] != end:
+        # jump is nxt applied len(path) times: extend the path by as much
+        path = np.concatenate([path, jump[path]])
+        jump = jump[jump]
+    return path[path < end]
+
+
+def _first_touch_numpy(high, low, start, direction, sl, tp):
+    """Chunked array scan for the first bar reaching SL or TP (-1 if none)"""
+    n = len(high)
+    chunk = 64
+    j = start
+    while j < n:
+        end = min(n, j + chunk)
+        if direction == 1:
+            hit = (low[j:end] <= sl) | (high[j:end] >= tp)
+        else:
+            hit = (high[j:end] >= sl) | (low[j:end] <= tp)
+        if hit.any():
+            return j + int(hit.argmax())
+        j = end
+        chunk = min(chunk * 2, 65536)
+    return -1
+
+
+def _first_touch_loop(high, low, start, direction, sl, tp):
+    """Scalar version of the scan, compiled with numba when it is installed"""
+    for j in range(start, len(high)):
+        if direction == 1:
+            if low[j] <= sl or high[j] >= tp:
+                return j
+        else:
+            if high[j] >= sl or low[j] <= tp:
+                return j
+    return -1
+
 
-        pnl = (exit_price - entry) * direction * trade["volume"]
-        return pnl
+_first_touch = njit(cache=True)(_first_touch_loop) if njit is not None else _first_touch_numpy
@@ -0,0 +1,171 @@
+# backend/backtest/monte_carlo.py
+
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pandas as pd
+
+MC_METHODS = ("bootstrap", "permutation")
+
+
+class MonteCarlo:
+    """
+    Monte Carlo resampling of a backtest's trade PnL sequence.
+
+    Each path replays the trades in a random order - drawn with replacement
+    ("bootstrap") or as a shuffle of the same trades ("permutation", which
+    keeps the terminal equity and only changes the path) - from the
+    starting equity. Paths are simulated as 2-D (paths x trades) NumPy
+    blocks: index matrix -> PnL matrix -> cumulative sum -> running peak,
+    with blocks sized to at most `max_cells` elements to bound memory, and
+    optionally spread over a process pool. Every block has its own seed
+    derived from `seed`, so results do not depend on n_jobs.
+
+    Per path it records:
+        max_drawdown    - largest drop from the running equity peak, as a fraction
+                          (measured like KillSwitch: the peak starts at the start equity)
+        terminal_equity - equity after the last trade
+        min_equity      - lowest equity reached
+        ruined          - min_equity fell to (1 - ruin_pct) of the start equity
+    """
+
+    def __init__(self, pnl, account_equity=100_000, method="bootstrap", n_trades=None,
+                 seed=0, max_cells=1_000_000, n_jobs=1):
+        """
+        pnl: per-trade PnL in chronological order (array / Series)
+        account_equity: starting equity of every path
+        method: "bootstrap" or "permutation"
+        n_trades: trades per path (bootstrap only; default: len(pnl))
+        seed: base seed of the random generator
+        max_cells: max paths x trades elements simulated per block
+        n_jobs: worker processes (1 = run in this process)
+        """
+        if method not in MC_METHODS:
+            raise ValueError(f"method must be one of {MC_METHODS}")
+        self.pnl = np.asarray(pnl, dtype=np.float64)
+        self.pnl = self.pnl[~np.isnan(self.pnl)]
+        if not len(self.pnl):
+            raise ValueError("Monte Carlo needs at least one trade")
+        if method == "permutation" and n_trades not in (None, len(self.pnl)):
+            raise ValueError("permutation paths always contain every trade once")
+        self.account_equity = account_equity
+        self.method = method
+        self.n_trades = n_trades or len(self.pnl)
+        self.seed = seed
+        self.max_cells = max_cells
+        self.n_jobs = n_jobs
+        self.results = None
+
+    @classmethod
+    def from_audit(cls, audit, **kwargs):
+        """Resample the trades of a PerformanceAudit (its PnL after costs and its equity)"""
+        kwargs.setdefault("account_equity", audit.account_equity)
+        return cls(audit.pnl, **kwargs)
+
+    def run(self, n_paths=10_000, ruin_pct=0.5):
+        """
+        Simulate n_paths paths. Returns (and stores in self.results) a DataFrame
+        with one row per path: max_drawdown, terminal_equity, min_equity, ruined.
+        ruin_pct: loss of starting equity counted as ruin (0.5 = half the account)
+        """
+        rows = max(1, self.max_cells // self.n_trades)
+        blocks = [min(rows, n_paths - start) for start in range(0, n_paths, rows)]
+        seeds = np.random.SeedSequence(self.seed).spawn(len(blocks))
+        tasks = list(zip(blocks, seeds))
+        job = (self.pnl, self.account_equity, self.n_trades, self.method)
+
+        if self.n_jobs == 1 or len(tasks) <= 1:
+            _init_worker(job)
+            try:
+                stats = [_simulate_block(task) for task in tasks]
+            finally:
+                _init_worker(None)
+        else:
+            with ProcessPoolExecutor(max_workers=self.n_jobs, initializer=_init_worker,
+                                     initargs=(job,)) as pool:
+                stats = list(pool.map(_simulate_block, tasks))
+
+        max_dd, terminal, min_equity = (np.concatenate(column) for column in zip(*stats))
+        self.ruin_pct = ruin_pct
+        self.results = pd.DataFrame({
+            "max_drawdown": max_dd,
+            "terminal_equity": terminal,
+            "min_equity": min_equity,
+            "ruined": min_equity <= self.account_equity * (1 - ruin_pct),
+        })
+        return self.results
+
+    def risk_of_ruin(self):
+        """Fraction of paths that hit the ruin level"""
+        return float(self._results()["ruined"].mean())
+
+    def drawdown_limit(self, confidence=0.95):
+        """Max drawdown (fraction) not exceeded by `confidence` of the paths"""
+        return float(np.quantile(self._results()["max_drawdown"], confidence))
+
+    def configure_kill_switch(self, kill_switch, confidence=0.95, buffer=1.0):
+        """
+        Set kill_switch.max_drawdown_pct to the `confidence` drawdown quantile
+        times `buffer`: live drawdowns beyond what the resampled history
+        produces (in all but 1 - confidence of the paths) halt trading.
+        Returns the limit.
+        """
+        limit = min(self.drawdown_limit(confidence) * buffer, 1.0)
+        kill_switch.max_drawdown_pct = limit
+        return limit
+
+    def summary(self, quantiles=(0.05, 0.5, 0.95, 0.99)):
+        """Distribution quantiles of max drawdown (%) and terminal equity, and risk of ruin"""
+        results = self._results()
+        summary = {"Paths": len(results), "Trades per Path": self.n_trades, "Method": self.method}
+        dd = np.quantile(results["max_drawdown"], quantiles) * 100
+        terminal = np.quantile(results["terminal_equity"], quantiles)
+        for q, d, t in zip(quantiles, dd, terminal):
+            summary[f"Max Drawdown % p{q * 100:g}"] = d
+            summary[f"Terminal Equity p{q * 100:g}"] = t
+        summary["Mean Terminal Equity"] = results["terminal_equity"].mean()
+        summary[f"Risk of Ruin ({self.ruin_pct:.0%} loss)"] = self.risk_of_ruin()
+        return summary
+
+    def _results(self):
+        if self.results is None:
+            raise ValueError("No simulation results; call run() first")
+        return self.results
+
+
+# ----------------------------------------------------------------------
+# Block simulation (runs in the parent or in pool workers)
+# ----------------------------------------------------------------------
+_WORKER = {}
+
+
+def _init_worker(job):
+    _WORKER["job"] = job
+
+
+def _simulate_block(task):
+    """max drawdown, terminal and minimum equity of `rows` resampled paths"""
+    rows, seed = task
+    pnl, start, n_trades, method = _WORKER["job"]
+    rng = np.random.default_rng(seed)
+
+    if method == "bootstrap":
+        idx = rng.integers(0, len(pnl), size=(rows, n_trades))
+    else:
+        idx = rng.permuted(np.broadcast_to(np.arange(len(pnl)), (rows, len(pnl))), axis=1)
+    equity = pnl[idx]
+    del idx
+    np.cumsum(equity, axis=1, out=equity)
+    equity += start
+    return path_stats(equity, start)
+
+
+def path_stats(equity, start):
+    """
+    (max drawdown fraction, terminal equity, minimum equity) of every row of
+    an equity matrix (paths x trades); the running peak starts at `start`.
+    """
+    peak = np.maximum.accumulate(equity, axis=1)
+    np.maximum(peak, start, out=peak)
+    # (peak - equity) / peak = 1 - equity / peak; peak >= start > 0
+    np.divide(equity, peak, out=peak)
+    return 1 - peak.min(axis=1), equity[:, -1].copy(), equity.min(axis=1)
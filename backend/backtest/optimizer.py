@@ -0,0 +1,119 @@
+# backend/backtest/optimizer.py
+
+import itertools
+import numpy as np
+from backtest.performance_audit import PerformanceAudit
+from core.feature_engineer import FeatureEngineer
+from core.regime_detector import RegimeDetector
+from core.signal_generator import compute_signals
+
+# Parameters consumed by the signal rules; everything else goes to the backtester
+SIGNAL_PARAMS = ("z_thresh", "mom_thresh")
+SIGNAL_DEFAULTS = {"z_thresh": 1.0, "mom_thresh": 0.0}
+# Columns compute_signals reads (from FeatureEngineer + RegimeDetector)
+FEATURE_COLUMNS = ("zscore", "mom", "vol_pct", "regime")
+
+
+class ParameterSearch:
+    """
+    Grid / random search over strategy parameters on cached features.
+
+    Features and regimes are computed once for the whole data set (prepare();
+    they are causal, so every slice of the result starts warm), the
+    backtester for a slice is built once, and every candidate only pays for
+    compute_signals + Backtester.run_vectorized on those cached arrays.
+    """
+
+    def __init__(self, param_grid, n_iter=None, objective="profit_factor", min_trades=1, seed=0,
+                 feature_engineer=None, regime_detector=None):
+        """
+        param_grid: {name: list of values} or, for random search, (low, high) tuples
+                    sampled uniformly. Names in SIGNAL_PARAMS drive the signal rules,
+                    other names are passed to the strategy class.
+        n_iter: None for a full grid search, otherwise the number of random draws
+        objective: PerformanceAudit method name (higher is better) or callable(trades) -> float
+        min_trades: candidates with fewer IS trades score -inf
+        seed: seed for random search draws
+        """
+        self.param_grid = param_grid
+        self.n_iter = n_iter
+        self.objective = objective
+        self.min_trades = min_trades
+        self.seed = seed
+        self.feature_engineer = feature_engineer or FeatureEngineer()
+        self.regime_detector = regime_detector or RegimeDetector()
+        self._features = {}
+        self._backtesters = {}
+
+    def candidates(self):
+        """List of parameter dicts to evaluate"""
+        names = list(self.param_grid)
+        if self.n_iter is None:
+            values = [self.param_grid[name] for name in names]
+            return [dict(zip(names, combo)) for combo in itertools.product(*values)]
+
+        rng = np.random.default_rng(self.seed)
+        draws = []
+        for _ in range(self.n_iter):
+            params = {}
+            for name in names:
+                space = self.param_grid[name]
+                if isinstance(space, tuple):
+                    params[name] = float(rng.uniform(*space))
+                else:
+                    params[name] = space[rng.integers(len(space))]
+            draws.append(params)
+        return draws
+
+    def prepare(self, data):
+        """Feature + regime frame of a whole data set, to be sliced per window"""
+        return self.regime_detector.detect(self.feature_engineer.add_features(data))
+
+    def features(self, data, key):
+        """
+        Feature + regime frame for a data slice, cached per key. Slices of a
+        prepare()d frame are used as they are; raw OHLC slices get their
+        features computed on the slice alone.
+        """
+        if key not in self._features:
+            frame = data if set(FEATURE_COLUMNS) <= set(data.columns) else self.prepare(data)
+            arrays = tuple(frame[c].to_numpy() for c in FEATURE_COLUMNS)
+            self._features[key] = (frame, arrays)
+        return self._features[key]
+
+    def evaluate(self, strategy_class, strategy_kwargs, data, key, params):
+        """Trades of one parameter set on a (cached) data slice"""
+        frame, arrays = self.features(data, key)
+        signal_params = {**SIGNAL_DEFAULTS, **{k: v for k, v in params.items() if k in SIGNAL_PARAMS}}
+        bt_params = {**strategy_kwargs, **{k: v for k, v in params.items() if k not in SIGNAL_PARAMS}}
+
+        # repr: strategy kwargs may hold unhashable values (lists, dicts)
+        bt_key = (key, repr(sorted(bt_params.items())))
+        if bt_key not in self._backtesters:
+            self._backtesters[bt_key] = strategy_class(frame, **bt_params)
+        signal = compute_signals(*arrays, **signal_params)
+        return self._backtesters[bt_key].run_vectorized(signal=signal)
+
+    def score(self, trades):
+        if len(trades) < self.min_trades:
+            return -np.inf
+        if callable(self.objective):
+            return self.objective(trades)
+        return getattr(PerformanceAudit(trades), self.objective)()
+
+    def optimize(self, strategy_class, strategy_kwargs, data, key):
+        """
+        Evaluate every candidate on `data`.
+        Returns (best params, best score, trades of the best params).
+        """
+        best = (None, -np.inf, None)
+        for params in self.candidates():
+            trades = self.evaluate(strategy_class, strategy_kwargs, data, key, params)
+            score = self.score(trades)
+            if best[0] is None or score > best[1]:
+                best = (params, score, trades)
+        return best
+
+    def clear_cache(self):
+        self._features.clear()
+        self._backtesters.clear()
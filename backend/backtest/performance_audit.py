@@ -4,6 +4,12 @@ import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
 
+SECONDS_PER_YEAR = 365.25 * 24 * 3600
+
+# Datetime columns used (in this order) to place trades in time
+TIME_COLUMNS = ("exit_time", "entry_time")
+
+
 class PerformanceAudit:
     """
     Enhanced backtest performance audit.
@@ -11,47 +17,82 @@ class PerformanceAudit:
     - Profit Factor (PF)
     - Max Drawdown (DD) in %
     - Expectancy (average R-multiple)
+    - Sharpe, Sortino and Calmar ratios, ulcer index, win rate
     - Walk-Forward Efficiency (WFE)
+    - Rolling-window PF / drawdown and per-month / per-regime breakdowns
     - Equity curve plotting
+
+    All metrics come from one pass of NumPy array operations over the trades
+    (cumulative sums, running maxima, bincount group sums), done once in the
+    constructor, so millions of trades need no Python-level loop.
+
+    Two equity bases are used:
+    - max_drawdown() / 'drawdown_pct' follow the cumulative PnL from zero
+      (as they always have)
+    - the ratio metrics and the ulcer index follow account equity
+      (account_equity + cumulative PnL); trade returns are PnL / equity
+      before the trade
     """
 
-    def __init__(self, trades: pd.DataFrame, commission_per_trade=0, slippage_pct=0.0):
+    def __init__(self, trades: pd.DataFrame, commission_per_trade=0, slippage_pct=0.0,
+                 account_equity=100_000, periods_per_year=None):
         """
         trades: DataFrame with columns:
             - 'entry_price', 'exit_price', 'direction' (1=LONG, -1=SHORT), 'size'
+            - optional datetime 'exit_time' / 'entry_time' for per-month
+              stats and annualization, 'regime' or 'entry_index' for per-regime stats
         commission_per_trade: fixed cost per trade
         slippage_pct: fraction of price applied as slippage (0.001 = 0.1%)
+        account_equity: starting equity the ratio metrics are computed on
+        periods_per_year: trades per year used to annualize Sharpe / Sortino /
+            Calmar (default: derived from the trade times, else not annualized)
         """
-        self.trades = trades.copy()
         self.commission = commission_per_trade
         self.slippage_pct = slippage_pct
+        self.account_equity = account_equity
+        self.periods_per_year = periods_per_year
+        self.trades = trades
         self._compute_returns()
 
     def _compute_returns(self):
-        """Compute PnL and R-multiple for each trade"""
-        # Apply slippage
-        self.trades['slippage'] = self.trades['entry_price'] * self.slippage_pct
-        self.trades['pnl'] = self.trades['direction'] * (self.trades['exit_price'] - self.trades['entry_price'] - self.trades['slippage']) * self.trades['size']
-        # Subtract commission
-        self.trades['pnl'] -= self.commission
+        """Compute PnL, R-multiple, equity and drawdown arrays for all trades"""
+        trades = self.trades
+        entry = trades['entry_price'].to_numpy(dtype=np.float64)
+        exit_price = trades['exit_price'].to_numpy(dtype=np.float64)
+        direction = trades['direction'].to_numpy(dtype=np.float64)
+        size = trades['size'].to_numpy(dtype=np.float64)
+
+        # Apply slippage, subtract commission
+        slippage = entry * self.slippage_pct
+        pnl = direction * (exit_price - entry - slippage) * size - self.commission
 
-        # Compute cumulative equity
-        self.trades['equity_curve'] = self.trades['pnl'].cumsum()
+        # Cumulative PnL and its drawdown in %
+        equity_curve = np.cumsum(pnl)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            peak = np.maximum.accumulate(equity_curve)
+            drawdown_pct = (peak - equity_curve) / peak * 100
 
-        # Compute drawdown in %
-        equity = self.trades['equity_curve']
-        peak = equity.cummax()
-        self.trades['drawdown_pct'] = (peak - equity) / peak * 100
+            # R-multiple assuming 1% risk per trade for simplicity
+            R = pnl / (size * entry * 0.01)
 
-        # Compute R-multiple assuming 1% risk per trade for simplicity
-        risk_per_trade = self.trades['entry_price'] * 0.01
-        self.trades['R'] = self.trades['pnl'] / (self.trades['size'] * risk_per_trade)
+        # Account equity, per-trade returns and drawdown from the equity peak
+        account = self.account_equity + equity_curve
+        before = np.concatenate([[self.account_equity], account[:-1]])
+        with np.errstate(divide="ignore", invalid="ignore"):
+            self.returns = pnl / before
+            account_peak = np.maximum.accumulate(np.concatenate([[self.account_equity], account]))[1:]
+            self.account_drawdown = (account_peak - account) / account_peak
+
+        self.pnl = pnl
+        self.R = R
+        self.account = account
+        self.trades = trades.assign(
+            slippage=slippage, pnl=pnl, equity_curve=equity_curve, drawdown_pct=drawdown_pct, R=R
+        )
 
     def profit_factor(self):
         """Profit Factor = sum(profits) / abs(sum(losses)"""
-        profits = self.trades[self.trades['pnl'] > 0]['pnl'].sum()
-        losses = self.trades[self.trades['pnl'] < 0]['pnl'].sum()
-        return np.inf if losses == 0 else profits / abs(losses)
+        return profit_factor(self.pnl)
 
     def max_drawdown(self):
         """Maximum drawdown in %"""
@@ -61,11 +102,167 @@ class PerformanceAudit:
         """Expectancy = average R-multiple"""
         return self.trades['R'].mean()
 
-    def walk_forward_efficiency(self, oos_trades: pd.DataFrame):
-        """WFE = PF(OoS) / PF(IS)"""
+    def win_rate(self):
+        """Fraction of trades with a positive PnL"""
+        return float(np.mean(self.pnl > 0)) if len(self.pnl) else np.nan
+
+    # ------------------------------------------------------------------
+    # Risk-adjusted ratios
+    # ------------------------------------------------------------------
+    def annualization(self):
+        """Trades per year used to annualize ratios (1 when unknown)"""
+        if self.periods_per_year is not None:
+            return self.periods_per_year
+        years = self.years()
+        return len(self.pnl) / years if years else 1.0
+
+    def years(self):
+        """Time spanned by the trades in years (None without trade times)"""
+        times = self.times()
+        if times is None or len(times) < 2:
+            return None
+        span = (times.max() - times.min()).total_seconds()
+        return span / SECONDS_PER_YEAR if span > 0 else None
+
+    def sharpe(self):
+        """Mean / std of per-trade returns, annualized"""
+        r = self.returns
+        if len(r) < 2:
+            return np.nan
+        std = r.std(ddof=1)
+        return np.nan if std == 0 else r.mean() / std * np.sqrt(self.annualization())
+
+    def sortino(self):
+        """Mean per-trade return / downside deviation, annualized"""
+        r = self.returns
+        if len(r) < 2:
+            return np.nan
+        downside = np.sqrt(np.mean(np.minimum(r, 0.0) ** 2))
+        return np.inf if downside == 0 else r.mean() / downside * np.sqrt(self.annualization())
+
+    def cagr(self):
+        """Compound annual growth of account equity (total return without trade times)"""
+        if not len(self.account):
+            return np.nan
+        growth = self.account[-1] / self.account_equity
+        years = self.years()
+        if years is None:
+            return growth - 1
+        return np.sign(growth) * abs(growth) ** (1 / years) - 1
+
+    def calmar(self):
+        """CAGR / maximum account drawdown"""
+        max_dd = self.max_account_drawdown()
+        if np.isnan(max_dd):
+            return np.nan
+        return np.inf if max_dd == 0 else self.cagr() / max_dd
+
+    def max_account_drawdown(self):
+        """Maximum drawdown of account equity as a fraction"""
+        return float(self.account_drawdown.max()) if len(self.account_drawdown) else np.nan
+
+    def ulcer_index(self):
+        """Root mean square of the account drawdown in %"""
+        dd = self.account_drawdown
+        return float(np.sqrt(np.mean((dd * 100) ** 2))) if len(dd) else np.nan
+
+    # ------------------------------------------------------------------
+    # Rolling and grouped statistics
+    # ------------------------------------------------------------------
+    def rolling(self, window=50):
+        """
+        Statistics over the trailing `window` trades, one row per trade:
+        pf, win_rate, expectancy and drawdown_pct (account drawdown from the
+        highest equity within the window, in %). NaN until the window is full.
+        """
+        gains = _window_sums(np.maximum(self.pnl, 0.0), window)
+        losses = -_window_sums(np.minimum(self.pnl, 0.0), window)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            pf = np.where(losses == 0, np.inf, gains / losses)
+        pf[np.isnan(gains)] = np.nan
+
+        window_peak = pd.Series(self.account).rolling(window).max().to_numpy()
+        return pd.DataFrame({
+            "pf": pf,
+            "win_rate": _window_sums((self.pnl > 0).astype(np.float64), window) / window,
+            "expectancy": _window_sums(self.R, window) / window,
+            "drawdown_pct": (window_peak - self.account) / window_peak * 100,
+        }, index=self.trades.index)
+
+    def breakdown(self, keys):
+        """
+        Per-group statistics for any per-trade key array (month, regime, ...):
+        trades, pnl, gross profit / loss, pf, win_rate, expectancy, return.
+        Groups are summed with np.bincount; the result is sorted by key.
+        """
+        if not isinstance(keys, (pd.Index, pd.Series, np.ndarray)):
+            keys = np.asarray(keys)
+        codes, groups = pd.factorize(keys, sort=True)
+        valid = codes >= 0
+        codes, pnl, R, returns = codes[valid], self.pnl[valid], self.R[valid], self.returns[valid]
+        m = len(groups)
+
+        def total(values):
+            return np.bincount(codes, weights=values, minlength=m)
+
+        count = np.bincount(codes, minlength=m)
+        profit = total(np.maximum(pnl, 0.0))
+        loss = -total(np.minimum(pnl, 0.0))
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return pd.DataFrame({
+                "trades": count,
+                "pnl": total(pnl),
+                "gross_profit": profit,
+                "gross_loss": loss,
+                "pf": np.where(loss == 0, np.inf, profit / loss),
+                "win_rate": total((pnl > 0).astype(np.float64)) / count,
+                "expectancy": total(R) / count,
+                # Compounded return of the group's trades
+                "return": np.expm1(total(np.log1p(returns))),
+            }, index=pd.Index(groups, name="group"))
+
+    def by_month(self):
+        """breakdown() per calendar month of the trade times"""
+        times = self.times()
+        if times is None:
+            raise ValueError(f"Per-month stats need one of the columns {TIME_COLUMNS}")
+        table = self.breakdown(times.to_period("M"))
+        table.index.name = "month"
+        return table
+
+    def by_regime(self, regime=None):
+        """
+        breakdown() per market regime at entry.
+        regime: per-bar regime array / Series of the backtested frame, looked up
+                with the trades' 'entry_index' (default: the trades' 'regime' column)
+        """
+        if regime is None:
+            if 'regime' not in self.trades:
+                raise ValueError("Per-regime stats need a 'regime' column or a per-bar regime array")
+            keys = self.trades['regime'].to_numpy()
+        else:
+            keys = np.asarray(regime)[self.trades['entry_index'].to_numpy(dtype=np.int64)]
+        table = self.breakdown(keys)
+        table.index.name = "regime"
+        return table
+
+    def times(self):
+        """Trade times as a DatetimeIndex (None without a datetime time column)"""
+        for col in TIME_COLUMNS:
+            if col in self.trades and pd.api.types.is_datetime64_any_dtype(self.trades[col]):
+                return pd.DatetimeIndex(self.trades[col])
+        return None
+
+    def walk_forward_efficiency(self, oos_trades):
+        """
+        WFE = PF(OoS) / PF(IS)
+        oos_trades: out-of-sample trades DataFrame, or their PerformanceAudit
+        """
         in_sample_pf = self.profit_factor()
-        oos_audit = PerformanceAudit(oos_trades, self.commission, self.slippage_pct)
-        oos_pf = oos_audit.profit_factor()
+        if isinstance(oos_trades, PerformanceAudit):
+            oos_pf = oos_trades.profit_factor()
+        else:
+            oos_pf = profit_factor(_trade_pnl(oos_trades, self.commission, self.slippage_pct))
         return 0 if in_sample_pf == 0 else oos_pf / in_sample_pf
 
     def plot_equity_curve(self, title="Equity Curve"):
@@ -87,3 +284,42 @@ class PerformanceAudit:
             "Max Drawdown %": self.max_drawdown(),
             "Expectancy": self.expectancy()
         }
+
+    def metrics(self):
+        """Every scalar metric, keyed as in WalkForward results (PF, MaxDD%, ...)"""
+        return {
+            "PF": self.profit_factor(),
+            "MaxDD%": self.max_drawdown(),
+            "Expectancy": self.expectancy(),
+            "Trades": len(self.pnl),
+            "WinRate": self.win_rate(),
+            "Sharpe": self.sharpe(),
+            "Sortino": self.sortino(),
+            "Calmar": self.calmar(),
+            "Ulcer": self.ulcer_index(),
+        }
+
+
+def profit_factor(pnl):
+    """sum(profits) / abs(sum(losses)) of a PnL array (inf without losses)"""
+    pnl = np.asarray(pnl, dtype=np.float64)
+    profits = pnl[pnl > 0].sum()
+    losses = pnl[pnl < 0].sum()
+    return np.inf if losses == 0 else profits / abs(losses)
+
+
+def _trade_pnl(trades, commission=0, slippage_pct=0.0):
+    """Per-trade PnL as computed by PerformanceAudit, without building one"""
+    entry = trades['entry_price'].to_numpy(dtype=np.float64)
+    return (trades['direction'].to_numpy(dtype=np.float64)
+            * (trades['exit_price'].to_numpy(dtype=np.float64) - entry - entry * slippage_pct)
+            * trades['size'].to_numpy(dtype=np.float64)) - commission
+
+
+def _window_sums(values, window):
+    """Sum of each trailing window of `window` values (NaN until the first full window)"""
+    csum = np.concatenate([[0.0], np.cumsum(values, dtype=np.float64)])
+    out = np.full(len(values), np.nan)
+    if len(values) >= window:
+        out[window - 1:] = csum[window:] - csum[:-window]
+    return out
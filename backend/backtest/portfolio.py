@@ -0,0 +1,191 @@
+# backend/backtest/portfolio.py
+
+import os
+import heapq
+import logging
+import numpy as np
+import pandas as pd
+from core.signal_generator import SignalGenerator
+from risk.risk_manager import RiskManager
+from risk.kill_switch import KillSwitch
+from execution.mt5_executor import MT5Executor
+from execution.trade_logger import LOGS_FOLDER, TradeLogger
+from backtest.backtester import BOTH_TOUCHED_RULES, TRADE_COLUMNS, bar_arrays, find_exit
+
+# Event kinds; at equal timestamps exits are handled before entries so a
+# position closed inside a bar frees its equity for signals on that bar's close
+EXIT, ENTRY = 0, 1
+
+
+class PortfolioBacktester:
+    """
+    Event-driven backtest of several symbols against one shared account.
+
+    Every symbol follows the Backtester rules (one position per symbol,
+    entry at the signal bar's close, exit on the first bar reaching SL/TP,
+    gaps fill at the open, open positions closed on the symbol's last bar),
+    but all symbols draw on the same RiskManager equity and KillSwitch:
+    realized PnL from any symbol changes the size of the next trade on every
+    symbol, and the drawdown check sees the combined book.
+
+    The timeline is a heap-merged event queue holding at most one pending
+    event per symbol (its next entry signal or its open position's exit),
+    so a run costs O(events * log(symbols)) rather than symbols x bars.
+    """
+
+    def __init__(self, frames, account_equity=100000, risk_per_trade=0.01, mode="paper",
+                 both_touched="sl", slippage_pct=0.0, seed=None, log_trades=True,
+                 risk_manager=None, kill_switch=None):
+        """
+        frames: {symbol: DataFrame} of OHLC + indicators (+ optional 'signal' and 'atr')
+                with comparable (e.g. datetime) indexes
+        account_equity: starting capital shared by all symbols
+        risk_per_trade: fraction of the current equity risked per trade
+        mode, both_touched, slippage_pct, seed, log_trades: as in Backtester
+        risk_manager / kill_switch: shared instances to use (e.g. a kill switch
+                configured from a Monte Carlo run); new ones by default
+        """
+        if both_touched not in BOTH_TOUCHED_RULES:
+            raise ValueError(f"both_touched must be one of {BOTH_TOUCHED_RULES}")
+        if not frames:
+            raise ValueError("PortfolioBacktester needs at least one symbol")
+
+        self.frames = dict(frames)
+        self.symbols = list(self.frames)
+        self.start_equity = account_equity
+        self.equity = account_equity
+        self.both_touched = both_touched
+        self.risk_manager = risk_manager or RiskManager(account_equity, risk_per_trade)
+        self.kill_switch = kill_switch or KillSwitch()
+        trade_logger = None if log_trades else TradeLogger(enabled=False)
+        self.executor = MT5Executor(mode=mode, slippage_pct=slippage_pct, seed=seed, trade_logger=trade_logger)
+        self.signals = SignalGenerator()
+        self.trades = []
+        self.equity_curve = None
+
+        # Shares the Backtester log
+        self.logger = logging.getLogger("Backtester")
+        if not self.logger.handlers:
+            handler = logging.FileHandler(os.path.join(LOGS_FOLDER, "backtest.log"), delay=True)
+            handler.setFormatter(logging.Formatter("%(asctime)s | %(levelname)s | %(message)s"))
+            self.logger.addHandler(handler)
+        self.logger.setLevel(logging.INFO)
+
+    def _arrays(self, symbol):
+        df = self.frames[symbol]
+        if "signal" not in df.columns:
+            df = self.frames[symbol] = df.assign(**self.signals.compute(df))
+        return bar_arrays(df)
+
+    def run(self):
+        """
+        Step all symbols on the merged timeline. Returns the trades of every
+        symbol (in entry order) and stores the combined equity curve, indexed
+        by the union of the symbols' bar times, in self.equity_curve.
+        """
+        books = {}
+        queue = []
+        for order, symbol in enumerate(self.symbols):
+            opens, high, low, close, signal, atr = self._arrays(symbol)
+            books[symbol] = {
+                "order": order,
+                "index": self.frames[symbol].index,
+                "bars": (opens, high, low, close),
+                "signal": signal,
+                "signal_idx": np.flatnonzero(signal),
+                "atr": atr,
+                "position": None,
+            }
+            self._push_entry(queue, books[symbol], symbol, 0)
+
+        self.trades = []
+        self.equity = self.start_equity
+        self.risk_manager.account_equity = self.equity
+        self.kill_switch.reset(self.equity)
+        halted = False
+
+        while queue:
+            _, kind, _, symbol, i = heapq.heappop(queue)
+            book = books[symbol]
+
+            if kind == EXIT:
+                trade = book["position"]
+                book["position"] = None
+                self.equity += trade["pnl"]
+                # Position sizing follows the combined realized equity
+                self.risk_manager.account_equity = self.equity
+                trade["equity"] = self.equity
+                self.logger.info(f"Trade closed: {trade} | PnL: {trade['pnl']:.2f} | Equity: {self.equity:.2f}")
+                if trade["exit_reason"] != "end" and not halted:
+                    # The exit happens inside bar i, so a signal on i's close may re-enter
+                    self._push_entry(queue, book, symbol, i)
+                continue
+
+            if not self.kill_switch.is_system_active(self.equity, expectancy=0.15):
+                # No new entries on any symbol; open positions run to their exits
+                self.logger.info("Kill switch triggered, no new portfolio entries.")
+                halted = True
+                queue = [event for event in queue if event[1] == EXIT]
+                heapq.heapify(queue)
+                continue
+
+            trade = self._open(symbol, book, i)
+            self.trades.append(trade)
+            book["position"] = trade
+            j = trade["exit_index"]
+            heapq.heappush(queue, (book["index"][j], EXIT, book["order"], symbol, j))
+
+        # Trade rows are written in the background; make this run's rows durable
+        self.executor.trade_logger.flush()
+        self.equity_curve = self._equity_curve(books)
+        return pd.DataFrame(self.trades, columns=TRADE_COLUMNS)
+
+    def _push_entry(self, queue, book, symbol, start):
+        """Queue the symbol's first signal at or after bar `start`"""
+        k = np.searchsorted(book["signal_idx"], start)
+        if k < len(book["signal_idx"]):
+            i = int(book["signal_idx"][k])
+            heapq.heappush(queue, (book["index"][i], ENTRY, book["order"], symbol, i))
+
+    def _open(self, symbol, book, i):
+        """Size and send the order for bar i and resolve its exit"""
+        opens, high, low, close = book["bars"]
+        direction = int(book["signal"][i])
+        entry_price = close[i]
+        stop_loss, take_profit, _, _ = self.risk_manager.apply_sl_tp(entry_price, direction, book["atr"][i])
+        size = self.risk_manager.calculate_position_size(entry_price, stop_loss)
+
+        trade = self.executor.send_order(
+            symbol=symbol,
+            direction=direction,
+            volume=size,
+            price=entry_price,
+            sl=stop_loss,
+            tp=take_profit
+        )
+        j, exit_price, reason = find_exit(
+            opens, high, low, close, i + 1, direction, stop_loss, take_profit, self.both_touched
+        )
+        index = book["index"]
+        trade.update({
+            "size": size,
+            "status": "closed",
+            "entry_index": i,
+            "entry_time": index[i],
+            "exit_index": j,
+            "exit_time": index[j],
+            "exit_price": exit_price,
+            "exit_reason": reason,
+            "pnl": (exit_price - trade["entry_price"]) * direction * size,
+            "equity": np.nan  # set when the exit event is processed
+        })
+        return trade
+
+    def _equity_curve(self, books):
+        """Realized equity of the whole book on the union of the symbols' bar times"""
+        timeline = books[self.symbols[0]]["index"]
+        for symbol in self.symbols[1:]:
+            timeline = timeline.union(books[symbol]["index"])
+        pnl = pd.Series([t["pnl"] for t in self.trades], index=[t["exit_time"] for t in self.trades], dtype=float)
+        realized = pnl.groupby(level=0).sum().reindex(timeline, fill_value=0.0)
+        return pd.Series(self.start_equity + np.cumsum(realized.to_numpy()), index=timeline, name="equity")
@@ -0,0 +1,241 @@
+# backend/backtest/profiling.py
+
+import os
+import sys
+import time
+import pstats
+import logging
+import cProfile
+from collections import Counter
+from datetime import datetime
+import pandas as pd
+from execution.trade_logger import LOGS_FOLDER
+
+try:
+    from pyinstrument import Profiler as SamplingProfiler
+except ImportError:  # sampling profiler is optional
+    SamplingProfiler = None
+
+PROFILE_FOLDER = os.path.join(LOGS_FOLDER, "profiles")
+PROFILE_MODES = ("auto", "cprofile", "sampling")
+
+_INHERITED = object()
+
+# (module, attribute, counter, amount(args, result)) patched while a profile is active.
+# Modules are looked up under both their plain and 'backend.'-prefixed names.
+COUNTED_FUNCTIONS = [
+    ("core.signal_generator", "compute_signals", "signals_evaluated", lambda args, result: len(result)),
+    ("backtest.optimizer", "compute_signals", "signals_evaluated", lambda args, result: len(result)),
+]
+COUNTED_METHODS = [
+    ("execution.mt5_executor", "MT5Executor", "send_order", "orders_sent", lambda args, result: 1),
+    ("execution.trade_logger", "TradeLogger", "_put", "log_writes", lambda args, result: int(args[0].enabled)),
+]
+
+
+class RunProfiler:
+    """
+    Profiles one backtest / walk-forward run and counts component activity.
+
+    Used as a context manager around the run. Depending on `mode` the run
+    is profiled with cProfile or, if pyinstrument is installed, with its
+    sampling profiler ("auto" prefers sampling). On exit it writes
+    <path>.collapsed - one "frame;frame;frame weight_us" line per stack,
+    ready for flamegraph.pl / speedscope - and, for cProfile, <path>.prof.
+
+    While active it also counts:
+        signals_evaluated - rows passed through compute_signals
+        orders_sent       - MT5Executor.send_order calls
+        log_writes        - log records emitted + trade rows queued to disk
+        dataframe_copies  - DataFrame.copy() calls
+    Counters and profiles cover the current process only (windows run by a
+    WalkForward process pool are not included; profile with n_jobs=1).
+    """
+
+    def __init__(self, path=None, mode="auto", name="run"):
+        """
+        path: output prefix (default logs/profiles/<name>_<timestamp>)
+        mode: "auto", "cprofile" or "sampling"
+        """
+        if mode not in PROFILE_MODES:
+            raise ValueError(f"mode must be one of {PROFILE_MODES}")
+        if mode == "sampling" and SamplingProfiler is None:
+            raise ValueError("Sampling mode needs pyinstrument installed")
+        self.mode = "sampling" if mode == "sampling" or (mode == "auto" and SamplingProfiler) else "cprofile"
+        self.path = path or os.path.join(PROFILE_FOLDER, f"{name}_{datetime.now():%Y%m%d_%H%M%S}")
+        self.counters = Counter()
+        self.elapsed = None
+        self.files = []
+        self._patches = []
+
+    @classmethod
+    def from_arg(cls, profile, name):
+        """profile argument of run(): True, a mode string, an output path or a RunProfiler"""
+        if isinstance(profile, cls):
+            return profile
+        if profile is True:
+            return cls(name=name)
+        if profile in PROFILE_MODES:
+            return cls(mode=profile, name=name)
+        return cls(path=str(profile), name=name)
+
+    def __enter__(self):
+        self._instrument()
+        try:
+            self._profiler = SamplingProfiler(interval=0.001) if self.mode == "sampling" else cProfile.Profile()
+            self._t0 = time.perf_counter()
+            if self.mode == "sampling":
+                self._profiler.start()
+            else:
+                self._profiler.enable()
+        except BaseException:
+            self._restore()  # __exit__ is not called when __enter__ raises
+            raise
+        return self
+
+    def __exit__(self, *exc):
+        # The patched classes are restored even if stopping / reading the profiler fails
+        try:
+            if self.mode == "sampling":
+                session = self._profiler.stop()
+                stacks = _sampled_stacks(session.root_frame())
+            else:
+                self._profiler.disable()
+                stats = pstats.Stats(self._profiler)
+                stacks = _cprofile_stacks(stats)
+        finally:
+            self.elapsed = time.perf_counter() - self._t0
+            self._restore()
+
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        collapsed = f"{self.path}.collapsed"
+        with open(collapsed, "w") as f:
+            for stack, weight in sorted(stacks.items()):
+                if weight > 0:
+                    f.write(f"{stack} {weight}\n")
+        self.files = [collapsed]
+        if self.mode == "cprofile":
+            stats.dump_stats(f"{self.path}.prof")
+            self.files.append(f"{self.path}.prof")
+        return False
+
+    def report(self):
+        """Counters, wall time and written files"""
+        return {
+            "mode": self.mode,
+            "elapsed": self.elapsed,
+            "counters": {k: self.counters.get(k, 0) for k in
+                         ("signals_evaluated", "orders_sent", "log_writes", "dataframe_copies")},
+            "files": list(self.files),
+        }
+
+    # ------------------------------------------------------------------
+    # Counters
+    # ------------------------------------------------------------------
+    def _instrument(self):
+        counters = self.counters
+
+        def counted(fn, key, amount):
+            def wrapper(*args, **kwargs):
+                result = fn(*args, **kwargs)
+                counters[key] += amount(args, result)
+                return result
+            wrapper.__wrapped__ = fn
+            return wrapper
+
+        for module_name, attr, key, amount in COUNTED_FUNCTIONS:
+            for module in _loaded(module_name):
+                self._patch(module, attr, counted(getattr(module, attr), key, amount))
+        for module_name, cls_name, attr, key, amount in COUNTED_METHODS:
+            for module in _loaded(module_name):
+                cls = getattr(module, cls_name)
+                self._patch(cls, attr, counted(getattr(cls, attr), key, amount))
+        self._patch(pd.DataFrame, "copy", counted(pd.DataFrame.copy, "dataframe_copies", lambda args, result: 1))
+
+        class _CountingHandler(logging.Handler):
+            def emit(self, record):
+                counters["log_writes"] += 1
+
+        self._handler = _CountingHandler()
+        logging.getLogger().addHandler(self._handler)
+
+    def _patch(self, owner, attr, value):
+        # Inherited attributes (DataFrame.copy lives on NDFrame) are shadowed, then removed
+        self._patches.append((owner, attr, owner.__dict__.get(attr, _INHERITED)))
+        setattr(owner, attr, value)
+
+    def _restore(self):
+        logging.getLogger().removeHandler(self._handler)
+        for owner, attr, original in reversed(self._patches):
+            if original is _INHERITED:
+                delattr(owner, attr)
+            else:
+                setattr(owner, attr, original)
+        self._patches = []
+
+
+def _loaded(module_name):
+    """Module objects loaded under the plain and the 'backend.' package name"""
+    return [sys.modules[name] for name in (module_name, f"backend.{module_name}") if name in sys.modules]
+
+
+def _label(func):
+    """pstats (file, line, name) -> 'name (file:line)'"""
+    filename, line, name = func
+    if filename == "~":
+        return name.strip("<>").replace(" ", "_")
+    return f"{name} ({os.path.basename(filename)}:{line})"
+
+
+def _cprofile_stacks(stats, max_depth=64, min_us=1):
+    """
+    Approximate full stacks from cProfile's caller/callee pairs: walk down
+    from the root calls, giving each child the share of its cumulative time
+    that came from this parent, and emit self time (tottime) per stack.
+    """
+    table = stats.stats
+    children = {}
+    for func, (cc, nc, tt, ct, callers) in table.items():
+        for caller, edge in callers.items():
+            children.setdefault(caller, []).append((func, edge[3]))
+
+    stacks = Counter()
+
+    def visit(func, path, share, depth):
+        cc, nc, tt, ct, callers = table[func]
+        stack = path + (_label(func),)
+        weight = int(tt * share * 1e6)
+        if weight >= min_us:
+            stacks[";".join(stack)] += weight
+        if depth >= max_depth:
+            return
+        for child, edge_ct in children.get(func, ()):
+            child_ct = table[child][3]
+            if child_ct <= 0 or _label(child) in stack:
+                continue
+            child_share = share * min(edge_ct / child_ct, 1.0)
+            if child_share * child_ct * 1e6 >= min_us:
+                visit(child, stack, child_share, depth + 1)
+
+    roots = [func for func, row in table.items() if not row[4]]
+    for root in roots:
+        visit(root, (), 1.0, 0)
+    return stacks
+
+
+def _sampled_stacks(root):
+    """pyinstrument frame tree -> collapsed stacks weighted by self time (us)"""
+    stacks = Counter()
+
+    def visit(frame, path):
+        if frame is None:
+            return
+        stack = path + (f"{frame.function} ({os.path.basename(frame.file_path_short or '')}:{frame.line_no})",)
+        self_time = getattr(frame, "total_self_time", 0.0)
+        stacks[";".join(stack)] += int(self_time * 1e6)
+        for child in frame.children:
+            if not getattr(child, "is_synthetic", False):
+                visit(child, stack)
+
+    visit(root, ())
+    return stacks
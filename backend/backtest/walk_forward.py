@@ -1,8 +1,17 @@
 # backend/backtest/walk_forward.py
 
+import os
+import random
+import shutil
+import inspect
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
 import pandas as pd
 from backtest.backtester import Backtester
 from backtest.performance_audit import PerformanceAudit
+from backtest.optimizer import ParameterSearch
+from backtest.profiling import RunProfiler
 import matplotlib.pyplot as plt
 
 class WalkForward:
@@ -10,62 +19,87 @@ class WalkForward:
     Walk-forward validation engine.
     Splits data into rolling in-sample (IS) and out-of-sample (OOS) periods,
     backtests each IS period, evaluates OOS performance, and computes WFE.
+
+    With a param_grid, each IS period is optimized (grid or random search on
+    cached features, see ParameterSearch) and the best IS parameters are
+    applied to the following OOS period.
     """
 
-    def __init__(self, data: pd.DataFrame, strategy_class, is_window=1000, oos_window=250, **strategy_kwargs):
+    def __init__(self, data: pd.DataFrame, strategy_class, is_window=1000, oos_window=250,
+                 n_jobs=1, seed=0, param_grid=None, n_iter=None, objective="profit_factor",
+                 **strategy_kwargs):
         """
         data: DataFrame with market data (OHLC)
         strategy_class: class implementing the strategy (e.g., Backtester)
         is_window: number of candles for in-sample
         oos_window: number of candles for out-of-sample
+        n_jobs: number of worker processes (1 = run serially in this process)
+        seed: base seed; window i runs with seed + i whatever n_jobs is
+        param_grid: optional {param: values} to optimize on every IS period;
+                    data must then hold raw OHLC (features are computed once on
+                    the whole frame and sliced per window)
+        n_iter: random search draws instead of the full grid
+        objective: PerformanceAudit method (or callable on trades) maximized in-sample
         strategy_kwargs: arguments passed to strategy_class
         """
         self.data = data
         self.strategy_class = strategy_class
         self.is_window = is_window
         self.oos_window = oos_window
+        self.n_jobs = n_jobs
+        self.seed = seed
         self.strategy_kwargs = strategy_kwargs
+        self.search = None
+        if param_grid is not None:
+            self.search = ParameterSearch(param_grid, n_iter=n_iter, objective=objective, seed=seed)
         self.results = []
+        self.profile_report = None
 
-    def run(self):
+    def windows(self):
+        """(start, is_end, oos_end) row positions of every IS/OOS split"""
+        splits = []
         start = 0
         total_length = len(self.data)
-
         while start + self.is_window + self.oos_window <= total_length:
-            is_data = self.data.iloc[start:start+self.is_window]
-            oos_data = self.data.iloc[start+self.is_window:start+self.is_window+self.oos_window]
-
-            # Backtest in-sample
-            is_bt = self.strategy_class(is_data, **self.strategy_kwargs)
-            is_trades = is_bt.run_backtest()
-            is_audit = PerformanceAudit(is_trades)
-            
-            # Backtest out-of-sample using same strategy parameters
-            oos_bt = self.strategy_class(oos_data, **self.strategy_kwargs)
-            oos_trades = oos_bt.run_backtest()
-            oos_audit = PerformanceAudit(oos_trades)
-
-            # Compute WFE
-            wfe = 0 if is_audit.profit_factor() == 0 else oos_audit.profit_factor() / is_audit.profit_factor()
-
-            # Store results
-            self.results.append({
-                "IS_start": is_data.index[0],
-                "IS_end": is_data.index[-1],
-                "OOS_start": oos_data.index[0],
-                "OOS_end": oos_data.index[-1],
-                "IS_PF": is_audit.profit_factor(),
-                "OOS_PF": oos_audit.profit_factor(),
-                "IS_MaxDD%": is_audit.max_drawdown(),
-                "OOS_MaxDD%": oos_audit.max_drawdown(),
-                "IS_Expectancy": is_audit.expectancy(),
-                "OOS_Expectancy": oos_audit.expectancy(),
-                "WFE": wfe,
-                "IS_trades": is_trades,
-                "OOS_trades": oos_trades
-            })
-
+            splits.append((start, start + self.is_window, start + self.is_window + self.oos_window))
             start += self.oos_window  # roll forward
+        return splits
+
+    def run(self, profile=None):
+        """
+        Run every IS/OOS window.
+        profile: as for Backtester.run; profiles the whole walk-forward and
+                 stores the report in self.profile_report
+        """
+        if profile:
+            with RunProfiler.from_arg(profile, "walk_forward") as profiler:
+                results = self._run()
+            self.profile_report = profiler.report()
+            return results
+        return self._run()
+
+    def _run(self):
+        tasks = [(i, split, self.seed + i) for i, split in enumerate(self.windows())]
+        job = (self.strategy_class, self.strategy_kwargs, self.search)
+        # Causal features on the full frame: OOS windows start with warm rolling state
+        data = self.data if self.search is None else self.search.prepare(self.data)
+
+        if self.n_jobs == 1 or len(tasks) <= 1:
+            _init_worker(_FrameSource(data), job)
+            try:
+                self.results = [_run_window(task) for task in tasks]
+            finally:
+                _init_worker(None, None)
+        else:
+            source = _SharedFrame(data)
+            try:
+                with ProcessPoolExecutor(
+                    max_workers=self.n_jobs, initializer=_init_worker, initargs=(source, job)
+                ) as pool:
+                    # map() yields in submission order, so results stay chronological
+                    self.results = list(pool.map(_run_window, tasks))
+            finally:
+                source.close()
 
         return pd.DataFrame(self.results)
 
@@ -83,15 +117,144 @@ class WalkForward:
         plt.show()
 
     def summary(self):
-        """Aggregate metrics across all periods"""
+        """
+        Aggregate metrics across all periods: the average of every per-window
+        metric (Avg_IS_PF, Avg_OOS_Sharpe, Avg_WFE, ...) plus the metrics of
+        all OOS trades taken together (Combined_OOS_PF, ...).
+        """
         df = pd.DataFrame(self.results)
-        summary = {
-            "Avg_IS_PF": df['IS_PF'].mean(),
-            "Avg_OOS_PF": df['OOS_PF'].mean(),
-            "Avg_WFE": df['WFE'].mean(),
-            "Avg_IS_MaxDD%": df['IS_MaxDD%'].mean(),
-            "Avg_OOS_MaxDD%": df['OOS_MaxDD%'].mean(),
-            "Avg_IS_Expectancy": df['IS_Expectancy'].mean(),
-            "Avg_OOS_Expectancy": df['OOS_Expectancy'].mean()
-        }
+        metrics = [col for col in df.columns if col == "WFE" or (
+            col.startswith(("IS_", "OOS_")) and not col.endswith(("_start", "_end", "_trades")))]
+        summary = {f"Avg_{col}": df[col].mean() for col in metrics}
+        summary.update({f"Combined_OOS_{name}": value for name, value in self.oos_audit().metrics().items()})
         return summary
+
+    def oos_audit(self):
+        """PerformanceAudit of all OOS trades in order (for rolling / per-month / per-regime stats)"""
+        trades = [res['OOS_trades'] for res in self.results]
+        if not trades:
+            raise ValueError("No walk-forward results; call run() first")
+        return PerformanceAudit(pd.concat(trades, ignore_index=True))
+
+
+# ----------------------------------------------------------------------
+# Window execution (runs in the parent or in pool workers)
+# ----------------------------------------------------------------------
+class _FrameSource:
+    """Hands out row slices of an in-process DataFrame"""
+
+    def __init__(self, data):
+        self.data = data
+
+    def slice(self, lo, hi):
+        return self.data.iloc[lo:hi]
+
+
+class _SharedFrame:
+    """
+    DataFrame shipped to pool workers without per-window pickling.
+    Numeric columns are written once to .npy files and memory-mapped by
+    every worker (the OS page cache shares one copy); the index and any
+    non-numeric columns are sent once per worker.
+    """
+
+    def __init__(self, data):
+        self.folder = tempfile.mkdtemp(prefix="walk_forward_")
+        numeric = data.select_dtypes(include=[np.number, "bool"]).columns
+        self.columns = list(data.columns)
+        self.numeric = {}
+        for i, col in enumerate(numeric):
+            path = os.path.join(self.folder, f"col_{i}.npy")
+            np.save(path, data[col].to_numpy())
+            self.numeric[col] = path
+        self.other = data[[c for c in data.columns if c not in self.numeric]]
+        self.index = data.index
+        self._arrays = None
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state["_arrays"] = None
+        return state
+
+    def slice(self, lo, hi):
+        if self._arrays is None:
+            self._arrays = {col: np.load(path, mmap_mode="r") for col, path in self.numeric.items()}
+        cols = {col: self._arrays[col][lo:hi] for col in self.numeric}
+        for col in self.other.columns:
+            cols[col] = self.other[col].to_numpy()[lo:hi]
+        return pd.DataFrame(cols, index=self.index[lo:hi], copy=False)[self.columns]
+
+    def close(self):
+        shutil.rmtree(self.folder, ignore_errors=True)
+
+
+_WORKER = {}
+
+
+def _init_worker(source, job):
+    _WORKER["source"] = source
+    _WORKER["job"] = job
+
+
+def _run_window(task):
+    """Backtest one IS/OOS split and return its result row"""
+    i, (start, is_end, oos_end), seed = task
+    source = _WORKER["source"]
+    strategy_class, strategy_kwargs, search = _WORKER["job"]
+
+    is_data = source.slice(start, is_end)
+    oos_data = source.slice(is_end, oos_end)
+
+    if search is None:
+        # Backtest in-sample
+        is_trades = _run_strategy(strategy_class, is_data, strategy_kwargs, seed)
+
+        # Backtest out-of-sample using same strategy parameters
+        oos_trades = _run_strategy(strategy_class, oos_data, strategy_kwargs, seed)
+    else:
+        # Fit on in-sample, then apply the best parameters out-of-sample
+        best_params, _, is_trades = search.optimize(
+            strategy_class, strategy_kwargs, is_data, (start, is_end)
+        )
+        oos_trades = search.evaluate(
+            strategy_class, strategy_kwargs, oos_data, (is_end, oos_end), best_params
+        )
+        search.clear_cache()  # per-window slices and backtesters are not reused
+
+    is_audit = PerformanceAudit(is_trades)
+    oos_audit = PerformanceAudit(oos_trades)
+
+    result = {
+        "IS_start": is_data.index[0],
+        "IS_end": is_data.index[-1],
+        "OOS_start": oos_data.index[0],
+        "OOS_end": oos_data.index[-1],
+    }
+    # IS_PF, OOS_PF, IS_MaxDD%, ..., IS_Sharpe, OOS_Ulcer (see PerformanceAudit.metrics)
+    for prefix, audit in (("IS", is_audit), ("OOS", oos_audit)):
+        result.update({f"{prefix}_{name}": value for name, value in audit.metrics().items()})
+    result["WFE"] = is_audit.walk_forward_efficiency(oos_audit)
+    result["IS_trades"] = is_audit.trades
+    result["OOS_trades"] = oos_audit.trades
+    if search is not None:
+        result["Best_Params"] = best_params
+    return result
+
+
+def _run_strategy(strategy_class, data, strategy_kwargs, seed):
+    """
+    Run one backtest with every random source seeded from `seed`.
+    The global random / np.random states are restored afterwards, so serial
+    runs do not reseed the caller's generators.
+    """
+    py_state, np_state = random.getstate(), np.random.get_state()
+    random.seed(seed)
+    np.random.seed(seed)
+    try:
+        kwargs = dict(strategy_kwargs)
+        if "seed" in inspect.signature(strategy_class).parameters:
+            kwargs.setdefault("seed", seed)
+        return strategy_class(data, **kwargs).run()
+    finally:
+        random.setstate(py_state)
+        np.random.set_state(np_state)
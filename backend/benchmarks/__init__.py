@@ -0,0 +1,10 @@
+# backend/benchmarks/__init__.py
+
+"""
+Benchmarks package.
+
+Modules:
+- bench_signal_generator: SignalGenerator.generate throughput at 10k/100k/1M rows
+- bench_backtester: event-driven vs vectorized Backtester, plus a parameter sweep
+- suite: core / backtest / risk hot paths at several sizes, JSON results and run-to-run comparison
+"""
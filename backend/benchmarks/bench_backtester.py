@@ -0,0 +1,70 @@
+# backend/benchmarks/bench_backtester.py
+
+"""
+Benchmark Backtester.run (event-driven) against Backtester.run_vectorized,
+plus a z_thresh/mom_thresh sweep over one set of precomputed features.
+
+Usage (from backend/):
+    python -m benchmarks.bench_backtester
+"""
+
+import time
+import itertools
+import numpy as np
+import pandas as pd
+from backtest.backtester import Backtester
+from core.feature_engineer import FeatureEngineer
+from core.regime_detector import RegimeDetector
+from core.signal_generator import compute_signals
+
+SIZES = [10_000, 100_000, 1_000_000]
+EVENT_SIZES = [10_000, 100_000]
+
+
+def make_bars(n, seed=0):
+    rng = np.random.default_rng(seed)
+    close = np.cumsum(rng.normal(0, 0.5, n)) + 2000
+    opens = close - rng.normal(0, 0.2, n)
+    return pd.DataFrame({
+        "xau_open": opens,
+        "xau_high": np.maximum(opens, close) + rng.random(n) * 0.5,
+        "xau_low": np.minimum(opens, close) - rng.random(n) * 0.5,
+        "xau_close": close,
+        "signal": rng.choice([0, 0, 0, 0, 0, 0, 0, 0, 1, -1], n),
+        "atr": 3.0
+    })
+
+
+def timed(fn):
+    t0 = time.perf_counter()
+    result = fn()
+    return time.perf_counter() - t0, result
+
+
+def bench_sweep(n=100_000, z_values=np.linspace(0.5, 3.0, 26), mom_values=np.linspace(0.0, 1.0, 11)):
+    bars = make_bars(n).drop(columns="signal")
+    features = RegimeDetector().detect(FeatureEngineer().add_features(bars))
+    arrays = [features[c].to_numpy() for c in ("zscore", "mom", "vol_pct", "regime")]
+
+    bt = Backtester(features)
+    combos = list(itertools.product(z_values, mom_values))
+    t0 = time.perf_counter()
+    for z, mom in combos:
+        bt.run_vectorized(signal=compute_signals(*arrays, z_thresh=z, mom_thresh=mom))
+    return len(combos), time.perf_counter() - t0
+
+
+if __name__ == "__main__":
+    for n in SIZES:
+        df = make_bars(n)
+        bt = Backtester(df, log_trades=False)
+        bt.kill_switch.max_drawdown_pct = np.inf  # measure the full run
+        t_vec, trades = timed(bt.run_vectorized)
+        line = f"n={n:>9,}  trades={len(trades):>7,}  vectorized={t_vec:7.3f}s"
+        if n in EVENT_SIZES:
+            t_evt, _ = timed(bt.run)
+            line += f"  event={t_evt:7.3f}s  speedup={t_evt / t_vec:6.1f}x"
+        print(line)
+
+    combos, elapsed = bench_sweep()
+    print(f"sweep: {combos} parameter sets on 100,000 bars in {elapsed:.2f}s ({elapsed / combos * 1000:.1f} ms/set)")
@@ -0,0 +1,42 @@
+# backend/benchmarks/bench_signal_generator.py
+
+"""
+Benchmark SignalGenerator.generate on synthetic feature frames.
+
+Usage (from backend/):
+    python -m benchmarks.bench_signal_generator
+"""
+
+import time
+import numpy as np
+import pandas as pd
+from core.signal_generator import SignalGenerator
+
+SIZES = [10_000, 100_000, 1_000_000]
+
+
+def make_features(n, seed=0):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        "zscore": rng.normal(0, 1.5, n),
+        "mom": rng.normal(0, 1, n),
+        "vol_pct": rng.random(n),
+        "regime": rng.choice([0, 1, 2], size=n)
+    })
+
+
+def bench(n, repeat=5):
+    df = make_features(n)
+    sg = SignalGenerator()
+    timings = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        sg.generate(df)
+        timings.append(time.perf_counter() - t0)
+    return min(timings)
+
+
+if __name__ == "__main__":
+    for n in SIZES:
+        best = bench(n)
+        print(f"SignalGenerator.generate n={n:>9,}: {best * 1000:8.2f} ms ({n / best:,.0f} rows/s)")
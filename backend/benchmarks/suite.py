@@ -0,0 +1,237 @@
+# backend/benchmarks/suite.py
+
+"""
+Benchmark suite for the core, backtest and risk hot paths.
+
+Every case runs on synthetic gold bars at several sizes; each timing is the
+best / median of `repeat` runs after one warm-up. Results are written as
+JSON (with the git commit and library versions) so two runs can be
+compared from the command line.
+
+Usage (from backend/):
+    python -m benchmarks.suite run                          # -> benchmarks/results/<commit>.json
+    python -m benchmarks.suite run --sizes 10000 --cases features,regime -o base.json
+    python -m benchmarks.suite compare base.json new.json   # exit 1 on a regression
+"""
+
+import io
+import os
+import sys
+import json
+import time
+import platform
+import argparse
+import statistics
+import subprocess
+import contextlib
+from datetime import datetime
+import numpy as np
+import pandas as pd
+from core.feature_engineer import FeatureEngineer
+from core.regime_detector import RegimeDetector
+from core.signal_generator import SignalGenerator
+from core.validator import Validator
+from core.beta_calculator import BetaCalculator
+from backtest.backtester import Backtester
+from backtest.performance_audit import PerformanceAudit
+from benchmarks.bench_backtester import make_bars
+
+SIZES = [10_000, 100_000, 1_000_000]
+RESULTS_FOLDER = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results")
+DEFAULT_THRESHOLD = 0.10  # compare: slower by more than 10% = regression
+
+
+def _features(n):
+    bars = make_bars(n).drop(columns=["signal", "atr"])
+    return RegimeDetector().detect(FeatureEngineer().add_features(bars))
+
+
+def _signals(n):
+    features = _features(n)
+    return features.assign(**SignalGenerator().compute(features))
+
+
+def _returns(n, seed=1):
+    rng = np.random.default_rng(seed)
+    index = pd.date_range("2020-01-01", periods=n, freq="15min")
+    dxy = pd.Series(rng.normal(0, 0.0005, n), index=index)
+    xau = -0.4 * dxy + pd.Series(rng.normal(0, 0.001, n), index=index)
+    return xau, dxy
+
+
+def _trades(n, seed=2):
+    """One trade per 10 bars"""
+    rng = np.random.default_rng(seed)
+    m = max(n // 10, 1)
+    entry = 2000 + rng.normal(0, 20, m)
+    return pd.DataFrame({
+        "entry_price": entry,
+        "exit_price": entry + rng.normal(0.2, 3, m),
+        "direction": rng.choice([1, -1], m),
+        "size": rng.uniform(1, 10, m),
+    })
+
+
+def _backtest(df):
+    bt = Backtester(df, log_trades=False)
+    bt.kill_switch.max_drawdown_pct = np.inf  # measure the full run
+    return bt.run()
+
+
+# name -> (setup(n) -> args, fn(*args))
+CASES = {
+    "features": (lambda n: (FeatureEngineer(), make_bars(n).drop(columns=["signal", "atr"])),
+                 lambda fe, bars: fe.add_features(bars)),
+    "regime": (lambda n: (RegimeDetector(), make_bars(n).drop(columns=["signal", "atr"])),
+               lambda rd, bars: rd.detect(bars)),
+    "signal": (lambda n: (SignalGenerator(), _features(n)),
+               lambda sg, features: sg.generate(features)),
+    "validate": (lambda n: (Validator(), _signals(n)),
+                 lambda val, signals: val.validate(signals, state={})),
+    "beta": (lambda n: (BetaCalculator(window=60),) + _returns(n),
+             lambda bc, xau, dxy: bc.compute_beta(xau, dxy)),
+    "audit": (lambda n: (_trades(n),),
+              lambda trades: PerformanceAudit(trades).summary()),
+    "backtest": (lambda n: (make_bars(n),),
+                 _backtest),
+}
+
+
+def run_case(name, n, repeat=5):
+    """Timings of one case at size n: best / median / mean / stdev seconds and rows/s"""
+    setup, fn = CASES[name]
+    args = setup(n)
+    fn(*args)  # warm-up (imports, caches, numba compilation)
+    timings = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn(*args)
+        timings.append(time.perf_counter() - t0)
+    best = min(timings)
+    return {
+        "case": name,
+        "n": n,
+        "repeat": repeat,
+        "min": best,
+        "median": statistics.median(timings),
+        "mean": statistics.fmean(timings),
+        "stdev": statistics.stdev(timings) if repeat > 1 else 0.0,
+        "rows_per_s": n / best if best > 0 else None,
+    }
+
+
+def run_suite(cases=None, sizes=SIZES, repeat=5, verbose=True):
+    """Run the selected cases at every size; returns the JSON-ready result document"""
+    cases = list(cases or CASES)
+    unknown = set(cases) - set(CASES)
+    if unknown:
+        raise ValueError(f"Unknown cases {sorted(unknown)}; choose from {list(CASES)}")
+
+    results = []
+    for name in cases:
+        for n in sizes:
+            # The stages print progress; keep the benchmark output readable
+            with contextlib.redirect_stdout(io.StringIO()):
+                result = run_case(name, n, repeat)
+            results.append(result)
+            if verbose:
+                print(f"{name:<10} n={n:>9,}  min={result['min'] * 1000:9.2f} ms  "
+                      f"median={result['median'] * 1000:9.2f} ms  {result['rows_per_s']:>14,.0f} rows/s")
+    return {"meta": _meta(repeat), "results": results}
+
+
+def compare(base, new, threshold=DEFAULT_THRESHOLD, stat="min"):
+    """
+    Rows (case, n, base, new, ratio, status) for cases present in both runs.
+    status is "regression" / "improvement" when new/base leaves 1 +- threshold.
+    """
+    base_by_key = {(r["case"], r["n"]): r for r in base["results"]}
+    rows = []
+    for r in new["results"]:
+        old = base_by_key.get((r["case"], r["n"]))
+        if old is None:
+            continue
+        ratio = r[stat] / old[stat] if old[stat] > 0 else float("inf")
+        if ratio > 1 + threshold:
+            status = "regression"
+        elif ratio < 1 - threshold:
+            status = "improvement"
+        else:
+            status = "same"
+        rows.append((r["case"], r["n"], old[stat], r[stat], ratio, status))
+    return rows
+
+
+def load(path):
+    with open(path) as f:
+        return json.load(f)
+
+
+def save(document, path):
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(document, f, indent=2)
+
+
+def _meta(repeat):
+    return {
+        "commit": _git_commit(),
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+        "machine": f"{platform.system()} {platform.machine()}",
+        "repeat": repeat,
+    }
+
+
+def _git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.suite", description=__doc__.split("\n\n")[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run = commands.add_parser("run", help="run the benchmarks and write JSON results")
+    run.add_argument("--cases", help=f"comma-separated subset of {','.join(CASES)}")
+    run.add_argument("--sizes", help="comma-separated bar counts (default: %(default)s)",
+                     default=",".join(map(str, SIZES)))
+    run.add_argument("--repeat", type=int, default=5)
+    run.add_argument("-o", "--output", help="JSON path (default: benchmarks/results/<commit>.json)")
+
+    cmp = commands.add_parser("compare", help="compare two JSON results")
+    cmp.add_argument("base")
+    cmp.add_argument("new")
+    cmp.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                     help="relative change reported as regression/improvement (default: %(default)s)")
+    cmp.add_argument("--stat", choices=("min", "median", "mean"), default="min")
+
+    args = parser.parse_args(argv)
+    if args.command == "run":
+        document = run_suite(
+            cases=args.cases.split(",") if args.cases else None,
+            sizes=[int(s) for s in args.sizes.split(",")],
+            repeat=args.repeat,
+        )
+        output = args.output or os.path.join(
+            RESULTS_FOLDER, f"{document['meta']['commit'] or datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+        )
+        save(document, output)
+        print(f"Results written to {output}")
+        return 0
+
+    base, new = load(args.base), load(args.new)
+    rows = compare(base, new, args.threshold, args.stat)
+    print(f"base {base['meta'].get('commit')}  ->  new {new['meta'].get('commit')}  ({args.stat})")
+    for case, n, old, cur, ratio, status in rows:
+        print(f"{case:<10} n={n:>9,}  {old * 1000:9.2f} ms -> {cur * 1000:9.2f} ms  {ratio:6.2f}x  {status}")
+    return 1 if any(row[5] == "regression" for row in rows) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
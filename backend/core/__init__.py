@@ -9,6 +9,9 @@ Modules:
 - beta_calculator: calculate Gold vs DXY beta
 - signal_generator: generate buy/sell/flat signals
 - validator: strict logic gate ensuring all conditions met
+- rolling: O(1) ring-buffer windows used by the streaming (update) paths
+- frame_buffer: columnar buffer the stages' compute() columns are appended to without copies
+- pipeline: features -> regime -> signal -> validate -> risk -> execute in batch or streaming mode
 """
 
 from .regime_detector import RegimeDetector
@@ -16,11 +19,15 @@ from .feature_engineer import FeatureEngineer
 from .beta_calculator import BetaCalculator
 from .signal_generator import SignalGenerator
 from .validator import Validator
+from .frame_buffer import FrameBuffer
+from .pipeline import Pipeline
 
 __all__ = [
     "RegimeDetector",
     "FeatureEngineer",
     "BetaCalculator",
     "SignalGenerator",
-    "Validator"
+    "Validator",
+    "FrameBuffer",
+    "Pipeline"
 ]
@@ -1,5 +1,9 @@
 import pandas as pd
 import numpy as np
+from .rolling import FLAT_EPS, RollingCovariance
+
+# Windows computed by compute_beta_windows unless told otherwise
+BETA_WINDOWS = (20, 60, 120, 250)
 
 class BetaCalculator:
     """
@@ -13,6 +17,7 @@ class BetaCalculator:
         window: rolling window for beta calculation
         """
         self.window = window
+        self.reset()
 
     def compute_beta(self, asset_returns, benchmark_returns):
         """
@@ -24,9 +29,7 @@ class BetaCalculator:
         if not isinstance(asset_returns, pd.Series) or not isinstance(benchmark_returns, pd.Series):
             raise ValueError("Inputs must be pandas Series")
 
-        # Align the series
-        df = pd.concat([asset_returns, benchmark_returns], axis=1).dropna()
-        df.columns = ['asset', 'benchmark']
+        df = self._align(asset_returns, benchmark_returns)
 
         # Rolling covariance and variance
         rolling_cov = df['asset'].rolling(self.window).cov(df['benchmark'])
@@ -34,3 +37,102 @@ class BetaCalculator:
 
         beta = rolling_cov / rolling_var
         return beta
+
+    def compute_beta_windows(self, asset_returns, benchmark_returns, windows=BETA_WINDOWS):
+        """
+        asset_returns: pd.Series of asset % returns
+        benchmark_returns: pd.Series of benchmark % returns
+        windows: rolling window lengths
+
+        Returns a pd.DataFrame with one 'beta_<window>' column per window.
+        All windows come from one pass of prefix sums over the aligned
+        returns (centred on their means to limit cancellation), so adding
+        windows costs O(n) each instead of a fresh rolling cov/var.
+        Windows where the benchmark is flat (identical values, or a variance
+        within FLAT_EPS of its sum of squares) are NaN, as in compute_beta.
+        """
+        if not isinstance(asset_returns, pd.Series) or not isinstance(benchmark_returns, pd.Series):
+            raise ValueError("Inputs must be pandas Series")
+
+        df = self._align(asset_returns, benchmark_returns)
+        a = df['asset'].to_numpy(dtype=float)
+        b = df['benchmark'].to_numpy(dtype=float)
+        n = len(a)
+        if n:
+            a = a - a.mean()
+            b = b - b.mean()
+
+        # Benchmark changes between consecutive bars: a window without any is flat
+        changed = np.zeros(n)
+        if n:
+            raw = df['benchmark'].to_numpy(dtype=float)
+            changed[1:] = raw[1:] != raw[:-1]
+
+        # Prefix sums with a leading zero: sum over (i-w, i] = c[i+1] - c[i+1-w]
+        sums = {}
+        for name, values in (('a', a), ('b', b), ('ab', a * b), ('bb', b * b), ('changed', changed)):
+            c = np.empty(n + 1)
+            c[0] = 0.0
+            np.cumsum(values, out=c[1:])
+            sums[name] = c
+
+        out = {}
+        for w in windows:
+            beta = np.full(n, np.nan)
+            if w >= 2 and n >= w:
+                sa = sums['a'][w:] - sums['a'][:-w]
+                sb = sums['b'][w:] - sums['b'][:-w]
+                sab = sums['ab'][w:] - sums['ab'][:-w]
+                sbb = sums['bb'][w:] - sums['bb'][:-w]
+                cov = sab - sa * sb / w
+                var = sbb - sb * sb / w
+                # Changes inside the window: bars (i-w+1, i], not the step into it
+                moves = sums['changed'][w:] - sums['changed'][1:n - w + 2]
+                flat = (moves == 0) | (var <= FLAT_EPS * sbb)
+                with np.errstate(divide='ignore', invalid='ignore'):
+                    beta[w - 1:] = np.where(flat, np.nan, cov / var)
+            out[f"beta_{w}"] = beta
+        return pd.DataFrame(out, index=df.index)
+
+    def reset(self):
+        """Clear streaming state (call before replaying a new series)"""
+        self._window = RollingCovariance(self.window)
+        self.last_beta = np.nan
+
+    def update(self, asset_return, benchmark_return):
+        """
+        Streaming rolling beta: push one bar's returns and get the beta over
+        the last `window` complete pairs in O(1). Bars where either return
+        is NaN are skipped (as compute_beta drops them) and the last beta
+        is returned unchanged.
+        """
+        if np.isnan(asset_return) or np.isnan(benchmark_return):
+            return self.last_beta
+        self._window.push(asset_return, benchmark_return)
+        self.last_beta = self._window.beta()
+        return self.last_beta
+
+    def compute_beta_panel(self, panel, asset="XAUUSD", benchmark="DXY"):
+        """
+        panel: data.market_panel.MarketPanel holding both symbols
+
+        Rolling beta from the panel's cached close-to-close returns
+        """
+        return self.compute_beta(panel.returns(asset), panel.returns(benchmark))
+
+    @staticmethod
+    def _align(asset_returns, benchmark_returns):
+        # Align the series (already-aligned inputs, e.g. from a MarketPanel,
+        # skip the concat and only drop rows where either side is NaN)
+        if asset_returns.index.equals(benchmark_returns.index):
+            a = asset_returns.to_numpy(dtype=float)
+            b = benchmark_returns.to_numpy(dtype=float)
+            index = asset_returns.index
+            valid = ~(np.isnan(a) | np.isnan(b))
+            if not valid.all():
+                a, b, index = a[valid], b[valid], index[valid]
+            df = pd.DataFrame({'asset': a, 'benchmark': b}, index=index)
+        else:
+            df = pd.concat([asset_returns, benchmark_returns], axis=1).dropna()
+            df.columns = ['asset', 'benchmark']
+        return df
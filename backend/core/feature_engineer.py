@@ -1,33 +1,97 @@
+import math
 import pandas as pd
 import numpy as np
+from .rolling import RollingWindow, safe_div
 
 
 class FeatureEngineer:
     def __init__(self, z_window=20):
         self.z_window = z_window
+        self.reset()
 
     def add_features(self, df: pd.DataFrame) -> pd.DataFrame:
-        df = df.copy()
+        """Returns df plus the feature columns (the input columns are shared, not copied)"""
+        return df.assign(**self.compute(df))
+
+    def compute(self, df: pd.DataFrame) -> dict:
+        """Feature columns for df as {name: Series}; df itself is not modified"""
+        close = df["xau_close"]
 
         # Returns
-        df["returns"] = df["xau_close"].pct_change().fillna(0)
+        returns = close.pct_change().fillna(0)
 
         # Moving averages
-        df["sma_5"] = df["xau_close"].rolling(5).mean()
-        df["sma_10"] = df["xau_close"].rolling(10).mean()
-        df["sma_diff"] = (df["sma_5"] - df["sma_10"]).fillna(0)
+        sma_5 = close.rolling(5).mean()
+        sma_10 = close.rolling(10).mean()
 
-        # Volatility
-        df["volatility_5"] = df["returns"].rolling(5).std().fillna(0)
-        df["volatility_10"] = df["returns"].rolling(10).std().fillna(0)
+        # 🔑 Z-SCORE (THIS FIXES YOUR ERROR)
+        rolling_mean = close.rolling(self.z_window).mean()
+        rolling_std = close.rolling(self.z_window).std()
 
-        # Momentum
-        df["mom"] = df["xau_close"].diff().fillna(0)
+        return {
+            "returns": returns,
+            "sma_5": sma_5,
+            "sma_10": sma_10,
+            "sma_diff": (sma_5 - sma_10).fillna(0),
+            # Volatility
+            "volatility_5": returns.rolling(5).std().fillna(0),
+            "volatility_10": returns.rolling(10).std().fillna(0),
+            # Momentum
+            "mom": close.diff().fillna(0),
+            "zscore": ((close - rolling_mean) / rolling_std).fillna(0),
+        }
+
+    # ------------------------------------------------------------------
+    # Streaming mode
+    # ------------------------------------------------------------------
+    def reset(self):
+        """Clear streaming state (call before replaying a new series)"""
+        self._prev_close = None
+        self._close_5 = RollingWindow(5)
+        self._close_10 = RollingWindow(10)
+        self._close_z = RollingWindow(self.z_window)
+        self._ret_5 = RollingWindow(5)
+        self._ret_10 = RollingWindow(10)
+
+    def update(self, bar) -> dict:
+        """
+        Streaming equivalent of add_features for a single new bar.
+        bar: dict or pd.Series with at least 'xau_close'
+        Returns the bar's fields plus the same feature columns as add_features.
+        Each call is O(1); feed bars in time order.
+        """
+        close = float(bar["xau_close"])
+        prev = self._prev_close
+        self._prev_close = close
+
+        if prev is None:
+            returns, mom = 0.0, 0.0
+        else:
+            returns = safe_div(close, prev) - 1
+            mom = close - prev
+            if math.isnan(returns):
+                returns = 0.0
+
+        for window in (self._close_5, self._close_10, self._close_z):
+            window.push(close)
+        self._ret_5.push(returns)
+        self._ret_10.push(returns)
+
+        sma_5 = self._close_5.mean()
+        sma_10 = self._close_10.mean()
+
+        row = dict(bar)
+        row["returns"] = returns
+        row["sma_5"] = sma_5
+        row["sma_10"] = sma_10
+        row["sma_diff"] = _fill0(sma_5 - sma_10)
+        row["volatility_5"] = _fill0(self._ret_5.std())
+        row["volatility_10"] = _fill0(self._ret_10.std())
+        row["mom"] = mom
+        row["zscore"] = _fill0(safe_div(close - self._close_z.mean(), self._close_z.std()))
+        return row
 
-        # 🔑 Z-SCORE (THIS FIXES YOUR ERROR)
-        rolling_mean = df["xau_close"].rolling(self.z_window).mean()
-        rolling_std = df["xau_close"].rolling(self.z_window).std()
 
-        df["zscore"] = ((df["xau_close"] - rolling_mean) / rolling_std).fillna(0)
+def _fill0(x):
+    return 0.0 if math.isnan(x) else x
 
-        return df
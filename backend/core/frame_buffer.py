@@ -0,0 +1,151 @@
+# backend/core/frame_buffer.py
+
+import sys
+import tracemalloc
+import numpy as np
+import pandas as pd
+
+try:
+    import resource
+except ImportError:  # not available on Windows
+    resource = None
+
+
+class FrameBuffer:
+    """
+    Columnar buffer owning every column of one pipeline run.
+
+    Ownership rules:
+    - the buffer owns its column arrays; stages never modify them in place
+      (they are flagged read-only, so an accidental write raises)
+    - a stage receives frame() - a DataFrame view over the arrays, built
+      without copying - and returns {name: values} of new columns
+    - returned columns are adopted as they are (no copy when they already
+      are a float/int/bool ndarray or Series of the buffer's length)
+    - an existing column is only replaced when the caller names it in
+      replace= (e.g. the Validator's 'signal'); the old array is released,
+      never written to, so frames handed out earlier keep what they saw
+
+    The buffer keeps the total bytes it owns and its high-water mark; with
+    trace=True, run() also traces each stage's temporary allocations so
+    the reported peak includes intermediate arrays, not just the results.
+    """
+
+    def __init__(self, data, index=None, trace=False):
+        """
+        data: DataFrame or {name: array} of input columns (adopted, not copied)
+        index: row index when data is a dict (default RangeIndex)
+        trace: measure per-stage temporary allocations with tracemalloc
+        """
+        if isinstance(data, pd.DataFrame):
+            index = data.index
+            data = {name: data[name] for name in data.columns}
+        self.columns = {}
+        self.index = index
+        self.trace = trace
+        self.nbytes = 0
+        self.high_water = 0
+        self.stage_peaks = {}
+        for name, values in data.items():
+            self.add(name, values)
+        if self.index is None:
+            self.index = pd.RangeIndex(len(self))
+
+    def __len__(self):
+        if self.index is not None:
+            return len(self.index)
+        return len(next(iter(self.columns.values()))) if self.columns else 0
+
+    def __contains__(self, name):
+        return name in self.columns
+
+    def __getitem__(self, name):
+        return self.columns[name]
+
+    def add(self, name, values, replace=False):
+        """Adopt one column (scalars are broadcast)"""
+        if name in self.columns and not replace:
+            raise ValueError(f"Column '{name}' already exists (pass replace=True to replace it)")
+        # A view, so flagging it read-only leaves the caller's own array writable
+        array = _as_array(values, len(self) if self.columns or self.index is not None else None).view()
+        array.flags.writeable = False
+        if name in self.columns:
+            self.nbytes -= self.columns[name].nbytes
+        self.columns[name] = array
+        self.nbytes += array.nbytes
+        self.high_water = max(self.high_water, self.nbytes)
+
+    def update(self, columns, replace=()):
+        """
+        Adopt several columns returned by a stage.
+        replace: names allowed to replace existing columns (True = any)
+        """
+        for name, values in columns.items():
+            self.add(name, values, replace=replace is True or name in replace)
+
+    def drop(self, *names):
+        for name in names:
+            self.nbytes -= self.columns.pop(name).nbytes
+
+    def frame(self, columns=None):
+        """DataFrame view over the buffer's arrays (no data is copied)"""
+        names = list(self.columns) if columns is None else list(columns)
+        return pd.DataFrame({name: self.columns[name] for name in names}, index=self.index, copy=False)
+
+    def run(self, stage, replace=(), name=None):
+        """
+        Apply one stage: stage(frame) -> {name: values}; the returned columns
+        are adopted into the buffer. Returns self for chaining.
+        stage: callable, or an object with a compute(df) method
+        replace: existing columns the stage may replace (see update)
+        name: key in stage_peaks (default: the stage's class / function name)
+        """
+        if hasattr(stage, "compute"):
+            fn, name = stage.compute, name or type(stage).__name__
+        else:
+            fn, name = stage, name or stage.__name__
+        if self.trace:
+            tracing = tracemalloc.is_tracing()
+            if not tracing:
+                tracemalloc.start()
+            tracemalloc.reset_peak()
+            base = tracemalloc.get_traced_memory()[0]
+            columns = fn(self.frame())
+            peak = tracemalloc.get_traced_memory()[1] - base
+            if not tracing:
+                tracemalloc.stop()
+            self.stage_peaks[name] = peak
+            self.high_water = max(self.high_water, self.nbytes + peak)
+        else:
+            columns = fn(self.frame())
+        self.update(columns, replace=replace)
+        return self
+
+    def memory_report(self):
+        """Bytes owned now, buffer high-water mark and per-stage temporary peaks"""
+        report = {
+            "rows": len(self),
+            "columns": len(self.columns),
+            "nbytes": self.nbytes,
+            "high_water": self.high_water,
+            "stage_peaks": dict(self.stage_peaks),
+        }
+        if resource is not None:
+            # ru_maxrss is KiB on Linux, bytes on macOS
+            scale = 1 if sys.platform == "darwin" else 1024
+            report["process_peak_rss"] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * scale
+        return report
+
+
+def _as_array(values, length):
+    if isinstance(values, (pd.Series, pd.Index)):
+        values = values.to_numpy()
+    if np.isscalar(values) or values is None:
+        if length is None:
+            raise ValueError("Cannot broadcast a scalar into an empty buffer")
+        values = np.full(length, np.nan if values is None else values)
+    array = np.asarray(values)
+    if array.ndim != 1 or (length is not None and len(array) != length):
+        raise ValueError(f"Column length {array.shape} does not match buffer length {length}")
+    return array
+
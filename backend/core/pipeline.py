@@ -0,0 +1,184 @@
+# backend/core/pipeline.py
+
+import math
+import logging
+from contextlib import nullcontext
+from .feature_engineer import FeatureEngineer
+from .regime_detector import RegimeDetector
+from .signal_generator import SignalGenerator
+from .validator import Validator
+from .frame_buffer import FrameBuffer
+
+# MT5 rate columns -> pipeline column names
+PRICE_COLUMNS = {"open": "xau_open", "high": "xau_high", "low": "xau_low", "close": "xau_close"}
+
+# Stage names, in execution order (also the latency stage names)
+STAGES = ("features", "regime", "signal", "validate")
+
+
+class Pipeline:
+    """
+    features -> regime -> signal -> validate -> risk -> execute, shared by
+    the backtest, paper and live entry points.
+
+    Batch mode:     run(df) computes every stage over a whole frame on a
+                    FrameBuffer (no copies) and returns the result frame.
+    Streaming mode: update(bar) pushes one bar through the stages' O(1)
+                    update() paths; step(df) streams only the closed bars
+                    of a fetched window that were not seen yet, so a live
+                    cycle costs one bar instead of re-computing the window.
+    Orders:         plan(symbol, row) applies the kill switch, SL/TP and
+                    position size to a validated row; order() also sends it.
+
+    Streaming state is per series: use one Pipeline per symbol (they may
+    share the risk manager, kill switch and executor).
+    """
+
+    def __init__(self, feature_engineer=None, regime_detector=None, signal_generator=None,
+                 validator=None, risk_manager=None, kill_switch=None, executor=None,
+                 expectancy=0.2, timer=None):
+        """
+        feature_engineer, regime_detector, signal_generator, validator:
+            stage objects (defaults with default parameters)
+        risk_manager, kill_switch, executor: needed by plan() / order() only
+        expectancy: expectancy passed to the kill switch before each order
+        timer: timer(stage_name) -> context manager wrapped around each batch
+               stage (e.g. LatencyRecorder.stage); default: no timing
+        """
+        self.feature_engineer = feature_engineer or FeatureEngineer()
+        self.regime_detector = regime_detector or RegimeDetector()
+        self.signal_generator = signal_generator or SignalGenerator()
+        self.validator = validator or Validator()
+        self.risk_manager = risk_manager
+        self.kill_switch = kill_switch
+        self.executor = executor
+        self.expectancy = expectancy
+        self.timer = timer or (lambda name: nullcontext())
+        self.stages = list(zip(STAGES, (self.feature_engineer, self.regime_detector,
+                                        self.signal_generator, self.validator)))
+        self.buffer = None
+        self.logger = logging.getLogger("Pipeline")
+        self.reset()
+
+    # ------------------------------------------------------------------
+    # Batch mode
+    # ------------------------------------------------------------------
+    def run(self, df, after=None, trace=False):
+        """
+        All stages over df (OHLC with xau_* or MT5 column names).
+        after: optional {stage_name: fn(frame) -> {column: values}} applied
+               right after that stage (e.g. to force a test signal)
+        trace: record per-stage allocation peaks (see FrameBuffer.memory_report)
+        Returns the result frame; the buffer is kept in self.buffer.
+        """
+        buf = FrameBuffer(as_pipeline_frame(df), trace=trace)
+        after = after or {}
+        for name, stage in self.stages:
+            with self.timer(name):
+                # Every stage column is re-derived here, so stale ones in the input are replaced
+                buf.run(stage, replace=True, name=name)
+                if name in after:
+                    buf.run(after[name], replace=True, name=f"{name}:after")
+        self.buffer = buf
+        return buf.frame()
+
+    # ------------------------------------------------------------------
+    # Streaming mode
+    # ------------------------------------------------------------------
+    def reset(self):
+        """Clear streaming state (call before replaying a new series)"""
+        for _, stage in self.stages:
+            if hasattr(stage, "reset"):
+                stage.reset()
+        self.last_index = None
+        self.last_row = None
+
+    def update(self, bar) -> dict:
+        """One bar (dict / Series with xau_* fields) through every stage"""
+        row = bar
+        for _, stage in self.stages:
+            row = stage.update(row)
+        self.last_row = row
+        return row
+
+    def step(self, df, forming=True):
+        """
+        Stream the bars of df newer than the last one seen (by index) and
+        return the newest row; df is the window fetched this cycle.
+        forming: df's last row is the still-forming candle (MT5 windows end
+                 with it) and is left out; it is streamed once a later
+                 window shows it closed, so a revised bar never enters the
+                 stage state. False when df holds closed bars only.
+        Returns None when df holds no new bar, so a bar is never acted on twice.
+        """
+        if df is None:
+            return None
+        df = as_pipeline_frame(df)
+        if forming:
+            df = df.iloc[:-1]
+        if self.last_index is not None:
+            df = df[df.index > self.last_index]
+        if df.empty:
+            return None
+        for bar in df.to_dict("records"):
+            self.update(bar)
+        self.last_index = df.index[-1]
+        return self.last_row
+
+    # ------------------------------------------------------------------
+    # Risk and execution
+    # ------------------------------------------------------------------
+    def plan(self, symbol, row, equity=None, atr=None):
+        """
+        Order parameters for a validated row (dict / Series): kill switch,
+        SL/TP and position size.
+        equity: equity checked by the kill switch (default: risk manager equity)
+        atr: SL distance (default: the row's 'atr', else 1 as in the Backtester)
+        Returns send_order keyword arguments, or None when flat or halted.
+        """
+        direction = int(row.get("signal", 0) or 0)
+        if direction == 0:
+            return None
+
+        equity = self.risk_manager.account_equity if equity is None else equity
+        if not self.kill_switch.is_system_active(equity, expectancy=self.expectancy):
+            self.logger.warning(f"{symbol},KILL_SWITCH_TRIGGERED,Equity={equity}")
+            return None
+
+        price = float(row["xau_close"])
+        atr = float(row.get("atr", 1.0)) if atr is None else atr
+        sl, tp, _, _ = self.risk_manager.apply_sl_tp(price, direction, atr)
+
+        # Ensure valid SL/TP values
+        if sl is None or math.isnan(sl):
+            sl = price - atr if direction > 0 else price + atr
+        if tp is None or math.isnan(tp):
+            tp = price + 2 * atr if direction > 0 else price - 2 * atr
+
+        # Calculate position size safely
+        volume = self.risk_manager.calculate_position_size(price, sl)
+        if volume is None or math.isnan(volume):
+            volume = 1  # fallback
+
+        return {"symbol": symbol, "direction": direction, "volume": volume, "price": price, "sl": sl, "tp": tp}
+
+    def order(self, symbol, row, equity=None, atr=None, expired=None):
+        """
+        plan() and send the order; returns the executor's trade or None.
+        expired: optional callable checked right before sending; when it
+                 returns True the order is refused (e.g. AsyncLiveRunner.past_deadline)
+        """
+        params = self.plan(symbol, row, equity, atr)
+        if params is None:
+            return None
+        if expired is not None and expired():
+            self.logger.warning(f"{symbol},ORDER_REFUSED,cycle deadline passed")
+            return None
+        return self.executor.send_order(**params)
+
+
+def as_pipeline_frame(df):
+    """Frame with MT5 column names (open/high/low/close) renamed to xau_*; no data is copied"""
+    if "xau_close" not in df.columns and "close" in df.columns:
+        return df.rename(columns=PRICE_COLUMNS)
+    return df
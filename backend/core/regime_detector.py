@@ -1,12 +1,23 @@
 # backend/core/regime_detector.py
 
+import math
+from bisect import bisect_left, bisect_right, insort
+from collections import deque
 import numpy as np
 import pandas as pd
+from .rolling import RollingWindow, safe_div
 
 class RegimeDetector:
-    def __init__(self, vol_window=20, sma_window=10):
+    def __init__(self, vol_window=20, sma_window=10, lookback=500):
+        """
+        vol_window: rolling window for return volatility
+        sma_window: rolling window for the SMA used as trend proxy
+        lookback: number of bars the volatility percentile is ranked against
+        """
         self.vol_window = vol_window
         self.sma_window = sma_window
+        self.lookback = lookback
+        self.reset()
 
     def detect(self, df):
         """
@@ -15,7 +26,15 @@ class RegimeDetector:
         1 = Trend
         2 = Chaos
         Adds 'bias' for trend direction (1=long, -1=short)
+
+        Returns a new DataFrame; the input frame is left untouched.
+        vol_pct is the percentile of the current vol within the trailing
+        `lookback` bars, so a bar's value never depends on later data.
         """
+        return df.assign(**self.compute(df))
+
+    def compute(self, df):
+        """Regime columns for df as {name: Series/array}; df itself is not modified"""
         # Ensure required columns exist
         required_cols = ['xau_open', 'xau_high', 'xau_low', 'xau_close']
         for col in required_cols:
@@ -23,24 +42,97 @@ class RegimeDetector:
                 raise ValueError(f"Missing column '{col}' in input data")
 
         # 1. Volatility
-        df['returns'] = df['xau_close'].pct_change()
-        df['vol'] = df['returns'].rolling(self.vol_window).std()
-        df['vol_pct'] = df['vol'].rank(pct=True)
+        returns = df['xau_close'].pct_change()
+        vol = returns.rolling(self.vol_window).std()
+        vol_pct = vol.rolling(self.lookback, min_periods=1).rank(pct=True)
 
         # 2. SMA slope as trend proxy
-        df['sma_slope'] = df['xau_close'].rolling(self.sma_window).mean().diff()
+        sma_slope = df['xau_close'].rolling(self.sma_window).mean().diff()
+
+        # 3. Determine regime and 4. trend bias
+        regime, bias = _classify(vol_pct.to_numpy(), sma_slope.to_numpy())
+
+        return {
+            "returns": returns,
+            "vol": vol,
+            "vol_pct": vol_pct,
+            "sma_slope": sma_slope,
+            "regime": regime,
+            "bias": bias,
+        }
+
+    # ------------------------------------------------------------------
+    # Streaming mode
+    # ------------------------------------------------------------------
+    def reset(self):
+        """Clear streaming state (call before replaying a new series)"""
+        self._prev_close = None
+        self._prev_sma = np.nan
+        self._returns = RollingWindow(self.vol_window)
+        self._closes = RollingWindow(self.sma_window)
+        self._vol_history = deque()   # last `lookback` vols, NaN included
+        self._vol_sorted = []         # non-NaN vols of the lookback, sorted
+
+    def update(self, bar) -> dict:
+        """
+        Streaming equivalent of detect for a single new bar.
+        bar: dict or pd.Series with at least 'xau_close'
+        Returns the bar's fields plus returns, vol, vol_pct, sma_slope, regime, bias.
+        The percentile comes from a sorted list of the lookback window: the
+        rank search is O(log n), the insert / delete are O(lookback) memmoves
+        (fast in practice for lookbacks of a few thousand bars).
+        """
+        close = float(bar["xau_close"])
+        prev = self._prev_close
+        self._prev_close = close
+        returns = np.nan if prev is None else safe_div(close, prev) - 1
+
+        self._returns.push(returns)
+        vol = self._returns.std()
+        vol_pct = self._rank_vol(vol)
+
+        self._closes.push(close)
+        sma = self._closes.mean()
+        sma_slope = sma - self._prev_sma
+        self._prev_sma = sma
 
-        # 3. Determine regime
-        df['regime'] = 0  # Default = Range
-        df.loc[df['vol_pct'] > 0.9, 'regime'] = 2  # Chaos
-        df.loc[df['sma_slope'].abs() > 0.1, 'regime'] = 1  # Trend (example threshold)
+        regime, bias = _classify(np.array([vol_pct]), np.array([sma_slope]))
+
+        row = dict(bar)
+        row["returns"] = returns
+        row["vol"] = vol
+        row["vol_pct"] = vol_pct
+        row["sma_slope"] = sma_slope
+        row["regime"] = int(regime[0])
+        row["bias"] = float(bias[0])
+        return row
+
+    def _rank_vol(self, vol):
+        """
+        Average-method percentile rank of `vol` within the lookback window.
+        bisect finds positions in O(log n); insort / del shift the list, O(lookback).
+        """
+        if len(self._vol_history) == self.lookback:
+            old = self._vol_history.popleft()
+            if not math.isnan(old):
+                del self._vol_sorted[bisect_left(self._vol_sorted, old)]
+        self._vol_history.append(vol)
 
-        # 4. Add bias for trend rows
-        mask = df['regime'] == 1
-        df.loc[mask, 'bias'] = np.where(df.loc[mask, 'sma_slope'] > 0, 1, -1)
+        if math.isnan(vol):
+            return np.nan
+        insort(self._vol_sorted, vol)
+        lo = bisect_left(self._vol_sorted, vol)
+        hi = bisect_right(self._vol_sorted, vol)
+        return (lo + 1 + hi) / 2 / len(self._vol_sorted)
 
-        # Fill NaN bias for non-trend rows
-        df['bias'] = df['bias'].fillna(0)
 
+def _classify(vol_pct, sma_slope):
+    """Regime (0 range / 1 trend / 2 chaos) and trend bias from vol percentile and SMA slope"""
+    regime = np.zeros(len(vol_pct), dtype=np.int64)  # Default = Range
+    regime[vol_pct > 0.9] = 2  # Chaos
+    regime[np.abs(sma_slope) > 0.1] = 1  # Trend (example threshold)
 
-        return df
+    bias = np.zeros(len(vol_pct))
+    trend = regime == 1
+    bias[trend] = np.where(sma_slope[trend] > 0, 1.0, -1.0)
+    return regime, bias
@@ -0,0 +1,249 @@
+# backend/core/rolling.py
+
+import math
+import numpy as np
+
+# A second moment at or below FLAT_EPS x the window's sum of squares is
+# add/remove (or prefix-sum) cancellation residue, not variance: the window is flat
+FLAT_EPS = 1e-10
+
+
+class RollingWindow:
+    """
+    Fixed-size ring buffer with O(1) running mean / standard deviation.
+
+    Mirrors pandas `rolling(size).mean()` / `.std()` semantics:
+    - results are NaN until `size` non-NaN values are in the window
+    - a NaN inside the window makes the result NaN
+    - a window of identical values returns that exact value / exactly 0 std
+
+    Mean and variance are updated with Welford add/remove steps and
+    re-synced from the buffer every `resync_every` pushes to stop
+    floating point drift on long-running streams.
+    """
+
+    def __init__(self, size, resync_every=1024):
+        if size < 1:
+            raise ValueError("Window size must be >= 1")
+        self.size = size
+        self.resync_every = resync_every
+        self.reset()
+
+    def reset(self):
+        self._buf = np.full(self.size, np.nan)
+        self._pos = 0
+        self._filled = 0
+        self._n = 0          # non-NaN values in the window
+        self._nan = 0        # NaN values in the window
+        self._mean = 0.0
+        self._m2 = 0.0
+        self._same = 0       # consecutive identical values ending at the newest
+        self._last = None
+        self._pushes = 0
+
+    def push(self, x):
+        """Add a value, evicting the oldest one once the window is full"""
+        x = float(x)
+        if self._filled == self.size:
+            self._remove(self._buf[self._pos])
+        else:
+            self._filled += 1
+        self._buf[self._pos] = x
+        self._pos = (self._pos + 1) % self.size
+        self._add(x)
+
+        if x == self._last:
+            self._same += 1
+        else:
+            self._same = 1
+        self._last = x
+
+        self._pushes += 1
+        if self._pushes % self.resync_every == 0:
+            self._resync()
+
+    def _add(self, x):
+        if math.isnan(x):
+            self._nan += 1
+            return
+        self._n += 1
+        delta = x - self._mean
+        self._mean += delta / self._n
+        self._m2 += delta * (x - self._mean)
+
+    def _remove(self, x):
+        if math.isnan(x):
+            self._nan -= 1
+            return
+        self._n -= 1
+        if self._n == 0:
+            self._mean = 0.0
+            self._m2 = 0.0
+            return
+        delta = x - self._mean
+        self._mean -= delta / self._n
+        self._m2 -= delta * (x - self._mean)
+        if self._m2 < 0:
+            self._m2 = 0.0
+
+    def _resync(self):
+        values = self._buf[~np.isnan(self._buf)]
+        self._n = len(values)
+        self._mean = float(values.mean()) if self._n else 0.0
+        self._m2 = float(((values - self._mean) ** 2).sum()) if self._n else 0.0
+
+    @property
+    def ready(self):
+        """True once the window holds `size` non-NaN values"""
+        return self._n == self.size
+
+    def values(self):
+        """Window contents, oldest first"""
+        if self._filled < self.size:
+            return self._buf[:self._filled].copy()
+        return np.roll(self._buf, -self._pos)
+
+    def mean(self):
+        if not self.ready:
+            return np.nan
+        if self._same >= self.size:
+            return self._last
+        return self._mean
+
+    def var(self, ddof=1):
+        if not self.ready or self._n - ddof <= 0:
+            return np.nan
+        if self._same >= self.size:
+            return 0.0
+        return self._m2 / (self._n - ddof)
+
+    def std(self, ddof=1):
+        return math.sqrt(self.var(ddof))
+
+
+class RollingCovariance:
+    """
+    Fixed-size window of (x, y) pairs with O(1) running covariance.
+
+    Keeps the co-moment of x and y and the second moment of y with
+    pairwise Welford add/remove steps, so cov(x, y) and var(y) (and hence
+    a regression beta of x on y) cost O(1) per push. Pairs are expected to
+    be NaN-free; callers skip incomplete pairs. Moments are re-synced from
+    the buffer every `resync_every` pushes like RollingWindow.
+
+    A window of identical y values (or one whose var(y) is within FLAT_EPS
+    of its sum of squares) has exactly 0 var(y), so beta() is NaN there as
+    with pandas, not the residue of earlier windows divided by ~0.
+    """
+
+    def __init__(self, size, resync_every=1024):
+        if size < 2:
+            raise ValueError("Window size must be >= 2")
+        self.size = size
+        self.resync_every = resync_every
+        self.reset()
+
+    def reset(self):
+        self._x = np.zeros(self.size)
+        self._y = np.zeros(self.size)
+        self._pos = 0
+        self._n = 0
+        self._mean_x = 0.0
+        self._mean_y = 0.0
+        self._cxy = 0.0
+        self._m2y = 0.0
+        self._same = 0       # consecutive identical y values ending at the newest
+        self._last_y = None
+        self._pushes = 0
+
+    def push(self, x, y):
+        """Add a pair, evicting the oldest one once the window is full"""
+        x, y = float(x), float(y)
+        if self._n == self.size:
+            self._remove(self._x[self._pos], self._y[self._pos])
+        self._x[self._pos] = x
+        self._y[self._pos] = y
+        self._pos = (self._pos + 1) % self.size
+        self._add(x, y)
+
+        if y == self._last_y:
+            self._same += 1
+        else:
+            self._same = 1
+        self._last_y = y
+
+        self._pushes += 1
+        if self._pushes % self.resync_every == 0:
+            self._resync()
+
+    def _add(self, x, y):
+        self._n += 1
+        dx = x - self._mean_x
+        self._mean_x += dx / self._n
+        dy = y - self._mean_y
+        self._mean_y += dy / self._n
+        self._cxy += dx * (y - self._mean_y)
+        self._m2y += dy * (y - self._mean_y)
+
+    def _remove(self, x, y):
+        self._n -= 1
+        if self._n == 0:
+            self._mean_x = self._mean_y = self._cxy = self._m2y = 0.0
+            return
+        dx = x - self._mean_x
+        self._mean_x -= dx / self._n
+        dy = y - self._mean_y
+        self._mean_y -= dy / self._n
+        self._cxy -= dx * (y - self._mean_y)
+        self._m2y -= dy * (y - self._mean_y)
+        if self._m2y < 0:
+            self._m2y = 0.0
+
+    def _resync(self):
+        if self._n < self.size:
+            x, y = self._x[:self._n], self._y[:self._n]
+        else:
+            x, y = self._x, self._y
+        self._mean_x = float(x.mean())
+        self._mean_y = float(y.mean())
+        self._cxy = float(((x - self._mean_x) * (y - self._mean_y)).sum())
+        self._m2y = float(((y - self._mean_y) ** 2).sum())
+
+    @property
+    def ready(self):
+        """True once the window holds `size` pairs"""
+        return self._n == self.size
+
+    def _flat_y(self):
+        if self._same >= self.size:
+            return True
+        return self._m2y <= FLAT_EPS * (self._m2y + self._n * self._mean_y ** 2)
+
+    def cov(self, ddof=1):
+        if not self.ready:
+            return np.nan
+        if self._flat_y():
+            return 0.0
+        return self._cxy / (self._n - ddof)
+
+    def var_y(self, ddof=1):
+        if not self.ready:
+            return np.nan
+        if self._flat_y():
+            return 0.0
+        return self._m2y / (self._n - ddof)
+
+    def beta(self):
+        """cov(x, y) / var(y) over the window (NaN when y is flat)"""
+        if not self.ready or self._flat_y():
+            return np.nan
+        return safe_div(self._cxy, self._m2y)
+
+
+def safe_div(a, b):
+    """Float division with NumPy semantics (x/0 -> +-inf, 0/0 -> NaN)"""
+    if b == 0 or math.isnan(b):
+        if math.isnan(a) or math.isnan(b) or a == 0:
+            return np.nan
+        return math.copysign(np.inf, a)
+    return a / b
@@ -1,6 +1,33 @@
 import pandas as pd
 import numpy as np
 
+
+def compute_signals(zscore, mom, vol_pct, regime, z_thresh=1.0, mom_thresh=0.0):
+    """
+    Array version of the signal rules.
+    Inputs are 1-D arrays of equal length, output is an int64 array: 1=Buy, -1=Sell, 0=Flat.
+    NaN inputs never trigger a trade (comparisons against NaN are False).
+    """
+    z = np.asarray(zscore, dtype=np.float64)
+    mom = np.asarray(mom, dtype=np.float64)
+    vol_pct = np.asarray(vol_pct, dtype=np.float64)
+    regime = np.asarray(regime, dtype=np.float64)
+
+    chaos = (regime == 2) | (vol_pct > 0.95)
+    trend = regime == 1
+    rng = regime == 0
+
+    buy = (trend & (z < -z_thresh) & (mom > mom_thresh)) | (rng & (z < -z_thresh))
+    sell = (trend & (z > z_thresh) & (mom < -mom_thresh)) | (rng & (z > z_thresh))
+    # Trend rules check the buy branch first, so a row matching both stays a buy
+    sell &= ~buy
+
+    signal = np.zeros(len(z), dtype=np.int64)
+    signal[buy & ~chaos] = 1
+    signal[sell & ~chaos] = -1
+    return signal
+
+
 class SignalGenerator:
     def __init__(self, z_thresh=1.0, mom_thresh=0.0):
         """
@@ -15,32 +42,33 @@ class SignalGenerator:
         Input: df with features ['zscore', 'mom', 'vol_pct', 'regime']
         Output: df with 'signal' column: 1=Buy, -1=Sell, 0=Flat
         """
-        df = df.copy()
-        df['signal'] = 0  # Default Flat
-
-        for idx, row in df.iterrows():
-            regime = row['regime']
-            z = row['zscore']
-            mom = row['mom']
-            vol_pct = row['vol_pct']
-
-            # Chaos regime: no trades
-            if regime == 2 or vol_pct > 0.95:
-                df.at[idx, 'signal'] = 0
-                continue
-
-            # Trend regime: pullbacks in momentum direction
-            if regime == 1:
-                if z < -self.z_thresh and mom > self.mom_thresh:
-                    df.at[idx, 'signal'] = 1  # Buy
-                elif z > self.z_thresh and mom < -self.mom_thresh:
-                    df.at[idx, 'signal'] = -1  # Sell
-
-            # Range regime: mean reversion
-            elif regime == 0:
-                if z < -self.z_thresh:
-                    df.at[idx, 'signal'] = 1  # Buy
-                elif z > self.z_thresh:
-                    df.at[idx, 'signal'] = -1  # Sell
-
-        return df[['zscore', 'mom', 'vol_pct', 'regime', 'signal']]
+        return df[['zscore', 'mom', 'vol_pct', 'regime']].assign(**self.compute(df))
+
+    def compute(self, df):
+        """{'signal': int64 array} for df; df itself is not modified"""
+        signal = compute_signals(
+            df['zscore'].to_numpy(),
+            df['mom'].to_numpy(),
+            df['vol_pct'].to_numpy(),
+            df['regime'].to_numpy(),
+            self.z_thresh,
+            self.mom_thresh
+        )
+        return {'signal': signal}
+
+    # ------------------------------------------------------------------
+    # Streaming mode
+    # ------------------------------------------------------------------
+    def update(self, row) -> dict:
+        """
+        Streaming equivalent of generate for a single bar.
+        row: dict with 'zscore', 'mom', 'vol_pct' and 'regime'
+        Returns the row's fields plus 'signal'.
+        """
+        signal = compute_signals(
+            [row['zscore']], [row['mom']], [row['vol_pct']], [row['regime']],
+            self.z_thresh, self.mom_thresh
+        )
+        row = dict(row)
+        row['signal'] = int(signal[0])
+        return row
@@ -12,26 +12,52 @@ class Validator:
         """
         Validates signals and ensures chaos regimes are neutralized.
         Always preserves OHLC columns to prevent KeyErrors.
+
+        Returns a new DataFrame; the input frame is left untouched.
         """
+        return df.assign(**self.compute(df))
 
-        # Make a copy to avoid modifying original
-        df = df.copy()
+    def compute(self, df: pd.DataFrame) -> dict:
+        """Missing OHLC columns and the validated 'signal' column as {name: values}"""
+        columns = {}
 
         # Ensure all essential columns exist
         for col in ["xau_open", "xau_high", "xau_low", "xau_close"]:
             if col not in df.columns:
-                df[col] = np.nan
-
-        # Example: zero out signals in chaos regimes
-        if "regime" in df.columns and "signal" in df.columns:
-            chaos_rows = df["regime"] == 2
-            if chaos_rows.any():
-                print(f"Validator: {chaos_rows.sum()} rows in chaos regime. Setting signals to 0.")
-                df.loc[chaos_rows, "signal"] = 0
+                columns[col] = np.nan
 
-        # Fill any missing signals
         if "signal" in df.columns:
-            df["signal"] = df["signal"].fillna(0)
+            signal = df["signal"]
+
+            # Example: zero out signals in chaos regimes
+            if "regime" in df.columns:
+                chaos_rows = df["regime"] == 2
+                if chaos_rows.any():
+                    print(f"Validator: {chaos_rows.sum()} rows in chaos regime. Setting signals to 0.")
+                    signal = signal.mask(chaos_rows, 0)
+
+            # Fill any missing signals
+            columns["signal"] = signal.fillna(0)
 
         print("Validator: validation complete")
-        return df
+        return columns
+
+    # ------------------------------------------------------------------
+    # Streaming mode
+    # ------------------------------------------------------------------
+    def update(self, row) -> dict:
+        """
+        Streaming equivalent of validate for a single bar (without the prints).
+        Returns the row's fields with missing OHLC set to NaN and the signal
+        zeroed in chaos regimes / filled when missing.
+        """
+        row = dict(row)
+        for col in ["xau_open", "xau_high", "xau_low", "xau_close"]:
+            row.setdefault(col, np.nan)
+
+        if "signal" in row:
+            signal = row["signal"]
+            if row.get("regime") == 2 or signal is None or signal != signal:
+                signal = 0
+            row["signal"] = signal
+        return row
@@ -0,0 +1,248 @@
+# backend/data/bar_store.py
+
+import os
+import json
+import logging
+import numpy as np
+import pandas as pd
+
+# Default store location: backend/data/store
+STORE_FOLDER = os.path.join(os.path.dirname(__file__), "store")
+
+TIME_FILE = "time.npy"
+MANIFEST_FILE = "manifest.json"
+
+
+class BarStore:
+    """
+    Columnar on-disk bar store.
+
+    Layout: <root>/<SYMBOL>/<TF>/<YYYY-MM>/<column>.<generation>.npy
+    - one partition per symbol / timeframe / calendar month
+    - 'time' holds int64 nanoseconds (UTC, sorted, unique)
+    - every other column is a float64 array of the same length
+    - manifest.json names the partition's current generation and columns
+
+    A rewrite saves every column under a new generation and then swaps the
+    manifest with one os.replace, so readers (and a restart after a crash
+    mid-write) see either the old or the new partition, never a mix. The
+    previous generation is kept for readers that opened the old manifest;
+    older ones are deleted. Partitions written before manifests existed
+    (<column>.npy) are still read and are converted on their next write.
+
+    Reads memory-map the .npy files and only open the partitions that
+    overlap the requested range, so loading a few months out of 20 years
+    of M1 bars touches a few months of data.
+    """
+
+    def __init__(self, root=STORE_FOLDER):
+        self.root = root
+
+    # ------------------------------------------------------------------
+    # Writing
+    # ------------------------------------------------------------------
+    def write(self, symbol, timeframe, df):
+        """
+        Upsert bars into the store.
+        df: DataFrame indexed by time (or with a 'time' column) with numeric columns.
+        Rows with a timestamp already stored replace the stored row.
+        """
+        df = _with_time_index(df)
+        if df.empty:
+            return
+        months = df.index.to_period("M")
+        for month, part in df.groupby(months):
+            folder = self._partition_path(symbol, timeframe, str(month))
+            existing = self._read_partition(folder, mmap=False)
+            if existing is not None:
+                part = pd.concat([existing, part])
+                part = part[~part.index.duplicated(keep="last")]
+            self._write_partition(folder, part.sort_index())
+
+    def import_csv(self, path, symbol, timeframe, time_col=None, **read_csv_kwargs):
+        """
+        One-off conversion of a CSV history file into the store.
+        time_col: name of the timestamp column (default: 'time' if present, else the first column)
+        """
+        if os.path.getsize(path) == 0:
+            return 0
+        df = pd.read_csv(path, **read_csv_kwargs)
+        if df.empty:
+            return 0
+        time_col = time_col or ("time" if "time" in df.columns else df.columns[0])
+        df = df.set_index(pd.to_datetime(df.pop(time_col)))
+        df.index.name = "time"
+        self.write(symbol, timeframe, df)
+        return len(df)
+
+    def sync_csv(self, path, symbol, timeframe, **import_kwargs):
+        """
+        Keep the store in step with a CSV history file: (re)import it when
+        the store has no data yet or the CSV was modified after the store's
+        last write (rows are upserted, so a re-import is safe).
+        Returns the number of rows imported (0 = store used as is).
+        """
+        logger = logging.getLogger("BarStore")
+        written = self.last_write_time(symbol, timeframe)
+        if not os.path.exists(path):
+            logger.info(f"{symbol} {timeframe}: {path} not found, using the bar store as is")
+            return 0
+        if written is not None and os.stat(path).st_mtime_ns <= written:
+            logger.info(f"{symbol} {timeframe}: bar store is up to date with {path}")
+            return 0
+        rows = self.import_csv(path, symbol, timeframe, **import_kwargs)
+        reason = "new store" if written is None else "CSV is newer than the store"
+        logger.info(f"{symbol} {timeframe}: imported {rows} rows from {path} ({reason})")
+        return rows
+
+    # ------------------------------------------------------------------
+    # Reading
+    # ------------------------------------------------------------------
+    def partitions(self, symbol, timeframe):
+        """Sorted list of stored months ('YYYY-MM')"""
+        folder = os.path.join(self.root, symbol.upper(), timeframe.upper())
+        if not os.path.isdir(folder):
+            return []
+        return sorted(p for p in os.listdir(folder) if _manifest(os.path.join(folder, p)) is not None)
+
+    def load(self, symbol, timeframe, start=None, end=None, columns=None, mmap=True):
+        """
+        Bars with start <= time <= end (either bound may be None).
+        Only partitions overlapping [start, end] are opened.
+        """
+        return _concat(list(self.iter_partitions(symbol, timeframe, start, end, columns, mmap)))
+
+    def iter_partitions(self, symbol, timeframe, start=None, end=None, columns=None, mmap=True):
+        """
+        Same rows as load(), one (memory-mapped) monthly frame at a time, so
+        long histories can be streamed without holding them in memory.
+        """
+        start = pd.Timestamp(start) if start is not None else None
+        end = pd.Timestamp(end) if end is not None else None
+
+        months = self.partitions(symbol, timeframe)
+        if start is not None:
+            months = [m for m in months if m >= start.strftime("%Y-%m")]
+        if end is not None:
+            months = [m for m in months if m <= end.strftime("%Y-%m")]
+
+        for month in months:
+            part = self._read_partition(self._partition_path(symbol, timeframe, month), columns, mmap)
+            if start is not None or end is not None:
+                lo = part.index.searchsorted(start) if start is not None else 0
+                hi = part.index.searchsorted(end, side="right") if end is not None else len(part)
+                part = part.iloc[lo:hi]
+            yield part
+
+    def tail(self, symbol, timeframe, n, columns=None, mmap=True):
+        """Last n bars, reading partitions from the newest backwards"""
+        frames, count = [], 0
+        for month in reversed(self.partitions(symbol, timeframe)):
+            part = self._read_partition(self._partition_path(symbol, timeframe, month), columns, mmap)
+            frames.insert(0, part)
+            count += len(part)
+            if count >= n:
+                break
+        return _concat(frames).iloc[-n:] if n else _concat([])
+
+    def last_timestamp(self, symbol, timeframe):
+        """Timestamp of the newest stored bar, or None"""
+        months = self.partitions(symbol, timeframe)
+        if not months:
+            return None
+        folder = self._partition_path(symbol, timeframe, months[-1])
+        times = np.load(_column_path(folder, _manifest(folder), "time"), mmap_mode="r")
+        return pd.Timestamp(int(times[-1])) if len(times) else None
+
+    def last_write_time(self, symbol, timeframe):
+        """mtime (ns) of the most recently written partition, or None"""
+        times = []
+        for month in self.partitions(symbol, timeframe):
+            folder = self._partition_path(symbol, timeframe, month)
+            marker = MANIFEST_FILE if os.path.isfile(os.path.join(folder, MANIFEST_FILE)) else TIME_FILE
+            times.append(os.stat(os.path.join(folder, marker)).st_mtime_ns)
+        return max(times) if times else None
+
+    # ------------------------------------------------------------------
+    # Partition I/O
+    # ------------------------------------------------------------------
+    def _partition_path(self, symbol, timeframe, month):
+        return os.path.join(self.root, symbol.upper(), timeframe.upper(), month)
+
+    def _read_partition(self, folder, columns=None, mmap=True):
+        manifest = _manifest(folder)
+        if manifest is None:
+            return None
+        mode = "r" if mmap else None
+        times = np.load(_column_path(folder, manifest, "time"), mmap_mode=mode)
+        data = {name: np.load(_column_path(folder, manifest, name), mmap_mode=mode)
+                for name in columns or manifest["columns"]}
+        index = pd.DatetimeIndex(np.asarray(times).view("datetime64[ns]"), name="time")
+        return pd.DataFrame(data, index=index, copy=False)
+
+    def _write_partition(self, folder, df):
+        os.makedirs(folder, exist_ok=True)
+        current = _manifest(folder)
+        generation = (current["generation"] or 0) + 1 if current is not None else 1
+        manifest = {"generation": generation, "columns": sorted(map(str, df.columns))}
+
+        # Every column of the new generation is on disk before the manifest points at it
+        np.save(_column_path(folder, manifest, "time"), df.index.as_unit("ns").asi8)
+        for col in df.columns:
+            np.save(_column_path(folder, manifest, str(col)), df[col].to_numpy(dtype=np.float64))
+        tmp = os.path.join(folder, f".{MANIFEST_FILE}.tmp")
+        with open(tmp, "w") as f:
+            json.dump(manifest, f)
+        os.replace(tmp, os.path.join(folder, MANIFEST_FILE))
+        _drop_old_generations(folder, generation)
+
+
+def _manifest(folder):
+    """Partition manifest; a legacy partition (plain <column>.npy files) gets generation None"""
+    try:
+        with open(os.path.join(folder, MANIFEST_FILE)) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        pass
+    if not os.path.isfile(os.path.join(folder, TIME_FILE)):
+        return None
+    columns = sorted(f[:-4] for f in os.listdir(folder)
+                     if f.endswith(".npy") and f != TIME_FILE and not f.startswith(".") and "." not in f[:-4])
+    return {"generation": None, "columns": columns}
+
+
+def _column_path(folder, manifest, name):
+    generation = manifest["generation"]
+    return os.path.join(folder, f"{name}.npy" if generation is None else f"{name}.{generation}.npy")
+
+
+def _drop_old_generations(folder, generation):
+    """Delete column files older than the previous generation (and legacy ones)"""
+    for f in os.listdir(folder):
+        if not f.endswith(".npy"):
+            continue
+        gen = f[:-4].rpartition(".")[2]
+        if gen.isdigit() and int(gen) >= generation - 1:
+            continue
+        try:
+            os.remove(os.path.join(folder, f))
+        except OSError:
+            pass  # still memory-mapped (Windows); removed by a later write
+
+
+def _with_time_index(df):
+    if "time" in df.columns:
+        df = df.set_index("time")
+    index = pd.DatetimeIndex(pd.to_datetime(df.index))
+    if index.tz is not None:
+        index = index.tz_convert("UTC").tz_localize(None)
+    df = df.set_axis(index.rename("time"))
+    return df.select_dtypes(include=[np.number, "bool"])
+
+
+def _concat(frames):
+    if not frames:
+        return pd.DataFrame(index=pd.DatetimeIndex([], name="time"))
+    if len(frames) == 1:
+        return frames[0]
+    return pd.concat(frames)
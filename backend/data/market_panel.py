@@ -0,0 +1,132 @@
+# backend/data/market_panel.py
+
+import numpy as np
+import pandas as pd
+
+# Column prefix used by the pipeline for each symbol (xau_close, dxy_close, ...)
+SYMBOL_PREFIXES = {"XAUUSD": "xau", "DXY": "dxy"}
+
+FIELDS = ("open", "high", "low", "close")
+
+
+def symbol_prefix(symbol):
+    return SYMBOL_PREFIXES.get(symbol.upper(), symbol.lower())
+
+
+class MarketPanel:
+    """
+    Time-aligned multi-symbol bar panel.
+
+    All symbols share one sorted DatetimeIndex and live in a single 2-D
+    float64 array (rows = bars, columns = <prefix>_<field> grouped by
+    symbol). Alignment and forward-fill happen once at construction; every
+    later consumer (features, beta, signals) reads views of that array
+    instead of re-aligning and copying its own frames.
+    """
+
+    def __init__(self, values, index, columns, symbols, filled=None):
+        self.values = values
+        self.index = index
+        self.columns = list(columns)
+        self.symbols = list(symbols)
+        self.filled = filled if filled is not None else np.zeros((len(index), len(self.symbols)), dtype=bool)
+        self._col = {name: i for i, name in enumerate(self.columns)}
+        self._returns = {}
+
+    @classmethod
+    def from_frames(cls, frames, fields=FIELDS, ffill_limit=None):
+        """
+        frames: {symbol: DataFrame indexed by time}; columns may be raw
+                ('close') or already prefixed ('xau_close')
+        fields: price fields kept per symbol
+        ffill_limit: max consecutive bars a symbol is carried forward when it
+                     has no bar at a timestamp (None = unlimited)
+        Rows before every symbol has printed at least once are dropped.
+        """
+        symbols = list(frames)
+        prepared = {s: _normalize(frames[s], symbol_prefix(s), fields) for s in symbols}
+        index = prepared[symbols[0]].index
+        for s in symbols[1:]:
+            index = index.union(prepared[s].index)
+
+        columns = [f"{symbol_prefix(s)}_{f}" for s in symbols for f in fields]
+        values = np.empty((len(index), len(columns)))
+        filled = np.zeros((len(index), len(symbols)), dtype=bool)
+        for k, s in enumerate(symbols):
+            frame = prepared[s]
+            aligned = frame.reindex(index)
+            missing = aligned.isna().all(axis=1).to_numpy()
+            aligned = aligned.ffill(limit=ffill_limit)
+            filled[:, k] = missing & aligned.notna().all(axis=1).to_numpy()
+            values[:, k * len(fields):(k + 1) * len(fields)] = aligned.to_numpy()
+
+        start = int(np.argmax(~np.isnan(values).any(axis=1))) if len(values) else 0
+        return cls(values[start:], index[start:], columns, symbols, filled[start:])
+
+    @classmethod
+    def from_store(cls, store, symbols, timeframe, start=None, end=None, **kwargs):
+        """Build a panel straight from a BarStore range query"""
+        frames = {s: store.load(s, timeframe, start, end) for s in symbols}
+        return cls.from_frames(frames, **kwargs)
+
+    def __len__(self):
+        return len(self.index)
+
+    def column(self, name):
+        """1-D view of one column"""
+        return self.values[:, self._col[name]]
+
+    def frame(self):
+        """Whole panel as a DataFrame backed by the panel array"""
+        return pd.DataFrame(self.values, index=self.index, columns=self.columns, copy=False)
+
+    def symbol(self, symbol, as_prefix=None):
+        """
+        One symbol's columns as a DataFrame view.
+        as_prefix: rename the columns to another prefix, e.g. as_prefix="xau"
+                   to run the xau_* feature pipeline on any symbol.
+        """
+        k = self.symbols.index(symbol)
+        width = len(self.columns) // len(self.symbols)
+        cols = self.columns[k * width:(k + 1) * width]
+        if as_prefix is not None:
+            cols = [f"{as_prefix}_{c.split('_', 1)[1]}" for c in cols]
+        return pd.DataFrame(self.values[:, k * width:(k + 1) * width], index=self.index, columns=cols, copy=False)
+
+    def returns(self, symbol, field="close"):
+        """
+        Percentage returns of one symbol on the shared index (cached).
+        Forward-filled bars have no return of their own and are NaN (not a
+        stale 0), so rolling statistics skip them as if the bar were absent;
+        the first real bar after a gap returns against the last real price.
+        """
+        key = (symbol, field)
+        if key not in self._returns:
+            prices = self.column(f"{symbol_prefix(symbol)}_{field}")
+            r = np.full(len(prices), np.nan)
+            r[1:] = prices[1:] / prices[:-1] - 1
+            r[self.is_filled(symbol)] = np.nan
+            self._returns[key] = pd.Series(r, index=self.index, name=f"{symbol_prefix(symbol)}_returns")
+        return self._returns[key]
+
+    def is_filled(self, symbol):
+        """True on bars where the symbol's prices were carried forward"""
+        return self.filled[:, self.symbols.index(symbol)]
+
+
+def _normalize(df, prefix, fields):
+    """Index by time and keep <prefix>_<field> columns"""
+    if "time" in df.columns:
+        df = df.set_index("time")
+    out = {}
+    for f in fields:
+        name = f"{prefix}_{f}"
+        if name in df.columns:
+            out[name] = df[name]
+        elif f in df.columns:
+            out[name] = df[f]
+        else:
+            raise ValueError(f"Missing column '{f}' for {prefix}")
+    out = pd.DataFrame(out)
+    out.index = pd.DatetimeIndex(out.index)
+    return out[~out.index.duplicated(keep="last")].sort_index()
@@ -1,18 +1,49 @@
-import MetaTrader5 as mt5
+import weakref
+import logging
 import pandas as pd
-from datetime import datetime
+from datetime import datetime, timezone
+
+try:
+    import MetaTrader5 as mt5
+except ImportError:  # MetaTrader5 only ships for Windows; inject a module instead
+    mt5 = None
+
+RATE_COLUMNS = ["time", "open", "high", "low", "close", "tick_volume"]
+
+# Modules already initialized (weak, so a recycled id() never counts as initialized)
+_initialized = weakref.WeakSet()
+
+
+def ensure_initialized(module=None):
+    """Call module.initialize() once per process instead of once per fetcher"""
+    module = module or mt5
+    if module is None:
+        raise RuntimeError("MetaTrader5 package is not installed")
+    if module not in _initialized:
+        if not module.initialize():
+            raise RuntimeError("MT5 initialization failed")
+        _initialized.add(module)
+    return module
+
+
+def rates_to_frame(rates):
+    """MT5 rates array -> DataFrame with standardized price columns"""
+    df = pd.DataFrame(rates)
+    df["time"] = pd.to_datetime(df["time"], unit="s")
+
+    # 🔒 STANDARDIZED PRICE COLUMNS
+    return df[RATE_COLUMNS]
+
 
 class MT5DataFetcher:
-    def __init__(self, symbol="XAUUSD", timeframe=mt5.TIMEFRAME_M1, bars=200):
+    def __init__(self, symbol="XAUUSD", timeframe=None, bars=200, mt5_module=None):
+        self.mt5 = ensure_initialized(mt5_module)
         self.symbol = symbol
-        self.timeframe = timeframe
+        self.timeframe = timeframe if timeframe is not None else self.mt5.TIMEFRAME_M1
         self.bars = bars
 
-        if not mt5.initialize():
-            raise RuntimeError("MT5 initialization failed")
-
     def fetch(self):
-        rates = mt5.copy_rates_from_pos(
+        rates = self.mt5.copy_rates_from_pos(
             self.symbol,
             self.timeframe,
             0,
@@ -22,8 +53,128 @@ class MT5DataFetcher:
         if rates is None or len(rates) == 0:
             return None
 
-        df = pd.DataFrame(rates)
-        df["time"] = pd.to_datetime(df["time"], unit="s")
+        return rates_to_frame(rates)
+
+
+class MT5HistoryCache:
+    """
+    Incremental MT5 history sync with an in-memory rolling window.
+
+    Remembers the last synced bar per (symbol, timeframe) and on each sync
+    only asks MT5 for bars from that point on (the last bar is re-read as
+    it may still have been forming). New bars are appended to the in-memory
+    window (capped at max_bars) and, if a BarStore is given, persisted to it.
+    On first use the window is seeded from the store when it has data.
+
+    After downtime longer than max_bars bars the missing range is backfilled
+    with copy_rates_range, so the store keeps a continuous history; if that
+    fails the hole is logged and recorded in self.gaps.
+    """
+
+    # window() ends with the current, still-forming candle (see Pipeline.step)
+    forming = True
+
+    def __init__(self, mt5_module=None, store=None, max_bars=5000, initial_bars=1000):
+        """
+        mt5_module: MetaTrader5 module (or a fake with the same API)
+        store: optional data.bar_store.BarStore used as local persistent cache
+        max_bars: bars kept in memory per symbol/timeframe
+        initial_bars: bars requested on the first sync of an empty cache
+        """
+        self.mt5 = ensure_initialized(mt5_module)
+        self.store = store
+        self.max_bars = max_bars
+        self.initial_bars = initial_bars
+        self._frames = {}
+        self._last = {}
+        self.gaps = []  # (symbol, timeframe, last synced bar, first bar received) never backfilled
+        self.logger = logging.getLogger("MT5HistoryCache")
+
+    def _timeframe(self, timeframe):
+        """'M15' -> mt5.TIMEFRAME_M15 (MT5 constants are passed through)"""
+        if isinstance(timeframe, str):
+            return getattr(self.mt5, f"TIMEFRAME_{timeframe.upper()}")
+        return timeframe
+
+    def last_synced(self, symbol, timeframe):
+        return self._last.get((symbol, str(timeframe)))
+
+    def sync(self, symbol, timeframe="M1"):
+        """Fetch bars newer than the last sync. Returns the number of bars received."""
+        key = (symbol, str(timeframe))
+        if key not in self._frames:
+            self._seed_from_store(symbol, timeframe)
+
+        last = self._last.get(key)
+        new = self._fetch_since(symbol, timeframe, last)
+        if new is None or new.empty:
+            return 0
+
+        frame = self._frames.get(key)
+        if frame is not None and not frame.empty:
+            # The re-read last bar replaces the stored (possibly forming) one
+            new_frame = pd.concat([frame[frame.index < new.index[0]], new])
+        else:
+            new_frame = new
+        self._frames[key] = new_frame.iloc[-self.max_bars:]
+        self._last[key] = new.index[-1]
+
+        if self.store is not None:
+            self.store.write(symbol, str(timeframe), new)
+        return len(new) if last is None else int((new.index > last).sum())
+
+    def window(self, symbol, timeframe="M1", n=200):
+        """Last n cached bars (indexed by time, MT5 column names)"""
+        frame = self._frames.get((symbol, str(timeframe)))
+        if frame is None:
+            return None
+        return frame.iloc[-n:]
+
+    def _fetch_since(self, symbol, timeframe, last):
+        """
+        Bars from `last` (inclusive) to now. Without a last timestamp the
+        newest initial_bars are fetched; otherwise the request size doubles
+        until the oldest returned bar reaches `last` (or max_bars, beyond
+        which the older part is backfilled by date range).
+        """
+        tf = self._timeframe(timeframe)
+        count = self.initial_bars if last is None else 8
+        while True:
+            rates = self.mt5.copy_rates_from_pos(symbol, tf, 0, count)
+            if rates is None or len(rates) == 0:
+                return None
+            df = rates_to_frame(rates).set_index("time")
+            if last is None:
+                return df
+            if df.index[0] <= last or len(rates) < count:
+                return df[df.index >= last]
+            if count >= self.max_bars:
+                return self._backfill(symbol, timeframe, last, df)
+            count *= 2
+
+    def _backfill(self, symbol, timeframe, last, df):
+        """Bars from `last` up to the newest max_bars bars in df, fetched by date range"""
+        copy_rates_range = getattr(self.mt5, "copy_rates_range", None)
+        rates = None
+        if callable(copy_rates_range):
+            rates = copy_rates_range(
+                symbol, self._timeframe(timeframe),
+                last.to_pydatetime().replace(tzinfo=timezone.utc),
+                df.index[0].to_pydatetime().replace(tzinfo=timezone.utc)
+            )
+        if rates is None or len(rates) == 0:
+            self.gaps.append((symbol, str(timeframe), last, df.index[0]))
+            self.logger.warning(f"{symbol} {timeframe}: bars between {last} and {df.index[0]} could not be backfilled")
+            return df
+        older = rates_to_frame(rates).set_index("time")
+        older = older[(older.index >= last) & (older.index < df.index[0])]
+        return pd.concat([older, df])
 
-        # 🔒 STANDARDIZED PRICE COLUMNS
-        return df[["time", "open", "high", "low", "close", "tick_volume"]]
+    def _seed_from_store(self, symbol, timeframe):
+        key = (symbol, str(timeframe))
+        if self.store is None:
+            return
+        cached = self.store.tail(symbol, str(timeframe), self.max_bars)
+        if not cached.empty:
+            self._frames[key] = cached[[c for c in RATE_COLUMNS[1:] if c in cached.columns]].copy()
+            self._last[key] = cached.index[-1]
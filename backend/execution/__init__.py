@@ -7,14 +7,18 @@ Modules:
 - mt5_executor: handles live/paper order execution
 - virtual_broker: backtest or paper trade simulation
 - trade_logger: logging trades and rejections
+- trade_journal: append-only binary trade journal and its reader
 """
 
 from .mt5_executor import MT5Executor
 from .virtual_broker import VirtualBroker
 from .trade_logger import TradeLogger
+from .trade_journal import TradeJournal, read_journal
 
 __all__ = [
     "MT5Executor",
     "VirtualBroker",
-    "TradeLogger"
+    "TradeLogger",
+    "TradeJournal",
+    "read_journal"
 ]
@@ -11,11 +11,18 @@ class MT5Executor:
     Can simulate paper trades or interface with real MT5 orders.
     """
 
-    def __init__(self, mode="paper"):
+    def __init__(self, mode="paper", slippage_pct=0.0002, seed=None, trade_logger=None):
         """
         mode: "paper" or "live"
+        slippage_pct: max simulated slippage as a fraction of price (paper mode)
+        seed: seed for the slippage generator, for reproducible paper fills
+        trade_logger: TradeLogger receiving executed trades (default: the shared
+                      process-wide logger; TradeLogger(enabled=False) to skip disk I/O)
         """
         self.mode = mode
+        self.trade_logger = trade_logger if trade_logger is not None else TradeLogger.default()
+        self.slippage_pct = slippage_pct
+        self.rng = random.Random(seed)
         self.logger = logging.getLogger("MT5Executor")
 
     def send_order(self, symbol, direction, volume, price=None, sl=None, tp=None):
@@ -29,7 +36,7 @@ class MT5Executor:
         if self.mode == "paper":
             trade = self._simulate_order(symbol, direction, volume, price, sl, tp)
             # Log the trade
-            TradeLogger.log_trade({
+            self.trade_logger.log_trade({
                 "symbol": trade["symbol"],
                 "direction": "BUY" if direction == 1 else "SELL",
                 "size": volume,
@@ -50,8 +57,8 @@ class MT5Executor:
         # 1. Fake market price if not provided
         market_price = price or self._get_market_price(symbol)
         
-        # 2. Apply slippage (random 0-0.02%)
-        slippage = market_price * random.uniform(-0.0002, 0.0002)
+        # 2. Apply slippage (random, up to slippage_pct)
+        slippage = market_price * self.rng.uniform(-self.slippage_pct, self.slippage_pct)
         executed_price = market_price + slippage
 
         # 3. Log the simulated trade internally
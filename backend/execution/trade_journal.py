@@ -0,0 +1,165 @@
+# backend/execution/trade_journal.py
+
+import os
+import logging
+import numpy as np
+import pandas as pd
+
+JOURNAL_MAGIC = b"GQTJ"
+JOURNAL_VERSION = 1
+HEADER_SIZE = 16
+
+KIND_EXECUTED = 0
+KIND_REJECTED = 1
+KIND_NAMES = np.array(["executed", "rejected"], dtype=object)
+
+# One fixed-width little-endian record per trade (128 bytes). Text fields
+# are 8-byte aligned multiples of 8 so the reader can hash them as uint64s.
+JOURNAL_DTYPE = np.dtype([
+    ("timestamp", "<i8"),   # logged wall-clock time, ns since 1970-01-01
+    ("size", "<f8"),
+    ("entry", "<f8"),
+    ("sl", "<f8"),
+    ("tp", "<f8"),
+    ("symbol", "S16"),
+    ("status", "S16"),
+    ("reason", "S48"),
+    ("kind", "u1"),         # KIND_EXECUTED / KIND_REJECTED
+    ("direction", "i1"),    # 1 = BUY, -1 = SELL, 0 = unknown
+    ("_pad", "V6"),
+])
+
+
+class TradeJournal:
+    """
+    Append-only binary trade journal.
+
+    File layout: a 16-byte header (magic, version, record size) followed by
+    fixed-width JOURNAL_DTYPE records. Appends only ever add whole records,
+    and the reader ignores a trailing partial record, so a crash mid-write
+    loses at most the record being written. read_journal() memory-maps the
+    records, so loading millions of trades involves no text parsing.
+    """
+
+    def __init__(self, path):
+        self.path = path
+
+    def append(self, records):
+        """
+        records: iterable of dicts with keys timestamp (datetime/Timestamp),
+                 kind, symbol, direction ('BUY'/'SELL' or +-1), size, entry,
+                 sl, tp, status, reason
+        Returns the number of records written.
+        """
+        records = list(records)
+        if not records:
+            return 0
+        out = np.zeros(len(records), dtype=JOURNAL_DTYPE)
+        out["timestamp"] = [pd.Timestamp(r["timestamp"]).value for r in records]
+        out["kind"] = [r.get("kind", KIND_EXECUTED) for r in records]
+        out["direction"] = [_direction_code(r.get("direction")) for r in records]
+        for field in ("size", "entry", "sl", "tp"):
+            out[field] = [_float(r.get(field)) for r in records]
+        for field in ("symbol", "status", "reason"):
+            out[field] = [_encode(r.get(field), field) for r in records]
+
+        size = os.path.getsize(self.path) if os.path.exists(self.path) else 0
+        with open(self.path, "ab") as f:
+            if size == 0:
+                f.write(_header())
+            elif (size - HEADER_SIZE) % JOURNAL_DTYPE.itemsize:
+                # Drop a partial record left by an interrupted write
+                f.truncate(size - (size - HEADER_SIZE) % JOURNAL_DTYPE.itemsize)
+            f.write(out.tobytes())
+        return len(out)
+
+    def read(self, kind=None):
+        return read_journal(self.path, kind)
+
+
+def read_journal(path, kind=None):
+    """
+    Memory-map a journal file into a DataFrame.
+    kind: None for all records, or "executed" / "rejected"
+    """
+    columns = ["timestamp", "kind", "symbol", "direction", "size", "entry", "sl", "tp", "status", "reason"]
+    if not os.path.exists(path) or os.path.getsize(path) < HEADER_SIZE:
+        return pd.DataFrame(columns=columns)
+
+    with open(path, "rb") as f:
+        header = f.read(HEADER_SIZE)
+    magic, version, itemsize = header[:4], int.from_bytes(header[4:6], "little"), int.from_bytes(header[6:8], "little")
+    if magic != JOURNAL_MAGIC or version != JOURNAL_VERSION or itemsize != JOURNAL_DTYPE.itemsize:
+        raise ValueError(f"{path} is not a version {JOURNAL_VERSION} trade journal")
+
+    n = (os.path.getsize(path) - HEADER_SIZE) // JOURNAL_DTYPE.itemsize
+    if n == 0:
+        return pd.DataFrame(columns=columns)
+    rec = np.memmap(path, dtype=JOURNAL_DTYPE, mode="r", offset=HEADER_SIZE, shape=(n,))
+    if kind is not None:
+        rec = rec[rec["kind"] == list(KIND_NAMES).index(kind)]
+
+    return pd.DataFrame({
+        "timestamp": pd.DatetimeIndex(rec["timestamp"].view("datetime64[ns]")),
+        "kind": pd.Categorical.from_codes(rec["kind"].astype(np.int8), categories=list(KIND_NAMES)),
+        "symbol": _decode(rec["symbol"]),
+        "direction": rec["direction"].astype(np.int8),
+        "size": rec["size"],
+        "entry": rec["entry"],
+        "sl": rec["sl"],
+        "tp": rec["tp"],
+        "status": _decode(rec["status"]),
+        "reason": _decode(rec["reason"]),
+    })
+
+
+def _header():
+    header = JOURNAL_MAGIC + JOURNAL_VERSION.to_bytes(2, "little") + JOURNAL_DTYPE.itemsize.to_bytes(2, "little")
+    return header.ljust(HEADER_SIZE, b"\0")
+
+
+def _direction_code(direction):
+    if direction in ("BUY", 1):
+        return 1
+    if direction in ("SELL", -1):
+        return -1
+    return 0
+
+
+def _float(x):
+    return np.nan if x is None else float(x)
+
+
+def _encode(text, field):
+    """UTF-8 bytes of text cut to the field width on a character boundary"""
+    if text is None:
+        return b""
+    data = str(text).encode()
+    width = JOURNAL_DTYPE[field].itemsize
+    if len(data) > width:
+        # errors="ignore" drops a character split by the cut; a split one would make the field undecodable
+        data = data[:width].decode(errors="ignore").encode()
+        logging.getLogger("TradeJournal").warning(f"{field} truncated to {width} bytes: {text!r}")
+    return data
+
+
+def _decode(values):
+    """
+    Fixed-width bytes -> categorical without building Python strings per row:
+    the field is read as uint64 words, factorized word by word into one exact
+    code, and only the distinct values are decoded.
+    """
+    if len(values) == 0:
+        return pd.Categorical([])
+    words = np.ascontiguousarray(values).view("<u8").reshape(len(values), -1)
+    codes = np.zeros(len(values), dtype=np.int64)
+    for k in range(words.shape[1]):
+        word_codes, word_uniques = pd.factorize(words[:, k])
+        if len(word_uniques) == 1:
+            continue  # constant word (e.g. trailing padding) adds nothing
+        codes, _ = pd.factorize(codes * len(word_uniques) + word_codes)
+    # factorize numbers values in order of appearance: the running max of
+    # the codes steps up exactly at each value's first row
+    first = np.flatnonzero(np.diff(np.maximum.accumulate(codes), prepend=-1) > 0)
+    # errors="replace": journals written before _encode cut on character boundaries
+    return pd.Categorical.from_codes(codes, categories=[values[i].decode(errors="replace") for i in first])
@@ -2,8 +2,13 @@
 
 import csv
 import os
+import time
+import queue
+import atexit
 import logging
+import threading
 from datetime import datetime
+from .trade_journal import TradeJournal, KIND_EXECUTED, KIND_REJECTED
 
 # Ensure logs folder exists
 LOGS_FOLDER = os.path.join(os.path.dirname(__file__), "../logs")
@@ -11,8 +16,27 @@ os.makedirs(LOGS_FOLDER, exist_ok=True)
 
 TRADES_FILE = os.path.join(LOGS_FOLDER, "trades.csv")
 REJECTED_FILE = os.path.join(LOGS_FOLDER, "rejected_trades.csv")
+JOURNAL_FILE = os.path.join(LOGS_FOLDER, "trades.journal")
 SYSTEM_LOG = os.path.join(LOGS_FOLDER, "system.log")
 
+TRADE_FIELDS = ["timestamp", "symbol", "direction", "size", "entry", "sl", "tp", "status"]
+REJECTED_FIELDS = ["timestamp", "symbol", "direction", "size", "entry", "reason"]
+
+
+class _shared_or_bound:
+    """
+    Method decorator: called on an instance it is a plain method; called on
+    the class (TradeLogger.log_trade(trade), the pre-queue static API) it
+    runs on the shared TradeLogger.default().
+    """
+
+    def __init__(self, func):
+        self.func = func
+        self.__doc__ = func.__doc__
+
+    def __get__(self, obj, cls):
+        return self.func.__get__(cls.default() if obj is None else obj, cls)
+
 
 # Configure Python logger for system messages
 logging.basicConfig(
@@ -23,47 +47,105 @@ logging.basicConfig(
 
 
 class TradeLogger:
-    """Handles trade logging for executed and rejected trades"""
+    """
+    Handles trade logging for executed and rejected trades.
 
-    @staticmethod
-    def log_trade(trade):
-        """Append executed trade to trades.csv"""
-        fieldnames = ["timestamp", "symbol", "direction", "size", "entry", "sl", "tp", "status"]
-        file_exists = os.path.exists(TRADES_FILE)
-
-        with open(TRADES_FILE, "a", newline="") as f:
-            writer = csv.DictWriter(f, fieldnames=fieldnames)
-            if not file_exists:
-                writer.writeheader()
-            writer.writerow({
-                "timestamp": datetime.now().isoformat(),
-                "symbol": trade.get("symbol"),
-                "direction": trade.get("direction"),
-                "size": trade.get("size"),
-                "entry": trade.get("entry"),
-                "sl": trade.get("sl"),
-                "tp": trade.get("tp"),
-                "status": trade.get("status", "executed"),
-            })
+    Rows are queued by the caller and written in batches by a background
+    thread: a batch is flushed once `batch_size` rows are waiting or
+    `flush_interval` seconds have passed, whichever comes first. The queue
+    is bounded (callers block when the writer falls `max_queue` rows
+    behind). flush() waits until everything queued is on disk and close()
+    flushes and stops the writer; the shared default logger is closed at
+    interpreter exit. log_trade / log_rejected called on the class, as
+    before the queue existed (TradeLogger.log_trade(trade)), go to that
+    default logger.
 
-    @staticmethod
-    def log_rejected(trade, reason=""):
-        """Append rejected trade to rejected_trades.csv"""
-        fieldnames = ["timestamp", "symbol", "direction", "size", "entry", "reason"]
-        file_exists = os.path.exists(REJECTED_FILE)
-
-        with open(REJECTED_FILE, "a", newline="") as f:
-            writer = csv.DictWriter(f, fieldnames=fieldnames)
-            if not file_exists:
-                writer.writeheader()
-            writer.writerow({
-                "timestamp": datetime.now().isoformat(),
-                "symbol": trade.get("symbol"),
-                "direction": trade.get("direction"),
-                "size": trade.get("size"),
-                "entry": trade.get("entry"),
-                "reason": reason,
-            })
+    A failed write (disk full, file locked) is logged and its batch dropped;
+    the writer keeps serving the queue. Should the writer thread die anyway,
+    rows are written synchronously by the caller instead of blocking on a
+    queue nobody drains.
+
+    enabled=False drops trade rows without touching the disk (backtests).
+    With a journal_file, every batch is also appended to a binary
+    TradeJournal (executed and rejected trades in one file) that
+    read_journal() loads without parsing CSV text.
+    """
+
+    _default = None
+
+    def __init__(self, trades_file=TRADES_FILE, rejected_file=REJECTED_FILE, enabled=True,
+                 batch_size=256, flush_interval=1.0, max_queue=10000, journal_file=None):
+        """
+        trades_file / rejected_file: CSV destinations
+        journal_file: optional binary journal path (e.g. JOURNAL_FILE)
+        enabled: False to skip disk logging entirely
+        batch_size: rows per write
+        flush_interval: max seconds a row waits in the queue
+        max_queue: queue bound (backpressure on the caller)
+        """
+        self.trades_file = trades_file
+        self.rejected_file = rejected_file
+        self.journal = TradeJournal(journal_file) if journal_file is not None else None
+        self.enabled = enabled
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._thread = None
+        self._lock = threading.Lock()
+        self._closed = False
+
+    @classmethod
+    def default(cls):
+        """Process-wide logger writing to logs/trades.csv and logs/rejected_trades.csv"""
+        if cls._default is None:
+            cls._default = cls()
+            atexit.register(cls._default.close)
+        return cls._default
+
+    @_shared_or_bound
+    def log_trade(self, trade):
+        """Queue an executed trade for trades.csv"""
+        self._put(KIND_EXECUTED, (
+            datetime.now(),
+            trade.get("symbol"),
+            trade.get("direction"),
+            trade.get("size"),
+            trade.get("entry"),
+            trade.get("sl"),
+            trade.get("tp"),
+            trade.get("status", "executed"),
+        ))
+
+    @_shared_or_bound
+    def log_rejected(self, trade, reason=""):
+        """Queue a rejected trade for rejected_trades.csv"""
+        self._put(KIND_REJECTED, (
+            datetime.now(),
+            trade.get("symbol"),
+            trade.get("direction"),
+            trade.get("size"),
+            trade.get("entry"),
+            reason,
+        ))
+
+    def flush(self):
+        """Block until every queued row has been written"""
+        if self._thread is None or not self._thread.is_alive():
+            return
+        done = threading.Event()
+        if self._enqueue(done):
+            while not done.wait(0.1) and self._thread.is_alive():
+                pass
+
+    def close(self):
+        """Flush and stop the writer thread (further rows are dropped)"""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+        if self._thread is not None and self._thread.is_alive():
+            self._queue.put(None)
+            self._thread.join()
 
     @staticmethod
     def log_system(message, level="info"):
@@ -74,3 +156,85 @@ class TradeLogger:
             logging.error(message)
         else:
             logging.info(message)
+
+    # ------------------------------------------------------------------
+    # Writer thread
+    # ------------------------------------------------------------------
+    def _put(self, kind, row):
+        if not self.enabled or self._closed:
+            return
+        if self._thread is None:
+            with self._lock:
+                if self._thread is None:
+                    self._thread = threading.Thread(target=self._run, name="TradeLogger", daemon=True)
+                    self._thread.start()
+        if not self._enqueue((kind, row)):
+            self._write_safely([(kind, row)])
+
+    def _enqueue(self, item):
+        """Queue an item for the writer; False if the writer thread is gone"""
+        while self._thread.is_alive():
+            try:
+                self._queue.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _run(self):
+        pending = []
+        deadline = None
+        while True:
+            timeout = max(deadline - time.monotonic(), 0) if pending else None
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                item = False
+
+            if isinstance(item, tuple):
+                if not pending:
+                    deadline = time.monotonic() + self.flush_interval
+                pending.append(item)
+                if len(pending) < self.batch_size and time.monotonic() < deadline:
+                    continue
+            # Batch full, interval elapsed, flush request or shutdown
+            try:
+                if pending:
+                    self._write_safely(pending)
+                    pending = []
+            finally:
+                if isinstance(item, threading.Event):
+                    item.set()
+            if item is None:
+                return
+
+    def _write_safely(self, rows):
+        """_write() that logs and drops the batch on failure instead of raising"""
+        try:
+            self._write(rows)
+        except Exception:
+            logging.exception(f"TradeLogger: failed to write {len(rows)} trade rows")
+
+    def _write(self, rows):
+        """Append a batch: one open per CSV file, one journal append"""
+        files = {
+            KIND_EXECUTED: (self.trades_file, TRADE_FIELDS, []),
+            KIND_REJECTED: (self.rejected_file, REJECTED_FIELDS, []),
+        }
+        for kind, row in rows:
+            files[kind][2].append((row[0].isoformat(),) + row[1:])
+        for path, fieldnames, file_rows in files.values():
+            if not file_rows:
+                continue
+            file_exists = os.path.exists(path)
+            with open(path, "a", newline="") as f:
+                writer = csv.writer(f)
+                if not file_exists:
+                    writer.writerow(fieldnames)
+                writer.writerows(file_rows)
+
+        if self.journal is not None:
+            self.journal.append(
+                dict(zip(TRADE_FIELDS if kind == KIND_EXECUTED else REJECTED_FIELDS, row), kind=kind)
+                for kind, row in rows
+            )
@@ -1,61 +1,183 @@
 # backend/execution/virtual_broker.py
 
+import heapq
 import logging
+from itertools import count
 from .mt5_executor import MT5Executor
 
+# Price-level books per symbol: "above" holds levels triggered when the price
+# rises to them (long TP, short SL), "below" levels triggered when it falls
+# to them (long SL, short TP)
+ABOVE, BELOW = "above", "below"
+
+
 class VirtualBroker:
     """
     Simulated broker for backtesting and paper trading.
-    Wraps MT5Executor and manages multiple trades.
+    Wraps MT5Executor and keeps an indexed book of open positions.
+
+    Every trade gets an integer 'id'. Open positions are indexed by id and
+    by symbol (dicts, O(1) insert / close), and their SL/TP levels sit in
+    two heaps per symbol, so update_price() only looks at the levels the
+    new price has crossed: O(k log n) for k triggered stops among n open
+    positions. Heap entries of closed or modified trades are dropped
+    lazily and the heaps are rebuilt once they are mostly stale.
     """
 
-    def __init__(self, mode="paper"):
-        self.executor = MT5Executor(mode=mode)
+    def __init__(self, mode="paper", executor=None):
+        """
+        mode: "paper" or "live" (for MT5Executor)
+        executor: MT5Executor to send orders through (a new one if not given)
+        """
+        self.executor = executor or MT5Executor(mode=mode)
         self.logger = logging.getLogger("VirtualBroker")
-        self.active_trades = []
+        self.positions = {}   # id -> open trade
+        self.by_symbol = {}   # symbol -> {id: open trade}
+        self.closed_trades = []
+        self.realized_pnl = 0.0
+        self._levels = {}     # symbol -> {ABOVE: min-heap, BELOW: max-heap}
+        self._ids = count(1)
+
+    @property
+    def active_trades(self):
+        """Open trades in the order they were placed"""
+        return list(self.positions.values())
 
     def place_trade(self, symbol, direction, volume, price=None, sl=None, tp=None):
         """
         Place a single trade via MT5Executor.
-        Stores trade in active_trades list.
+        Stores the trade (with a new 'id') in the open-position book.
         """
         trade = self.executor.send_order(symbol, direction, volume, price, sl, tp)
-        self.active_trades.append(trade)
+        trade["id"] = next(self._ids)
+        self.positions[trade["id"]] = trade
+        self.by_symbol.setdefault(symbol, {})[trade["id"]] = trade
+        self._index_levels(trade)
         self.logger.info(f"Trade placed: {trade}")
         return trade
 
-    def close_trade(self, trade, exit_price=None):
+    def modify_trade(self, trade, sl=None, tp=None):
+        """Move the SL and/or TP of an open trade (trade dict or id)"""
+        trade = self.positions[_trade_id(trade)]
+        if sl is not None:
+            trade["sl"] = sl
+        if tp is not None:
+            trade["tp"] = tp
+        # Entries for the old levels no longer match the trade and are skipped
+        self._index_levels(trade, sl=sl is not None, tp=tp is not None)
+        self._compact(trade["symbol"])
+        return trade
+
+    def close_trade(self, trade, exit_price=None, reason="manual"):
         """
-        Close a specific trade.
+        Close a specific trade (trade dict or id) at exit_price (default: entry price).
+        Returns the closed trade, or None if it is not open.
         """
-        trade['exit_price'] = exit_price or trade['entry_price']
-        trade['status'] = "closed"
+        trade = self.positions.pop(_trade_id(trade), None)
+        if trade is None:
+            self.logger.warning("close_trade: trade is not open")
+            return None
+        symbol_book = self.by_symbol[trade["symbol"]]
+        del symbol_book[trade["id"]]
+        if not symbol_book:
+            del self.by_symbol[trade["symbol"]]
+            self._levels.pop(trade["symbol"], None)
+
+        trade["exit_price"] = trade["entry_price"] if exit_price is None else exit_price
+        trade["exit_reason"] = reason
+        trade["status"] = "closed"
+        trade["pnl"] = (trade["exit_price"] - trade["entry_price"]) * trade["direction"] * trade["volume"]
+        self.realized_pnl += trade["pnl"]
+        self.closed_trades.append(trade)
         self.logger.info(f"Trade closed: {trade}")
-        # Remove from active trades
-        self.active_trades = [t for t in self.active_trades if t != trade]
+        return trade
 
     def close_all_trades(self, exit_prices=None):
         """
         Close all active trades. Optionally provide a dict of exit_prices keyed by symbol.
         """
-        for trade in self.active_trades.copy():
+        for trade in self.active_trades:
             price = exit_prices.get(trade['symbol']) if exit_prices else None
             self.close_trade(trade, exit_price=price)
 
-    def get_open_trades(self):
+    def update_price(self, symbol, price):
         """
-        Return a list of currently active trades.
+        New price for symbol: closes every open trade whose SL or TP it
+        reached (filled at this price) and returns them.
         """
+        levels = self._levels.get(symbol)
+        if levels is None:
+            return []
+        triggered = []
+        above, below = levels[ABOVE], levels[BELOW]
+        while above and above[0][0] <= price:
+            triggered.append(heapq.heappop(above))
+        while below and -below[0][0] >= price:
+            triggered.append(heapq.heappop(below))
+
+        closed = []
+        for _, trade_id, kind, level in triggered:
+            trade = self.positions.get(trade_id)
+            if trade is None or trade[kind] != level:
+                continue  # closed or modified since it was indexed
+            closed.append(self.close_trade(trade, exit_price=price, reason=kind))
+        if symbol in self._levels:
+            self._compact(symbol)
+        return closed
+
+    def update_prices(self, prices):
+        """update_price() for a dict of prices keyed by symbol; returns all closed trades"""
+        closed = []
+        for symbol, price in prices.items():
+            closed.extend(self.update_price(symbol, price))
+        return closed
+
+    def get_open_trades(self, symbol=None):
+        """
+        Return a list of currently active trades (of one symbol if given).
+        """
+        if symbol is not None:
+            return list(self.by_symbol.get(symbol, {}).values())
         return self.active_trades
 
     def summary(self):
         """
         Simple summary of trades: open, closed, PnL (simulated)
         """
-        open_count = len(self.active_trades)
-        closed_count = sum(1 for t in self.active_trades if t.get('status') == 'closed')
+        open_count = len(self.positions)
+        closed_count = len(self.closed_trades)
         self.logger.info(f"Open trades: {open_count}, Closed trades: {closed_count}")
         return {
             "open_trades": open_count,
-            "closed_trades": closed_count
+            "closed_trades": closed_count,
+            "realized_pnl": self.realized_pnl
         }
+
+    # ------------------------------------------------------------------
+    # SL/TP level heaps
+    # ------------------------------------------------------------------
+    def _index_levels(self, trade, sl=True, tp=True):
+        levels = self._levels.setdefault(trade["symbol"], {ABOVE: [], BELOW: []})
+        for kind in [k for k, wanted in (("sl", sl), ("tp", tp)) if wanted]:
+            level = trade.get(kind)
+            if level is None:
+                continue
+            # Long SL / short TP trigger on the way down, the others on the way up
+            side = BELOW if (kind == "sl") == (trade["direction"] == 1) else ABOVE
+            key = -level if side == BELOW else level
+            heapq.heappush(levels[side], (key, trade["id"], kind, level))
+
+    def _compact(self, symbol):
+        """Rebuild a symbol's heaps once stale entries outnumber live ones"""
+        levels = self._levels[symbol]
+        live = 2 * len(self.by_symbol.get(symbol, ()))
+        if len(levels[ABOVE]) + len(levels[BELOW]) <= 2 * live + 64:
+            return
+        for side in (ABOVE, BELOW):
+            levels[side] = [entry for entry in levels[side]
+                            if entry[1] in self.positions and self.positions[entry[1]][entry[2]] == entry[3]]
+            heapq.heapify(levels[side])
+
+
+def _trade_id(trade):
+    return trade["id"] if isinstance(trade, dict) else trade
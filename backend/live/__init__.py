@@ -5,16 +5,20 @@ Live trading package.
 
 Modules:
 - mt5_connector: initializes MT5, checks symbols
-- heartbeat: timing logic for H1 / M15 loops
+- heartbeat: drift-free multi-timeframe (M1-D1) candle scheduler
+- async_runner: candle-aligned asyncio runner processing symbols concurrently
 - run_live: main live loop for 24/5 trading
+- replay: offline tick / bar replay through the live code path (bars/s)
 """
 
 from .mt5_connector import MT5Connector
 from .heartbeat import Heartbeat
+from .async_runner import AsyncLiveRunner
 from .run_live import run_live_loop  # Assuming your function is named like this
 
 __all__ = [
     "MT5Connector",
     "Heartbeat",
+    "AsyncLiveRunner",
     "run_live_loop"
 ]
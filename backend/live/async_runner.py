@@ -0,0 +1,166 @@
+# backend/live/async_runner.py
+
+import asyncio
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from .heartbeat import Heartbeat
+
+# _work() result of a symbol whose data arrived after the cycle deadline
+_LATE = object()
+
+
+class AsyncLiveRunner:
+    """
+    Candle-aligned asyncio runner for live / paper trading.
+
+    Each cycle starts on a Heartbeat candle boundary and handles every
+    symbol concurrently: fetch(symbol) and process(symbol, data) are plain
+    blocking functions (MT5 calls, pandas work) run on a thread pool, so a
+    slow symbol no longer delays the others. The whole cycle has a deadline
+    measured from the start of the cycle on the heartbeat's clock. A
+    symbol whose fetch returns after the deadline is not processed (no
+    order on stale data), and process() can refuse orders once it has
+    passed by checking past_deadline() (Pipeline.order(expired=...)).
+    Symbols still running when it expires are reported as timed out; their
+    pool thread cannot be interrupted, so the symbol stays in flight until
+    it returns, is skipped by the cycles that start before then, and its
+    result (which may include an order) is reported by the next cycle.
+
+    Every cycle returns (and logs) a report:
+        candle      - candle time (UTC)
+        elapsed     - seconds from cycle start to the last symbol finishing
+        deadline    - seconds allowed
+        utilization - elapsed / candle interval
+        completed   - {symbol: process() result}
+        timed_out   - symbols that missed the deadline
+        skipped     - symbols still running from an earlier cycle
+        late        - {symbol: result or exception} of timed out symbols
+                      that finished after their cycle was reported
+        errors      - {symbol: exception} for symbols that raised
+    """
+
+    def __init__(self, symbols, fetch, process, heartbeat=None, deadline=None, max_workers=None):
+        """
+        symbols: symbols handled every cycle
+        fetch: fetch(symbol) -> data (blocking)
+        process: process(symbol, data) -> result (blocking)
+        heartbeat: Heartbeat giving the candle interval (default M15)
+        deadline: seconds per cycle (default 80% of the candle interval)
+        max_workers: thread pool size (default one per symbol)
+        """
+        self.symbols = list(symbols)
+        self.fetch = fetch
+        self.process = process
+        self.heartbeat = heartbeat or Heartbeat("M15")
+        self.deadline = deadline if deadline is not None else 0.8 * self.heartbeat.interval
+        self.pool = ThreadPoolExecutor(max_workers=max_workers or max(len(self.symbols), 1),
+                                       thread_name_prefix="live")
+        self.reports = []
+        self._in_flight = set()
+        self._jobs = {}  # symbol -> pool future of its latest job
+        self._late = {}
+        self._late_lock = threading.Lock()
+        self._cycle = threading.local()  # deadline of the cycle a pool thread works for
+        self.logger = logging.getLogger("AsyncLiveRunner")
+
+    async def run_cycle(self, candle=None):
+        """Fetch and process all symbols once, within the deadline"""
+        clock = self.heartbeat.clock
+        started = clock.monotonic()
+        skipped = sorted(symbol for symbol in self.symbols if symbol in self._in_flight)
+        tasks = {asyncio.ensure_future(self._handle(symbol, started + self.deadline)): symbol
+                 for symbol in self.symbols if symbol not in self._in_flight}
+        done, pending = await asyncio.wait(tasks, timeout=self.deadline) if tasks else (set(), set())
+        for task in pending:
+            task.cancel()
+            # The pool job keeps running: report what it did once it returns
+            symbol = tasks[task]
+            self._jobs[symbol].add_done_callback(lambda job, symbol=symbol: self._finished_late(symbol, job))
+        with self._late_lock:
+            late, self._late = self._late, {}
+
+        report = {
+            "candle": candle,
+            "elapsed": clock.monotonic() - started,
+            "deadline": self.deadline,
+            "completed": {},
+            "timed_out": [tasks[t] for t in pending],
+            "skipped": skipped,
+            "late": late,
+            "errors": {},
+        }
+        report["utilization"] = report["elapsed"] / self.heartbeat.interval
+        for task in done:
+            if task.exception() is not None:
+                report["errors"][tasks[task]] = task.exception()
+            elif task.result() is _LATE:
+                report["timed_out"].append(tasks[task])
+            else:
+                report["completed"][tasks[task]] = task.result()
+        report["timed_out"].sort()
+
+        self.reports.append(report)
+        level = logging.WARNING if report["timed_out"] or skipped or late or report["errors"] else logging.INFO
+        self.logger.log(
+            level,
+            f"Cycle {candle}: {report['elapsed']:.3f}s ({report['utilization']:.1%} of candle), "
+            f"completed={sorted(report['completed'])} timed_out={report['timed_out']} "
+            f"skipped={skipped} late={sorted(late)} errors={sorted(report['errors'])}"
+        )
+        return report
+
+    def past_deadline(self):
+        """
+        True in a pool thread whose cycle deadline has passed (False outside
+        a cycle); pass as Pipeline.order(expired=...) to refuse late orders.
+        """
+        deadline_at = getattr(self._cycle, "deadline_at", None)
+        return deadline_at is not None and self.heartbeat.clock.monotonic() > deadline_at
+
+    async def _handle(self, symbol, deadline_at):
+        # The symbol is in flight until its pool job finishes or is cancelled
+        # before starting, not merely until this cycle stops waiting for it
+        self._in_flight.add(symbol)
+        future = self._jobs[symbol] = self.pool.submit(self._work, symbol, deadline_at)
+        future.add_done_callback(lambda _: self._in_flight.discard(symbol))
+        return await asyncio.wrap_future(future)
+
+    def _work(self, symbol, deadline_at):
+        """fetch + process of one symbol (pool thread); no process() once the deadline has passed"""
+        self._cycle.deadline_at = deadline_at
+        try:
+            data = self.fetch(symbol)
+            if self.past_deadline():
+                self.logger.warning(f"{symbol}: data arrived after the cycle deadline, order skipped")
+                return _LATE
+            return self.process(symbol, data)
+        finally:
+            self._cycle.deadline_at = None
+
+    def _finished_late(self, symbol, job):
+        """Done callback of a timed out symbol's pool job: keep its outcome for the next report"""
+        if job.cancelled():
+            return
+        outcome = job.exception() if job.exception() is not None else job.result()
+        if outcome is _LATE:
+            return
+        self.logger.warning(f"{symbol}: finished after its cycle deadline: {outcome!r}")
+        with self._late_lock:
+            self._late[symbol] = outcome
+
+    async def run(self, max_cycles=None):
+        """Run one cycle per candle (forever unless max_cycles is given)"""
+        cycles = 0
+        while max_cycles is None or cycles < max_cycles:
+            candle = await self.heartbeat.wait_for_next_candle_async()
+            await self.run_cycle(candle)
+            cycles += 1
+
+    def start(self, max_cycles=None):
+        """Blocking entry point for scripts"""
+        print(f"Starting async {self.heartbeat.timeframe} loop for {', '.join(self.symbols)}...")
+        try:
+            asyncio.run(self.run(max_cycles))
+        finally:
+            self.pool.shutdown(wait=False, cancel_futures=True)
@@ -1,46 +1,252 @@
 # backend/live/heartbeat.py
 
 import time
-from datetime import datetime, timedelta
+import asyncio
+import logging
+from datetime import datetime, timezone
+from concurrent.futures import ThreadPoolExecutor
+
+# Candle length in seconds per timeframe
+TIMEFRAMES = {
+    "M1": 60,
+    "M5": 5 * 60,
+    "M15": 15 * 60,
+    "M30": 30 * 60,
+    "H1": 60 * 60,
+    "H4": 4 * 60 * 60,
+    "D1": 24 * 60 * 60,
+}
+
+# Longest single sleep: a host suspended mid-sleep (when the monotonic clock
+# stops) is noticed at most this many seconds after it resumes
+MAX_SLEEP = 60.0
+
+
+class SystemClock:
+    """Real time: wall clock for candle alignment, monotonic clock for waiting"""
+
+    def time(self):
+        return time.time()
+
+    def monotonic(self):
+        return time.monotonic()
+
+    def sleep(self, seconds):
+        time.sleep(seconds)
+
+    async def sleep_async(self, seconds):
+        await asyncio.sleep(seconds)
+
+
+class ManualClock:
+    """
+    Fake clock for tests and replays: time only moves through sleep()/advance(),
+    so a scheduler driven by it runs instantly and deterministically.
+    suspend() moves the wall clock only, like a host resuming from sleep.
+    """
+
+    def __init__(self, start=0.0):
+        self.now = float(start)
+        self.suspended = 0.0  # wall clock lead over the monotonic clock
+
+    def time(self):
+        return self.now + self.suspended
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.advance(seconds)
+
+    async def sleep_async(self, seconds):
+        self.advance(seconds)
+        await asyncio.sleep(0)
+
+    def advance(self, seconds):
+        self.now += max(seconds, 0.0)
+
+    def suspend(self, seconds):
+        self.suspended += max(seconds, 0.0)
+
 
 class Heartbeat:
     """
     Timing logic for live trading loops.
-    Supports M15 (15-min) or H1 loops for checking signals and executing trades.
+    Supports M1, M5, M15, M30, H1, H4 and D1 candles.
+
+    Candle boundaries are aligned on the wall clock once, then waited for on
+    the monotonic clock (wall time = wall at start + monotonic elapsed), so
+    sleeps never accumulate drift and clock adjustments cannot fire a
+    candle twice. The monotonic clock stops while the host is suspended:
+    when the wall clock runs ahead of it by more than resync_tolerance, the
+    anchor is moved forward to the wall clock (backward steps are ignored),
+    and sleeps are capped at MAX_SLEEP so a resume is noticed promptly.
+    Several timeframes can be scheduled in one loop with
+    subscribe(); when the loop wakes up after more than one boundary of a
+    timeframe has passed (slow callback, suspended host) only the newest
+    candle fires and the skipped ones are counted and logged as missed.
+
+    With workers > 0, subscriptions run on a thread pool so a slow H1 job
+    never delays M1 processing; a candle arriving while the previous
+    callback of the same subscription is still running is skipped and
+    counted as an overrun.
     """
 
-    def __init__(self, timeframe="M15"):
+    def __init__(self, timeframe="M15", clock=None, workers=0, resync_tolerance=2.0):
         """
-        timeframe: "M15" or "H1"
+        timeframe: default timeframe, one of TIMEFRAMES
+        clock: SystemClock (default) or ManualClock
+        workers: thread pool size for callbacks (0 = run callbacks inline)
+        resync_tolerance: seconds the wall clock may run ahead of the
+                          anchored time before re-anchoring (suspend / resume)
         """
-        self.timeframe = timeframe
+        self.timeframe = timeframe.upper()
         self.interval = self._get_interval_seconds(timeframe)
+        self.clock = clock or SystemClock()
+        self.workers = workers
+        self.resync_tolerance = resync_tolerance
+        self.pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="heartbeat") if workers else None
+        self.subscriptions = []
+        self.stats = {}
+        self.logger = logging.getLogger("Heartbeat")
+        self._anchor = None
 
     def _get_interval_seconds(self, timeframe):
         """Convert timeframe string to seconds"""
-        if timeframe.upper() == "M15":
-            return 15 * 60
-        elif timeframe.upper() == "H1":
-            return 60 * 60
-        else:
-            raise ValueError(f"Unsupported timeframe: {timeframe}")
+        try:
+            return TIMEFRAMES[timeframe.upper()]
+        except KeyError:
+            raise ValueError(f"Unsupported timeframe: {timeframe}") from None
+
+    # ------------------------------------------------------------------
+    # Clock
+    # ------------------------------------------------------------------
+    def now(self):
+        """Drift-free wall time: wall clock at the anchor + monotonic elapsed"""
+        wall_now, mono_now = self.clock.time(), self.clock.monotonic()
+        if self._anchor is None:
+            self._anchor = (wall_now, mono_now)
+        wall, mono = self._anchor
+        now = wall + (mono_now - mono)
+        if wall_now - now > self.resync_tolerance:
+            # Monotonic time stood still while the wall clock ran on: the host was suspended
+            self.logger.warning(f"Wall clock {wall_now - now:.1f}s ahead of the monotonic clock "
+                                f"(host suspended?), re-anchoring")
+            self._anchor = (wall_now, mono_now)
+            now = wall_now
+        return now
+
+    def next_candle(self, now=None, interval=None):
+        """
+        Epoch seconds of the next candle boundary and the seconds left until it.
+        now: epoch seconds (default: current time)
+        """
+        now = self.now() if now is None else now
+        interval = interval or self.interval
+        # Align to the next multiple of interval
+        next_candle_ts = (int(now // interval) + 1) * interval
+        return next_candle_ts, next_candle_ts - now
+
+    def _sleep_until(self, ts):
+        """Sleep until wall time ts, re-checking after each sleep"""
+        while True:
+            remaining = ts - self.now()
+            if remaining <= 0:
+                return
+            self.clock.sleep(min(remaining, MAX_SLEEP))
 
     def wait_for_next_candle(self):
         """
         Wait until the next candle is complete.
         Returns the timestamp of the next candle.
         """
-        now = datetime.utcnow()
-        # Align to the next multiple of interval
-        seconds_since_epoch = int(now.timestamp())
-        next_candle_ts = ((seconds_since_epoch // self.interval) + 1) * self.interval
-        wait_seconds = next_candle_ts - seconds_since_epoch
+        next_candle_ts, _ = self.next_candle()
+        self._sleep_until(next_candle_ts)
+        return _utc(next_candle_ts)
+
+    async def wait_for_next_candle_async(self):
+        """Non-blocking wait_for_next_candle for asyncio loops"""
+        next_candle_ts, _ = self.next_candle()
+        while (remaining := next_candle_ts - self.now()) > 0:
+            await self.clock.sleep_async(min(remaining, MAX_SLEEP))
+        return _utc(next_candle_ts)
+
+    # ------------------------------------------------------------------
+    # Multi-timeframe scheduling
+    # ------------------------------------------------------------------
+    def subscribe(self, timeframe, callback, threaded=None):
+        """
+        Call callback(candle_time, timeframe) on every new candle of timeframe.
+        threaded: run on the worker pool (default: True when workers > 0)
+        """
+        timeframe = timeframe.upper()
+        interval = self._get_interval_seconds(timeframe)
+        threaded = self.pool is not None if threaded is None else threaded
+        if threaded and self.pool is None:
+            raise ValueError("threaded callbacks need workers > 0")
+        sub = {"timeframe": timeframe, "interval": interval, "callback": callback,
+               "threaded": threaded, "next": None, "future": None,
+               "stats": {"fired": 0, "missed": 0, "overruns": 0, "errors": 0, "max_lag": 0.0}}
+        self.subscriptions.append(sub)
+        self.stats.setdefault(timeframe, []).append(sub["stats"])
+        return sub
+
+    def run(self, max_candles=None, until=None):
+        """
+        Dispatch subscribed callbacks until max_candles candles fired (over all
+        subscriptions) or wall time `until` is reached (both None = forever).
+        """
+        if not self.subscriptions:
+            raise ValueError("No subscriptions")
+        now = self.now()
+        for sub in self.subscriptions:
+            sub["next"] = self.next_candle(now, sub["interval"])[0]
+
+        fired = 0
+        while max_candles is None or fired < max_candles:
+            due = min(sub["next"] for sub in self.subscriptions)
+            if until is not None and due > until:
+                return
+            self._sleep_until(due)
+            now = self.now()
+            for sub in self.subscriptions:
+                if sub["next"] <= now:
+                    self._fire(sub, now)
+                    fired += 1
+
+    def _fire(self, sub, now):
+        interval, stats = sub["interval"], sub["stats"]
+        candle_ts = int(now // interval) * interval
+        missed = int((candle_ts - sub["next"]) // interval)
+        sub["next"] = candle_ts + interval
+        candle = _utc(candle_ts)
+
+        if missed:
+            stats["missed"] += missed
+            self.logger.warning(f"{sub['timeframe']}: missed {missed} candle(s) before {candle}")
+        stats["max_lag"] = max(stats["max_lag"], now - candle_ts)
+
+        if sub["threaded"]:
+            if sub["future"] is not None and not sub["future"].done():
+                stats["overruns"] += 1
+                self.logger.warning(f"{sub['timeframe']}: previous callback still running, skipping {candle}")
+                return
+            stats["fired"] += 1
+            sub["future"] = self.pool.submit(self._call, sub, candle)
+        else:
+            stats["fired"] += 1
+            self._call(sub, candle)
 
-        if wait_seconds > 0:
-            time.sleep(wait_seconds)
+    def _call(self, sub, candle):
+        try:
+            sub["callback"](candle, sub["timeframe"])
+        except Exception as e:
+            sub["stats"]["errors"] += 1
+            self.logger.exception(f"[Heartbeat Error] {sub['timeframe']} {candle}: {e}")
 
-        next_candle_time = datetime.utcfromtimestamp(next_candle_ts)
-        return next_candle_time
+    def shutdown(self, wait=True):
+        if self.pool is not None:
+            self.pool.shutdown(wait=wait)
 
     def start_loop(self, callback):
         """
@@ -48,10 +254,18 @@ class Heartbeat:
         `callback` is a function that runs every candle.
         """
         print(f"Starting live {self.timeframe} loop...")
-        while True:
-            next_candle = self.wait_for_next_candle()
-            print(f"[Heartbeat] New candle at {next_candle}")
+
+        def on_candle(candle, timeframe):
+            print(f"[Heartbeat] New candle at {candle}")
             try:
                 callback()
             except Exception as e:
                 print(f"[Heartbeat Error] {e}")
+
+        self.subscribe(self.timeframe, on_candle, threaded=False)
+        self.run()
+
+
+def _utc(ts):
+    """Epoch seconds -> naive UTC datetime (as the loops have always used)"""
+    return datetime.fromtimestamp(ts, tz=timezone.utc).replace(tzinfo=None)
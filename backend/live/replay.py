@@ -0,0 +1,326 @@
+# backend/live/replay.py
+
+"""
+Offline replay of recorded ticks / bars through the live code path.
+
+Recorded data is read from the BarStore as a generator pipeline:
+
+    BarStore.iter_partitions  memory-mapped monthly frames
+    -> read_chunks            frames of at most chunk_size rows
+    -> ticks_to_bars          (tick data only) completed OHLC bars
+    -> iter_bars              one (time_ns, bar) at a time
+    -> Replay                 heap-merged across symbols, paced by `speed`
+
+so only a chunk per symbol is ever materialized, however long the history.
+Replay pushes every bar into a ReplayHistory - a drop-in for the
+MT5HistoryCache used by TradingLoop and live.run_live - and then calls the
+consumer exactly as a new candle would, so the same fetch / pipeline /
+risk / order code runs offline and its throughput is reported in bars/s.
+
+Usage (from backend/, replays through live.run_live):
+    python -m live.replay XAUUSD DXY --timeframe M15 --start 2024-01-01 --speed 0
+    python -m live.replay XAUUSD --ticks --timeframe M1 --speed 60    # 1 minute per second
+"""
+
+import sys
+import time
+import heapq
+import logging
+import argparse
+import numpy as np
+import pandas as pd
+from data.bar_store import BarStore
+from data.mt5_data import RATE_COLUMNS
+from live.heartbeat import SystemClock, TIMEFRAMES
+
+BAR_COLUMNS = RATE_COLUMNS[1:]  # open, high, low, close, tick_volume
+TICK_TIMEFRAME = "TICK"         # store timeframe holding raw ticks
+CHUNK_SIZE = 100_000            # rows materialized at a time per symbol
+
+
+# ----------------------------------------------------------------------
+# Generator pipeline
+# ----------------------------------------------------------------------
+def read_chunks(store, symbol, timeframe, start=None, end=None, columns=None, chunk_size=CHUNK_SIZE):
+    """Stored rows in frames of at most chunk_size rows (slices of the memory-mapped partitions)"""
+    for part in store.iter_partitions(symbol, timeframe, start, end, columns):
+        for lo in range(0, len(part), chunk_size):
+            yield part.iloc[lo:lo + chunk_size]
+
+
+def ticks_to_bars(chunks, timeframe="M1", price="bid"):
+    """
+    Aggregate tick frames (time index, `price` column) into OHLC bars with
+    MT5 column names, indexed by bar open time. Only completed bars are
+    yielded: the ticks of the last bar of a chunk are carried into the next
+    one, and the final bar is emitted when the ticks run out.
+    """
+    interval = TIMEFRAMES[timeframe.upper()] * 1_000_000_000
+    carry_t = np.zeros(0, dtype=np.int64)
+    carry_p = np.zeros(0)
+    for chunk in chunks:
+        t = chunk.index.as_unit("ns").asi8
+        p = chunk[price].to_numpy(dtype=np.float64)
+        if len(carry_t):
+            t, p = np.concatenate([carry_t, t]), np.concatenate([carry_p, p])
+        if not len(t):
+            continue
+        bucket = t // interval
+        last = np.searchsorted(bucket, bucket[-1])  # first tick of the (maybe) open bar
+        if last:
+            yield _ohlc(bucket[:last], p[:last], interval)
+        carry_t, carry_p = t[last:].copy(), p[last:].copy()
+    if len(carry_t):
+        yield _ohlc(carry_t // interval, carry_p, interval)
+
+
+def _ohlc(bucket, price, interval):
+    starts = np.flatnonzero(np.concatenate([[True], bucket[1:] != bucket[:-1]]))
+    ends = np.append(starts[1:], len(price))
+    return pd.DataFrame({
+        "open": price[starts],
+        "high": np.maximum.reduceat(price, starts),
+        "low": np.minimum.reduceat(price, starts),
+        "close": price[ends - 1],
+        "tick_volume": (ends - starts).astype(np.float64),
+    }, index=pd.DatetimeIndex((bucket[starts] * interval).view("datetime64[ns]"), name="time"))
+
+
+def iter_bars(frames):
+    """Bar frames -> (time in ns, row of BAR_COLUMNS values) one bar at a time"""
+    for frame in frames:
+        values = frame.reindex(columns=BAR_COLUMNS).to_numpy(dtype=np.float64)
+        values[:, 4] = np.nan_to_num(values[:, 4])  # stores without tick_volume
+        yield from zip(frame.index.as_unit("ns").asi8.tolist(), values)
+
+
+# ----------------------------------------------------------------------
+# History served to the consumer
+# ----------------------------------------------------------------------
+class ReplayHistory:
+    """
+    MT5HistoryCache stand-in filled by a Replay.
+
+    sync() reports the bars pushed since the previous sync and window()
+    returns the last n of them with MT5 column names, indexed by time.
+    Bars live in per symbol/timeframe arrays of 2 x max_bars rows that are
+    compacted when full, so pushing a bar is O(1) amortized.
+    """
+
+    # Unlike MT5, the newest bar of window() is already closed
+    forming = False
+
+    def __init__(self, max_bars=5000):
+        self.max_bars = max_bars
+        self._buffers = {}
+        self._last = {}
+
+    def push(self, symbol, timeframe, time_ns, bar):
+        key = (symbol, str(timeframe))
+        buffer = self._buffers.get(key)
+        if buffer is None:
+            buffer = self._buffers[key] = {
+                "time": np.zeros(2 * self.max_bars, dtype=np.int64),
+                "values": np.zeros((2 * self.max_bars, len(BAR_COLUMNS))),
+                "size": 0,
+                "pending": 0,
+            }
+        size = buffer["size"]
+        if size == len(buffer["time"]):
+            keep = self.max_bars
+            buffer["time"][:keep] = buffer["time"][size - keep:size]
+            buffer["values"][:keep] = buffer["values"][size - keep:size]
+            size = keep
+        buffer["time"][size] = time_ns
+        buffer["values"][size] = bar
+        buffer["size"] = size + 1
+        buffer["pending"] += 1
+
+    def last_synced(self, symbol, timeframe):
+        return self._last.get((symbol, str(timeframe)))
+
+    def sync(self, symbol, timeframe="M1"):
+        """Number of bars pushed since the previous sync"""
+        key = (symbol, str(timeframe))
+        buffer = self._buffers.get(key)
+        if buffer is None or not buffer["pending"]:
+            return 0
+        new, buffer["pending"] = buffer["pending"], 0
+        self._last[key] = pd.Timestamp(int(buffer["time"][buffer["size"] - 1]))
+        return new
+
+    def window(self, symbol, timeframe="M1", n=200):
+        """Last n pushed bars (indexed by time, MT5 column names)"""
+        buffer = self._buffers.get((symbol, str(timeframe)))
+        if buffer is None:
+            return None
+        hi = buffer["size"]
+        lo = max(hi - min(n, self.max_bars), 0)
+        # Copies: the buffers are overwritten when compacted
+        index = pd.DatetimeIndex(buffer["time"][lo:hi].copy().view("datetime64[ns]"), name="time")
+        return pd.DataFrame(buffer["values"][lo:hi].copy(), columns=BAR_COLUMNS, index=index)
+
+
+# ----------------------------------------------------------------------
+# Replay driver
+# ----------------------------------------------------------------------
+class Replay:
+    """
+    Streams recorded bars of one or more symbols in time order into a
+    ReplayHistory and calls on_bar(symbol, bar_time) after each one.
+
+    speed: market seconds replayed per wall second (60 = one M1 bar per
+           second); None or 0 replays as fast as possible
+    clock: SystemClock (default) or ManualClock used for pacing
+    """
+
+    def __init__(self, streams, timeframe="M1", speed=None, clock=None, history=None):
+        """
+        streams: {symbol: iterable of (time_ns, bar row)}, e.g. from iter_bars()
+        timeframe: timeframe the bars are pushed under (what the consumer syncs)
+        history: ReplayHistory to fill (a new one if not given)
+        """
+        self.streams = dict(streams)
+        self.timeframe = timeframe.upper()
+        self.speed = speed or None
+        self.clock = clock or SystemClock()
+        self.history = history or ReplayHistory()
+        self.stats = {}
+        self.logger = logging.getLogger("Replay")
+
+    @classmethod
+    def from_store(cls, store, symbols, timeframe="M1", start=None, end=None, ticks=False,
+                   price="bid", chunk_size=CHUNK_SIZE, **kwargs):
+        """
+        Replay bars stored under `timeframe`, or with ticks=True aggregate the
+        ticks stored under TICK_TIMEFRAME into `timeframe` bars on the fly.
+        """
+        streams = {}
+        for symbol in symbols:
+            if ticks:
+                chunks = read_chunks(store, symbol, TICK_TIMEFRAME, start, end, [price], chunk_size)
+                frames = ticks_to_bars(chunks, timeframe, price)
+            else:
+                frames = read_chunks(store, symbol, timeframe, start, end, chunk_size=chunk_size)
+            streams[symbol] = iter_bars(frames)
+        return cls(streams, timeframe=timeframe, **kwargs)
+
+    def events(self):
+        """(time_ns, symbol, bar) of all symbols, merged in time order"""
+        tagged = [_tag(stream, order, symbol) for order, (symbol, stream) in enumerate(self.streams.items())]
+        for t, _, symbol, bar in heapq.merge(*tagged, key=lambda event: event[:2]):
+            yield t, symbol, bar
+
+    def run(self, on_bar, max_bars=None):
+        """
+        Replay until the data (or max_bars) runs out.
+        Returns and stores in self.stats: bars, seconds (wall), bars_per_s,
+        first / last bar time and max_lag (seconds behind the paced schedule).
+        """
+        bars, max_lag = 0, 0.0
+        first = last = anchor = None
+        started = time.perf_counter()
+
+        for t, symbol, bar in self.events():
+            if max_bars is not None and bars >= max_bars:
+                break
+            if self.speed:
+                if anchor is None:
+                    anchor = (t, self.clock.monotonic())
+                due = anchor[1] + (t - anchor[0]) / 1e9 / self.speed
+                wait = due - self.clock.monotonic()
+                if wait > 0:
+                    self.clock.sleep(wait)
+                else:
+                    max_lag = max(max_lag, -wait)
+
+            self.history.push(symbol, self.timeframe, t, bar)
+            candle = pd.Timestamp(t)
+            on_bar(symbol, candle)
+            if first is None:
+                first = candle
+            last = candle
+            bars += 1
+
+        seconds = time.perf_counter() - started
+        self.stats = {
+            "bars": bars,
+            "seconds": seconds,
+            "bars_per_s": bars / seconds if seconds > 0 else None,
+            "first": first,
+            "last": last,
+            "max_lag": max_lag,
+        }
+        self.logger.info(f"Replayed {bars} bars in {seconds:.2f}s ({self.stats['bars_per_s'] or 0:,.0f} bars/s)")
+        return self.stats
+
+
+def _tag(stream, order, symbol):
+    # A function, not a generator expression in events(): those would read
+    # order / symbol lazily and tag every stream with the last symbol
+    return ((t, order, symbol, bar) for t, bar in stream)
+
+
+# ----------------------------------------------------------------------
+# Consumers
+# ----------------------------------------------------------------------
+def trading_loop_callback(loop, replay, force_test_trade=False):
+    """
+    on_bar running one TradingLoop cycle per replayed bar of the loop's
+    symbol (bars of other symbols only fill the history). The loop fetches
+    its symbol's M1 window from the replay history, so replay that symbol
+    with timeframe="M1".
+    """
+    loop.history = replay.history
+
+    def on_bar(symbol, candle):
+        if symbol == loop.symbol:
+            loop.run_once(force_test_trade=force_test_trade)
+    return on_bar
+
+
+def live_runner_callback(runner, replay):
+    """
+    on_bar running live.run_live's fetch + process for the bar's symbol
+    (runner: the live.run_live module, replayed under its TIMEFRAME).
+    Replays trade against the paper executor only: raises ValueError when
+    the runner is configured for live orders.
+    """
+    if runner.MODE != "paper" or runner.executor.mode != "paper":
+        raise ValueError("Replays must run in paper mode: set run_live.MODE = \"paper\"")
+    runner.history = replay.history
+
+    def on_bar(symbol, candle):
+        return runner.process(symbol, runner.fetch(symbol))
+    return on_bar
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m live.replay", description=__doc__.strip().split("\n")[0])
+    parser.add_argument("symbols", nargs="+")
+    parser.add_argument("--timeframe", help="bar timeframe (default: run_live.TIMEFRAME)")
+    parser.add_argument("--ticks", action="store_true", help=f"aggregate ticks stored under {TICK_TIMEFRAME}")
+    parser.add_argument("--price", default="bid", help="tick price column (default: %(default)s)")
+    parser.add_argument("--start")
+    parser.add_argument("--end")
+    parser.add_argument("--speed", type=float, default=0, help="market seconds per wall second (0 = max)")
+    parser.add_argument("--max-bars", type=int)
+    args = parser.parse_args(argv)
+
+    from live import run_live
+    replay = Replay.from_store(
+        BarStore(), args.symbols, timeframe=args.timeframe or run_live.TIMEFRAME,
+        start=args.start, end=args.end, ticks=args.ticks, price=args.price, speed=args.speed
+    )
+    try:
+        on_bar = live_runner_callback(run_live, replay)
+    except ValueError as e:
+        parser.error(str(e))
+    stats = replay.run(on_bar, max_bars=args.max_bars)
+    print(f"Replayed {stats['bars']:,} bars ({stats['first']} .. {stats['last']}) in "
+          f"{stats['seconds']:.2f}s: {stats['bars_per_s'] or 0:,.0f} bars/s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -2,22 +2,26 @@
 
 import pandas as pd
 import logging
-import time
+import threading
 import os
-from live.mt5_connector import MT5Connector
+from live.heartbeat import Heartbeat
+from live.async_runner import AsyncLiveRunner
+from core.pipeline import Pipeline
 from core.regime_detector import RegimeDetector
-from core.feature_engineer import FeatureEngineer
-from core.signal_generator import SignalGenerator
+from data.mt5_data import MT5HistoryCache
+from data.bar_store import BarStore
 from risk.risk_manager import RiskManager
 from risk.kill_switch import KillSwitch
+from execution.mt5_executor import MT5Executor
 
 # ---------------------------
 # Config
 # ---------------------------
 MODE = "paper"  # "paper" or "live"
 SYMBOLS = ["XAUUSD", "DXY"]
-TIMEFRAME = "15min"
+TIMEFRAME = "M15"
 CANDLES = 200
+CYCLE_DEADLINE = 60  # seconds per candle for fetching + processing all symbols
 
 ACCOUNT_EQUITY = 100000
 RISK_PER_TRADE = 0.01
@@ -39,69 +43,84 @@ logger = logging.getLogger("RunLive")
 # ---------------------------
 # Initialize modules
 # ---------------------------
-connector = MT5Connector(mode=MODE)
-regime_detector = RegimeDetector(vol_window=100)
-feature_engineer = FeatureEngineer()
-signal_generator = SignalGenerator()
+history = None  # MT5HistoryCache, connected by run_live_loop()
+runner = None   # AsyncLiveRunner started by run_live_loop() (None when replayed)
 risk_manager = RiskManager(account_equity=ACCOUNT_EQUITY, risk_per_trade=RISK_PER_TRADE)
 kill_switch = KillSwitch(max_drawdown_pct=MAX_DRAWDOWN, min_expectancy=MIN_EXPECTANCY)
+executor = MT5Executor(mode=MODE)
+
+# One streaming pipeline per symbol; risk, kill switch and executor are shared
+pipelines = {
+    symbol: Pipeline(
+        regime_detector=RegimeDetector(vol_window=100),
+        risk_manager=risk_manager,
+        kill_switch=kill_switch,
+        executor=executor
+    )
+    for symbol in SYMBOLS
+}
 
 equity = ACCOUNT_EQUITY
 kill_switch.reset(equity)
+equity_lock = threading.Lock()  # symbols are processed concurrently
 
 # ---------------------------
-# Main live/paper trading loop
+# Per-symbol cycle (runs concurrently for all symbols)
 # ---------------------------
-while True:
-    for symbol in SYMBOLS:
-        # Fetch recent candles
-        df = connector.get_recent_data(symbol, timeframe=TIMEFRAME, n=CANDLES)
-
-        # Detect market regime
-        df = regime_detector.detect(df)
-
-        # Compute features
-        df = feature_engineer.compute_features(df)
-
-        # Generate signals
-        signals = signal_generator.generate(df)
-
-        # Latest candle only
-        latest_signal = signals.iloc[-1]
-        direction = latest_signal['signal']
-        price = df['close'].iloc[-1]
-        atr = df['atr'].iloc[-1]
+def fetch(symbol):
+    """Fetch bars new since the last cycle (blocking MT5 call, runs on the runner's thread pool)"""
+    history.sync(symbol, TIMEFRAME)
+    return history.window(symbol, TIMEFRAME, CANDLES)
 
-        if direction == 0:
-            continue  # no trade
 
-        # Stop-loss / take-profit
-        sl, tp = risk_manager.apply_sl_tp(price, direction, atr)
+def process(symbol, df):
+    global equity
 
-        # Position size
-        size = risk_manager.calculate_position_size(price, sl)
+    # Features, regime, signal and validation for the new bars only
+    latest = pipelines[symbol].step(df, forming=history.forming)
+    if latest is None or latest["signal"] == 0:
+        return None  # no trade
+    # Orders are refused once the cycle deadline has passed
+    expired = runner.past_deadline if runner is not None else None
 
-        # Kill switch check
-        if not kill_switch.is_system_active(equity, expectancy=0.2):  # dummy expectancy
-            logger.warning(f"{symbol},KILL_SWITCH_TRIGGERED,Equity={equity}")
-            continue
-
-        # Send order
+    # Shared equity / kill switch state is updated one symbol at a time
+    with equity_lock:
+        # Kill switch, SL/TP, position size and order
         try:
-            trade = connector.send_order(symbol, direction, size, price, sl, tp)
+            trade = pipelines[symbol].order(symbol, latest, equity=equity, expired=expired)
         except Exception as e:
             logger.error(f"Trade failed for {symbol}: {e}")
-            continue
+            return None
+        if trade is None:
+            return None
 
         # Update equity (simulate PnL in paper mode)
         if MODE == "paper":
-            pnl = (trade['entry_price'] - price) * direction * size
+            pnl = (trade['entry_price'] - latest['xau_close']) * trade['direction'] * trade['volume']
             equity += pnl
 
         # Log trade
         logger.info(
-            f"{symbol},{direction},{size},{price},{sl},{tp},{equity},{trade['status']}"
+            f"{symbol},{trade['direction']},{trade['volume']},{latest['xau_close']},"
+            f"{trade['sl']},{trade['tp']},{equity},{trade['status']}"
         )
+    return trade
+
 
-    print(f"[{MODE.upper()} MODE] Waiting for next candle... Current equity: {equity:.2f}")
-    time.sleep(15 * 60)  # 15 minutes
+# ---------------------------
+# Main live/paper trading loop
+# ---------------------------
+def run_live_loop(max_cycles=None):
+    """Candle-aligned loop handling all symbols concurrently each cycle"""
+    global history, runner
+    history = MT5HistoryCache(store=BarStore())  # incremental MT5 sync, persisted to the bar store
+    runner = AsyncLiveRunner(
+        SYMBOLS, fetch, process,
+        heartbeat=Heartbeat(TIMEFRAME),
+        deadline=CYCLE_DEADLINE
+    )
+    runner.start(max_cycles)
+
+
+if __name__ == "__main__":
+    run_live_loop()
@@ -2,13 +2,15 @@
 
 import pandas as pd
 import os
-from backtest.backtester import Backtester
+from backtest.portfolio import PortfolioBacktester
 from backtest.performance_audit import PerformanceAudit
-from core.regime_detector import RegimeDetector
-from core.feature_engineer import FeatureEngineer
-from core.signal_generator import SignalGenerator
-from risk.risk_manager import RiskManager
+from backtest.monte_carlo import MonteCarlo
+from core.pipeline import Pipeline
 from risk.kill_switch import KillSwitch
+from core.regime_detector import RegimeDetector
+from core.beta_calculator import BetaCalculator
+from data.bar_store import BarStore
+from data.market_panel import MarketPanel
 
 # ---------------------------
 # Config
@@ -21,51 +23,63 @@ ACCOUNT_EQUITY = 100000
 RISK_PER_TRADE = 0.01
 MAX_DRAWDOWN = 0.2
 MIN_EXPECTANCY = 0.1
+MC_PATHS = 10_000
 
 # ---------------------------
 # Initialize modules
 # ---------------------------
-regime_detector = RegimeDetector(vol_window=100)
-feature_engineer = FeatureEngineer()
-signal_generator = SignalGenerator()
-risk_manager = RiskManager(account_equity=ACCOUNT_EQUITY, risk_per_trade=RISK_PER_TRADE)
-kill_switch = KillSwitch(max_drawdown_pct=MAX_DRAWDOWN, min_expectancy=MIN_EXPECTANCY)
+pipeline = Pipeline(regime_detector=RegimeDetector(vol_window=100))
+bar_store = BarStore()
+beta_calculator = BetaCalculator()
 
 # ---------------------------
-# Backtest each symbol
+# Load all symbols once into one time-aligned panel
 # ---------------------------
 for symbol in SYMBOLS:
-    # Load historical data
-    df = pd.read_csv(f"data/raw/{symbol.lower()}_h1.csv")
-    
-    # Use only last N candles
-    df = df.tail(HISTORICAL_CANDLES).copy()
+    # The raw CSV is (re)converted into the bar store when it is newer than the store
+    bar_store.sync_csv(f"data/raw/{symbol.lower()}_h1.csv", symbol, "H1")
 
-    # Detect regime
-    df = regime_detector.detect(df)
+# Use only last N candles (reads only the newest partitions)
+panel = MarketPanel.from_frames({s: bar_store.tail(s, "H1", HISTORICAL_CANDLES) for s in SYMBOLS})
+beta = beta_calculator.compute_beta_panel(panel, "XAUUSD", "DXY")
 
-    # Compute features
-    df = feature_engineer.compute_features(df)
+# ---------------------------
+# Signals for each symbol
+# ---------------------------
+frames = {}
+for symbol in SYMBOLS:
+    # This symbol's own bars (forward-filled rows dropped) under the pipeline's xau_* column names
+    df = panel.symbol(symbol, as_prefix="xau").assign(beta=beta)[~panel.is_filled(symbol)]
 
-    # Generate signals
-    df_signals = signal_generator.generate(df)
+    # Features, regime, signals and validation (batch mode)
+    frames[symbol] = pipeline.run(df)
 
-    # Initialize Backtester
-    bt = Backtester(
-        df=df_signals,
-        risk_manager=risk_manager,
-        kill_switch=kill_switch,
-        symbol=symbol
-    )
+# ---------------------------
+# Backtest all symbols against one account
+# ---------------------------
+portfolio = PortfolioBacktester(
+    frames,
+    account_equity=ACCOUNT_EQUITY,
+    risk_per_trade=RISK_PER_TRADE,
+    kill_switch=KillSwitch(MAX_DRAWDOWN, MIN_EXPECTANCY)
+)
+trades = portfolio.run()
 
-    # Run backtest
-    equity_curve = bt.run()
+# Performance Audit (trades in the order their PnL was realized)
+by_exit = trades.sort_values("exit_time", kind="stable")
+for symbol in SYMBOLS:
+    print(f"{symbol}: {PerformanceAudit(by_exit[by_exit['symbol'] == symbol]).summary()}")
+audit = PerformanceAudit(by_exit, account_equity=ACCOUNT_EQUITY)
+print(f"Portfolio: {audit.summary()}")
 
-    # Performance Audit
-    audit = PerformanceAudit(equity_curve)
-    audit.report()
+# Monte Carlo: drawdown / ruin distribution of the resampled trades
+if len(trades):
+    mc = MonteCarlo.from_audit(audit)
+    mc.run(n_paths=MC_PATHS)
+    print(f"Portfolio Monte Carlo: {mc.summary()}")
+    print(f"Portfolio: 95% max drawdown {mc.drawdown_limit(0.95):.1%} (suggested kill switch limit)")
 
-    # Optional: save results
-    os.makedirs("data/processed", exist_ok=True)
-    equity_curve.to_csv(f"data/processed/{symbol.lower()}_equity_curve.csv", index=False)
-    print(f"Backtest complete for {symbol}. Equity curve saved.")
+# Optional: save results
+os.makedirs("data/processed", exist_ok=True)
+portfolio.equity_curve.to_csv("data/processed/portfolio_equity_curve.csv")
+print("Portfolio backtest complete. Equity curve saved.")
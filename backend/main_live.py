@@ -2,13 +2,16 @@
 
 import pandas as pd
 import logging
-import time
-from live.mt5_connector import MT5Connector
+import threading
+from live.heartbeat import Heartbeat
+from live.async_runner import AsyncLiveRunner
+from core.pipeline import Pipeline
 from core.regime_detector import RegimeDetector
-from core.feature_engineer import FeatureEngineer
-from core.signal_generator import SignalGenerator
+from data.mt5_data import MT5HistoryCache
+from data.bar_store import BarStore
 from risk.risk_manager import RiskManager
 from risk.kill_switch import KillSwitch
+from execution.mt5_executor import MT5Executor
 import os
 
 # ---------------------------
@@ -26,75 +29,74 @@ logger = logging.getLogger("LiveTrading")
 # ---------------------------
 # Initialize modules
 # ---------------------------
-connector = MT5Connector(mode="live")  # live mode
-regime_detector = RegimeDetector(vol_window=100)
-feature_engineer = FeatureEngineer()
-signal_generator = SignalGenerator()
+history = MT5HistoryCache(store=BarStore())  # incremental MT5 sync, persisted to the bar store
 risk_manager = RiskManager(account_equity=100000, risk_per_trade=0.01)
 kill_switch = KillSwitch(max_drawdown_pct=0.2, min_expectancy=0.1)
+executor = MT5Executor(mode="live")
 
 # Initialize live equity
 equity = 100000
 kill_switch.reset(equity)
+equity_lock = threading.Lock()  # symbols are processed concurrently
 
 # ---------------------------
 # Symbols to trade
 # ---------------------------
 symbols = ["XAUUSD", "DXY"]
 
+# One streaming pipeline per symbol; risk, kill switch and executor are shared
+pipelines = {
+    symbol: Pipeline(
+        regime_detector=RegimeDetector(vol_window=100),
+        risk_manager=risk_manager,
+        kill_switch=kill_switch,
+        executor=executor
+    )
+    for symbol in symbols
+}
+
 # ---------------------------
-# Main live trading loop
+# Per-symbol cycle (all symbols run concurrently)
 # ---------------------------
-while True:
-    for symbol in symbols:
-        # 1. Fetch recent 200 candles (15-min)
-        df = connector.get_recent_data(symbol, timeframe="15min", n=200)
-
-        # 2. Compute market regime
-        df = regime_detector.detect(df)
-
-        # 3. Feature engineering
-        df = feature_engineer.compute_features(df)
-
-        # 4. Generate signals
-        signals = signal_generator.generate(df)
-
-        # 5. Latest candle only
-        latest_signal = signals.iloc[-1]
-        direction = latest_signal['signal']
-        price = df['close'].iloc[-1]
-        atr = df['atr'].iloc[-1]
+def fetch(symbol):
+    # 1. Sync the new 15-min candles and return the last 200; blocking, runs on the runner's thread pool
+    history.sync(symbol, "M15")
+    return history.window(symbol, "M15", 200)
 
-        if direction == 0:
-            continue  # no trade
 
-        # 6. Calculate stop-loss / take-profit
-        sl, tp = risk_manager.apply_sl_tp(price, direction, atr)
+def process(symbol, df):
+    global equity
 
-        # 7. Calculate position size
-        size = risk_manager.calculate_position_size(price, sl)
+    # 2-4. Regime, features, signals and validation for the new candles only
+    latest = pipelines[symbol].step(df, forming=history.forming)
+    if latest is None or latest['signal'] == 0:
+        return None  # no trade
 
-        # 8. Kill switch check
-        if not kill_switch.is_system_active(equity, expectancy=0.2):  # dummy expectancy
-            logger.warning(f"{symbol},KILL_SWITCH_TRIGGERED,Equity={equity}")
-            continue
-
-        # 9. Send live order
+    with equity_lock:
+        # 5-8. Kill switch, stop-loss / take-profit, position size and live order
         try:
-            trade = connector.send_order(symbol, direction, size, price, sl, tp)
+            trade = pipelines[symbol].order(symbol, latest, equity=equity, expired=runner.past_deadline)
         except Exception as e:
             logger.error(f"Trade failed for {symbol}: {e}")
-            continue
+            return None
+        if trade is None:
+            return None
 
-        # 10. Update equity (simulate PnL until MT5 confirms)
-        pnl = (trade['entry_price'] - price) * direction * size
+        # 9. Update equity (simulate PnL until MT5 confirms)
+        price = latest['xau_close']
+        pnl = (trade['entry_price'] - price) * trade['direction'] * trade['volume']
         equity += pnl
 
-        # 11. Log trade
+        # 10. Log trade
         logger.info(
-            f"{symbol},{direction},{size},{price},{sl},{tp},{equity},{trade['status']}"
+            f"{symbol},{trade['direction']},{trade['volume']},{price},{trade['sl']},{trade['tp']},{equity},{trade['status']}"
         )
+    return trade
+
 
-    # Wait until the next 15-min candle
-    print(f"Waiting for next candle... Current equity: {equity:.2f}")
-    time.sleep(15 * 60)  # 15 minutes
+# ---------------------------
+# Main live trading loop
+# ---------------------------
+# One cycle per 15-min candle; each cycle must finish within 60 seconds
+runner = AsyncLiveRunner(symbols, fetch, process, heartbeat=Heartbeat("M15"), deadline=60)
+runner.start()
@@ -6,10 +6,7 @@ import pandas as pd
 from datetime import datetime
 
 # Core modules
-from core.feature_engineer import FeatureEngineer
-from core.regime_detector import RegimeDetector
-from core.signal_generator import SignalGenerator
-from core.validator import Validator
+from core.pipeline import Pipeline, as_pipeline_frame
 
 # Risk modules
 from risk.risk_manager import RiskManager
@@ -18,6 +15,12 @@ from risk.kill_switch import KillSwitch
 # Execution modules
 from execution.mt5_executor import MT5Executor
 
+# Backtesting
+from backtest.backtester import Backtester
+
+# Data
+from data.bar_store import BarStore
+
 # Logging setup
 log_file = os.path.join("logs", "system.log")
 os.makedirs("logs", exist_ok=True)
@@ -31,61 +34,29 @@ logger = logging.getLogger("GoldQuant")
 def run_backtest(df):
     """Run a historical backtest"""
     logger.info("Starting backtest...")
-    fe = FeatureEngineer()
-    rd = RegimeDetector()
-    sg = SignalGenerator()
-    val = Validator()
     rm = RiskManager()
-    
-    df = fe.engineer_features(df)
-    df = rd.detect(df)
-
-    trades = []
-    for i, row in df.iterrows():
-        signals = sg.generate_signal(row)
-        if val.validate(signals):
-            size = rm.calculate_position_size(
-                entry_price=row["xau_close"], 
-                stop_loss_price=row["xau_close"]*0.99  # example SL
-            )
-            trade = {
-                "timestamp": row.name,
-                "signal": signals,
-                "size": size,
-                "price": row["xau_close"]
-            }
-            trades.append(trade)
-            logger.info(f"Backtest trade: {trade}")
-    return pd.DataFrame(trades)
+
+    # Features, regime, signals and validation over the whole history at once
+    df = Pipeline().run(df)
+
+    trades = Backtester(df, account_equity=rm.account_equity, risk_per_trade=rm.risk_per_trade).run()
+    for trade in trades.to_dict("records"):
+        logger.info(f"Backtest trade: {trade}")
+    return trades
 
 def run_paper(df):
     """Run shadow trading in paper mode"""
     logger.info("Starting paper trading...")
-    fe = FeatureEngineer()
-    rd = RegimeDetector()
-    sg = SignalGenerator()
-    val = Validator()
     rm = RiskManager()
     ks = KillSwitch()
-    ks.reset(rm.equity)
-    executor = MT5Executor(mode="paper")
-
-    df = fe.engineer_features(df)
-    df = rd.detect(df)
-
-    for i, row in df.iterrows():
-        signals = sg.generate_signal(row)
-        if val.validate(signals) and ks.is_system_active(rm.equity, 0.2):
-            size = rm.calculate_position_size(
-                entry_price=row["xau_close"],
-                stop_loss_price=row["xau_close"]*0.99
-            )
-            trade = executor.send_order(
-                symbol="XAUUSD",
-                direction=signals.get("direction", 0),
-                volume=size,
-                price=row["xau_close"]
-            )
+    ks.reset(rm.account_equity)
+    pipeline = Pipeline(risk_manager=rm, kill_switch=ks, executor=MT5Executor(mode="paper"))
+
+    # Replay the history bar by bar, as the live loop sees it
+    for bar in as_pipeline_frame(df).to_dict("records"):
+        row = pipeline.update(bar)
+        trade = pipeline.order("XAUUSD", row)
+        if trade is not None:
             logger.info(f"Paper trade executed: {trade}")
 
 def run_live():
@@ -98,12 +69,11 @@ def run_live():
 if __name__ == "__main__":
     mode = input("Select mode (backtest/paper/live): ").strip().lower()
 
-    # Example: load historical 15-min data
+    # Example: load historical data from the bar store (re-imported when the CSV changes)
+    store = BarStore()
     data_file = os.path.join("data", "raw", "xauusd_h1.csv")
-    if os.path.exists(data_file):
-        df = pd.read_csv(data_file, index_col=0, parse_dates=True)
-    else:
-        df = pd.DataFrame()  # empty fallback
+    store.sync_csv(data_file, "XAUUSD", "H1")
+    df = store.load("XAUUSD", "H1")  # empty frame if nothing stored
 
     if mode == "backtest":
         trades_df = run_backtest(df)
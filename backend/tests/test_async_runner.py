@@ -0,0 +1,128 @@
+# backend/tests/test_async_runner.py
+import time
+import asyncio
+import threading
+from live.async_runner import AsyncLiveRunner
+from live.heartbeat import Heartbeat, ManualClock
+
+DELAYS = {"XAUUSD": 0.2, "DXY": 0.2, "EURUSD": 0.2}
+
+
+def fetch(symbol):
+    time.sleep(DELAYS[symbol])  # blocking, like an MT5 call
+    return symbol.lower()
+
+
+def process(symbol, data):
+    if symbol == "EURUSD":
+        raise RuntimeError("bad data")
+    return f"{data}-done"
+
+
+def test_symbols_run_concurrently_and_errors_are_reported():
+    runner = AsyncLiveRunner(DELAYS, fetch, process, deadline=5)
+    report = asyncio.run(runner.run_cycle("c1"))
+
+    assert report["elapsed"] < 0.5  # ~0.2s, not 3 x 0.2s
+    assert report["completed"] == {"XAUUSD": "xauusd-done", "DXY": "dxy-done"}
+    assert isinstance(report["errors"]["EURUSD"], RuntimeError)
+    assert report["timed_out"] == []
+    assert report["utilization"] == report["elapsed"] / Heartbeat("M15").interval
+    assert runner.reports == [report]
+
+
+def test_deadline_drops_slow_symbols():
+    delays = {"XAUUSD": 0.05, "DXY": 1.0}
+    runner = AsyncLiveRunner(delays, lambda s: time.sleep(delays[s]) or s, lambda s, d: d, deadline=0.3)
+    report = asyncio.run(runner.run_cycle())
+
+    assert report["completed"] == {"XAUUSD": "XAUUSD"}
+    assert report["timed_out"] == ["DXY"]
+    assert report["elapsed"] < 0.9
+
+
+def test_no_order_when_fetch_returns_after_the_deadline():
+    clock = ManualClock(0)
+    lag = {"XAUUSD": 30}
+    processed = []
+    runner = AsyncLiveRunner(["XAUUSD"], lambda s: clock.advance(lag[s]) or s,
+                             lambda s, d: processed.append(d) or d,
+                             heartbeat=Heartbeat("M15", clock=clock), deadline=20)
+
+    report = asyncio.run(runner.run_cycle("c1"))
+    assert report["timed_out"] == ["XAUUSD"] and report["completed"] == {}
+    assert processed == []
+
+    lag["XAUUSD"] = 5
+    report = asyncio.run(runner.run_cycle("c2"))
+    assert report["completed"] == {"XAUUSD": "XAUUSD"} and report["elapsed"] == 5
+    assert processed == ["XAUUSD"]
+
+
+def test_symbol_still_running_from_last_cycle_is_skipped():
+    clock = ManualClock(0)
+    release = threading.Event()
+    processed = []
+
+    def fetch(symbol):
+        if symbol == "DXY" and not release.is_set():
+            release.wait(5)  # hung MT5 call
+        return symbol
+
+    runner = AsyncLiveRunner(["XAUUSD", "DXY"], fetch, lambda s, d: processed.append(s) or d,
+                             heartbeat=Heartbeat("M15", clock=clock), deadline=0.2)
+    report = asyncio.run(runner.run_cycle("c1"))
+    assert report["timed_out"] == ["DXY"] and report["skipped"] == []
+
+    clock.advance(900)
+    report = asyncio.run(runner.run_cycle("c2"))
+    assert report["completed"] == {"XAUUSD": "XAUUSD"}
+    assert report["skipped"] == ["DXY"] and report["timed_out"] == []
+
+    release.set()
+    for _ in range(100):
+        if "DXY" not in runner._in_flight:
+            break
+        time.sleep(0.01)
+    # The hung c1 fetch came back a candle late: no order from it
+    assert processed == ["XAUUSD", "XAUUSD"]
+    report = asyncio.run(runner.run_cycle("c3"))
+    assert report["completed"] == {"XAUUSD": "XAUUSD", "DXY": "DXY"} and report["skipped"] == []
+
+
+def test_orders_are_refused_once_the_deadline_passes():
+    clock = ManualClock(0)
+    sent = []
+
+    def process(symbol, data):
+        clock.advance(30)  # slow feature / signal work
+        if runner.past_deadline():
+            return None
+        sent.append(symbol)
+        return "order"
+
+    runner = AsyncLiveRunner(["XAUUSD"], lambda s: s, process, heartbeat=Heartbeat("M15", clock=clock), deadline=20)
+    report = asyncio.run(runner.run_cycle("c1"))
+    assert sent == [] and report["completed"] == {"XAUUSD": None}
+    assert not runner.past_deadline()  # outside a cycle
+
+
+def test_results_finishing_after_the_deadline_are_reported_next_cycle():
+    slow = {"XAUUSD": 0.3}
+    runner = AsyncLiveRunner(["XAUUSD"], lambda s: s, lambda s, d: time.sleep(slow[s]) or "order", deadline=0.1)
+    report = asyncio.run(runner.run_cycle("c1"))
+    assert report["timed_out"] == ["XAUUSD"] and report["completed"] == {} and report["late"] == {}
+
+    time.sleep(0.4)
+    slow["XAUUSD"] = 0
+    report = asyncio.run(runner.run_cycle("c2"))
+    assert report["late"] == {"XAUUSD": "order"}
+    assert report["completed"] == {"XAUUSD": "order"}
+    assert asyncio.run(runner.run_cycle("c3"))["late"] == {}
+
+
+def test_heartbeat_aligns_to_candle_boundary():
+    hb = Heartbeat("M15")
+    next_ts, wait = hb.next_candle(now=3600 * 10 + 60 * 7 + 30)
+    assert next_ts == 3600 * 10 + 60 * 15
+    assert wait == 7 * 60 + 30
@@ -0,0 +1,125 @@
+# backend/tests/test_backtester.py
+import pandas as pd
+import numpy as np
+import pytest
+from backtest.backtester import Backtester, _first_touch_loop, _first_touch_numpy
+
+
+def make_bars(opens, highs, lows, closes, signals, atr=1.0):
+    return pd.DataFrame({
+        "xau_open": opens,
+        "xau_high": highs,
+        "xau_low": lows,
+        "xau_close": closes,
+        "signal": signals,
+        "atr": atr
+    })
+
+
+def create_random_bars(n=5000, seed=11):
+    rng = np.random.default_rng(seed)
+    close = np.cumsum(rng.normal(0, 0.5, n)) + 2000
+    opens = close - rng.normal(0, 0.2, n)
+    return make_bars(
+        opens,
+        np.maximum(opens, close) + rng.random(n) * 0.5,
+        np.minimum(opens, close) - rng.random(n) * 0.5,
+        close,
+        rng.choice([0, 0, 0, 0, 0, 0, 1, -1], n),
+        atr=2.0
+    )
+
+
+def test_long_take_profit_hit_on_later_bar():
+    # Entry at 100 on bar 0, SL 99 / TP 102; bar 2 reaches 102
+    df = make_bars(
+        [100, 100.2, 101.0, 101.5],
+        [100, 100.8, 102.3, 101.8],
+        [100, 99.5, 100.9, 101.2],
+        [100, 100.5, 102.0, 101.5],
+        [1, 0, 0, 0]
+    )
+    trades = Backtester(df, log_trades=False).run()
+    assert len(trades) == 1
+    trade = trades.iloc[0]
+    assert trade["exit_index"] == 2
+    assert trade["exit_reason"] == "tp"
+    assert trade["exit_price"] == pytest.approx(102)
+    assert trade["pnl"] == pytest.approx(2 * trade["size"])
+
+
+def test_short_gap_through_stop_fills_at_open():
+    df = make_bars(
+        [100, 101.5, 101.0],
+        [100, 102.0, 101.2],
+        [100, 101.4, 100.5],
+        [100, 101.8, 100.8],
+        [-1, 0, 0]
+    )
+    trade = Backtester(df, log_trades=False).run().iloc[0]
+    assert trade["exit_reason"] == "sl"
+    assert trade["exit_price"] == pytest.approx(101.5)
+
+
+@pytest.mark.parametrize("rule, reason", [("sl", "sl"), ("tp", "tp"), ("open", "tp")])
+def test_both_touched_rule(rule, reason):
+    # Bar 1 spans SL (99) and TP (102); its open 101.5 is closer to TP
+    df = make_bars(
+        [100, 101.5],
+        [100, 102.5],
+        [100, 98.5],
+        [100, 100.0],
+        [1, 0]
+    )
+    trade = Backtester(df, both_touched=rule, log_trades=False).run().iloc[0]
+    assert trade["exit_reason"] == reason
+
+
+def test_open_position_closed_at_last_bar():
+    df = make_bars([100, 100.1, 100.2], [100, 100.5, 100.6], [100, 99.8, 99.9], [100, 100.3, 100.4], [1, 1, 0])
+    trades = Backtester(df, log_trades=False).run()
+    assert len(trades) == 1  # second signal ignored while in position
+    assert trades.iloc[0]["exit_reason"] == "end"
+    assert trades.iloc[0]["exit_price"] == pytest.approx(100.4)
+
+
+def test_reproducible_with_seed():
+    df = create_random_bars()
+    a = Backtester(df, slippage_pct=0.0002, seed=5, log_trades=False).run()
+    b = Backtester(df, slippage_pct=0.0002, seed=5, log_trades=False).run()
+    pd.testing.assert_frame_equal(a.drop(columns="timestamp"), b.drop(columns="timestamp"))
+
+
+def test_numpy_scan_matches_loop():
+    df = create_random_bars(2000)
+    high, low = df["xau_high"].to_numpy(), df["xau_low"].to_numpy()
+    for start in range(0, 2000, 97):
+        for direction in (1, -1):
+            sl = df["xau_close"].iloc[start] - 3 * direction
+            tp = df["xau_close"].iloc[start] + 6 * direction
+            assert _first_touch_numpy(high, low, start, direction, sl, tp) == \
+                _first_touch_loop(high, low, start, direction, sl, tp)
+
+
+@pytest.mark.parametrize("rule", ["sl", "tp", "open"])
+def test_vectorized_matches_event_driven(rule):
+    df = create_random_bars(8000, seed=21)
+    event = Backtester(df, both_touched=rule, log_trades=False)
+    expected = event.run()
+    vector = Backtester(df, both_touched=rule, log_trades=False)
+    result = vector.run_vectorized()
+
+    assert len(result) == len(expected) > 0
+    cols = ["direction", "size", "entry_price", "sl", "tp", "entry_index", "exit_index",
+            "exit_price", "exit_reason", "pnl", "equity"]
+    pd.testing.assert_frame_equal(result[cols], expected[cols], check_dtype=False)
+    pd.testing.assert_series_equal(vector.equity_curve, event.equity_curve)
+
+
+def test_vectorized_kill_switch_matches_event_driven():
+    df = create_random_bars(8000, seed=4)
+    df["atr"] = 6.0
+    expected = Backtester(df, log_trades=False).run()
+    result = Backtester(df, log_trades=False).run_vectorized()
+    assert len(result) == len(expected)
+    np.testing.assert_allclose(result["equity"], expected["equity"])
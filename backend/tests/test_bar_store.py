@@ -0,0 +1,126 @@
+# backend/tests/test_bar_store.py
+import pytest
+import pandas as pd
+import numpy as np
+from data.bar_store import BarStore
+
+
+def create_bars(start="2024-01-30", periods=24 * 70, freq="h"):
+    index = pd.date_range(start, periods=periods, freq=freq, name="time")
+    close = np.cumsum(np.random.default_rng(0).normal(0, 1, periods)) + 2000
+    return pd.DataFrame({
+        "xau_open": close - 0.5,
+        "xau_high": close + 1,
+        "xau_low": close - 1,
+        "xau_close": close
+    }, index=index)
+
+
+def test_roundtrip_and_month_partitions(tmp_path):
+    store = BarStore(tmp_path)
+    bars = create_bars()
+    store.write("XAUUSD", "H1", bars)
+
+    assert store.partitions("XAUUSD", "H1") == ["2024-01", "2024-02", "2024-03", "2024-04"]
+    loaded = store.load("XAUUSD", "H1")
+    expected = bars[sorted(bars.columns)].set_axis(bars.index.as_unit("ns"))
+    pd.testing.assert_frame_equal(loaded, expected, check_freq=False)
+
+
+def test_range_query_reads_only_needed_partitions(tmp_path):
+    store = BarStore(tmp_path)
+    bars = create_bars()
+    store.write("XAUUSD", "H1", bars)
+
+    opened = []
+    read = store._read_partition
+    store._read_partition = lambda folder, *a: opened.append(folder[-7:]) or read(folder, *a)
+
+    out = store.load("XAUUSD", "H1", "2024-02-10", "2024-02-20 05:00")
+    assert opened == ["2024-02"]
+    assert out.index[0] == pd.Timestamp("2024-02-10")
+    assert out.index[-1] == pd.Timestamp("2024-02-20 05:00")
+    np.testing.assert_array_equal(out["xau_close"], bars.loc["2024-02-10":"2024-02-20 05:00", "xau_close"])
+
+
+def test_upsert_and_tail(tmp_path):
+    store = BarStore(tmp_path)
+    bars = create_bars()
+    store.write("XAUUSD", "H1", bars.iloc[:1000])
+    store.write("XAUUSD", "H1", bars.iloc[900:])  # overlapping append
+
+    tail = store.tail("XAUUSD", "H1", 50)
+    assert len(tail) == 50
+    np.testing.assert_array_equal(tail["xau_close"], bars["xau_close"].iloc[-50:])
+    assert len(store.load("XAUUSD", "H1")) == len(bars)
+    assert store.last_timestamp("XAUUSD", "H1") == bars.index[-1]
+
+
+def test_import_csv(tmp_path):
+    bars = create_bars(periods=100)
+    csv = tmp_path / "xauusd_h1.csv"
+    bars.to_csv(csv)
+    store = BarStore(tmp_path / "store")
+    assert store.import_csv(csv, "XAUUSD", "H1") == 100
+    np.testing.assert_allclose(store.tail("XAUUSD", "H1", 100)["xau_close"], bars["xau_close"])
+
+
+def test_sync_csv_reimports_newer_file(tmp_path):
+    import os
+    store = BarStore(tmp_path / "store")
+    csv = tmp_path / "xauusd_h1.csv"
+    bars = create_bars(periods=100)
+    bars.iloc[:60].to_csv(csv, index_label="time")
+
+    assert store.sync_csv(csv, "XAUUSD", "H1") == 60
+    assert store.sync_csv(csv, "XAUUSD", "H1") == 0  # unchanged CSV: store used as is
+
+    # The CSV is updated after the import: its new rows reach the store
+    bars.to_csv(csv, index_label="time")
+    written = store.last_write_time("XAUUSD", "H1")
+    os.utime(csv, ns=(written + 10**9, written + 10**9))
+    assert store.sync_csv(csv, "XAUUSD", "H1") == 100
+    assert store.last_timestamp("XAUUSD", "H1") == bars.index[-1]
+    assert len(store.load("XAUUSD", "H1")) == 100
+    assert store.sync_csv(tmp_path / "missing.csv", "XAUUSD", "H1") == 0
+
+
+def test_interrupted_rewrite_keeps_the_old_partition(tmp_path, monkeypatch):
+    store = BarStore(tmp_path)
+    bars = create_bars(periods=20)
+    store.write("XAUUSD", "H1", bars.iloc[:10])
+
+    # Crash after some columns of the rewrite are on disk
+    save, saved = np.save, []
+
+    def crashing_save(path, values):
+        if len(saved) == 2:
+            raise OSError("power cut")
+        saved.append(path)
+        save(path, values)
+
+    monkeypatch.setattr(np, "save", crashing_save)
+    with pytest.raises(OSError):
+        store.write("XAUUSD", "H1", bars.iloc[10:11])
+    monkeypatch.setattr(np, "save", save)
+
+    pd.testing.assert_frame_equal(store.load("XAUUSD", "H1"), store.load("XAUUSD", "H1", mmap=False))
+    assert len(store.load("XAUUSD", "H1")) == 10
+    store.write("XAUUSD", "H1", bars.iloc[10:])
+    np.testing.assert_array_equal(store.load("XAUUSD", "H1")["xau_close"], bars["xau_close"])
+
+
+def test_legacy_partition_is_read_and_converted(tmp_path):
+    store = BarStore(tmp_path)
+    bars = create_bars(periods=10)
+    folder = tmp_path / "XAUUSD" / "H1" / "2024-01"
+    folder.mkdir(parents=True)
+    for col in bars.columns:
+        np.save(folder / f"{col}.npy", bars[col].to_numpy())
+    np.save(folder / "time.npy", bars.index.as_unit("ns").asi8)
+
+    assert store.partitions("XAUUSD", "H1") == ["2024-01"]
+    np.testing.assert_array_equal(store.load("XAUUSD", "H1")["xau_close"], bars["xau_close"])
+    store.write("XAUUSD", "H1", bars.iloc[-1:])
+    assert not (folder / "time.npy").exists()
+    np.testing.assert_array_equal(store.load("XAUUSD", "H1")["xau_close"], bars["xau_close"])
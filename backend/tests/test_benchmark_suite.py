@@ -0,0 +1,30 @@
+# backend/tests/test_benchmark_suite.py
+import json
+from benchmarks import suite
+
+
+def test_every_case_runs_and_round_trips(tmp_path):
+    document = suite.run_suite(sizes=[500], repeat=1, verbose=False)
+    assert {r["case"] for r in document["results"]} == set(suite.CASES)
+    assert all(r["min"] > 0 for r in document["results"])
+
+    path = tmp_path / "run.json"
+    suite.save(document, path)
+    assert suite.load(path) == json.loads(json.dumps(document))
+
+
+def test_compare_flags_regressions(tmp_path):
+    def doc(seconds):
+        return {"meta": {"commit": None}, "results": [
+            {"case": name, "n": 100, "min": s, "median": s, "mean": s} for name, s in seconds.items()
+        ]}
+
+    base = doc({"features": 1.0, "regime": 1.0, "beta": 1.0})
+    new = doc({"features": 1.5, "regime": 0.5, "beta": 1.05, "audit": 1.0})
+    status = {row[0]: row[5] for row in suite.compare(base, new)}
+    assert status == {"features": "regression", "regime": "improvement", "beta": "same"}
+
+    suite.save(base, tmp_path / "base.json")
+    suite.save(new, tmp_path / "new.json")
+    assert suite.main(["compare", str(tmp_path / "base.json"), str(tmp_path / "new.json")]) == 1
+    assert suite.main(["compare", str(tmp_path / "base.json"), str(tmp_path / "base.json")]) == 0
@@ -0,0 +1,61 @@
+# backend/tests/test_beta_calculator.py
+import time
+import pandas as pd
+import numpy as np
+from core.beta_calculator import BetaCalculator
+
+
+def create_returns(n=3000, seed=4):
+    rng = np.random.default_rng(seed)
+    index = pd.date_range("2024-01-01", periods=n, freq="h")
+    dxy = rng.normal(0, 0.002, n)
+    xau = -0.8 * dxy + rng.normal(0, 0.003, n)
+    xau[100:105] = np.nan  # gaps are dropped, not carried
+    return pd.Series(xau, index=index), pd.Series(dxy, index=index)
+
+
+def test_streaming_matches_batch():
+    xau, dxy = create_returns()
+    calc = BetaCalculator(window=60)
+    batch = calc.compute_beta(xau, dxy)
+
+    calc.reset()
+    stream = pd.Series([calc.update(a, b) for a, b in zip(xau, dxy)], index=xau.index)
+    np.testing.assert_allclose(stream[batch.index], batch, rtol=1e-9, atol=1e-12)
+    assert stream.iloc[102] == stream.iloc[99]  # NaN bar keeps the last beta
+
+
+def test_multi_window_batch_matches_rolling():
+    xau, dxy = create_returns()
+    calc = BetaCalculator()
+    betas = calc.compute_beta_windows(xau, dxy, windows=(20, 60, 120, 250))
+
+    assert list(betas.columns) == ["beta_20", "beta_60", "beta_120", "beta_250"]
+    for w in (20, 60, 120, 250):
+        expected = BetaCalculator(window=w).compute_beta(xau, dxy)
+        np.testing.assert_allclose(betas[f"beta_{w}"], expected, rtol=1e-7, atol=1e-10, err_msg=str(w))
+    assert abs(betas["beta_250"].iloc[-1] + 0.8) < 0.3
+
+
+def test_flat_benchmark_window_gives_nan_beta():
+    xau, dxy = create_returns()
+    dxy.iloc[1000:1100] = 0.0  # benchmark closed / not quoting
+    calc = BetaCalculator(window=60)
+    batch = calc.compute_beta(xau, dxy)
+    windows = calc.compute_beta_windows(xau, dxy, windows=(60,))["beta_60"]
+    calc.reset()
+    stream = pd.Series([calc.update(a, b) for a, b in zip(xau, dxy)], index=xau.index)
+
+    flat = xau.index[1059:1100]  # windows holding flat bars only
+    assert batch[flat].isna().all() and windows[flat].isna().all() and stream[flat].isna().all()
+    np.testing.assert_allclose(windows, batch, rtol=1e-7, atol=1e-10)
+    np.testing.assert_allclose(stream[batch.index], batch, rtol=1e-9, atol=1e-12)
+
+
+def test_update_latency_constant():
+    xau, dxy = create_returns(n=20000)
+    calc = BetaCalculator(window=250)
+    t0 = time.perf_counter()
+    for a, b in zip(xau.to_numpy(), dxy.to_numpy()):
+        calc.update(a, b)
+    assert (time.perf_counter() - t0) / len(xau) < 1e-3
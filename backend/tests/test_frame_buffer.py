@@ -0,0 +1,72 @@
+# backend/tests/test_frame_buffer.py
+import numpy as np
+import pandas as pd
+import pytest
+from core.frame_buffer import FrameBuffer
+from core.feature_engineer import FeatureEngineer
+from core.regime_detector import RegimeDetector
+from core.signal_generator import SignalGenerator
+from core.validator import Validator
+
+
+def create_bars(n=2000):
+    rng = np.random.default_rng(3)
+    close = 2000 + np.cumsum(rng.normal(0, 1.0, n))
+    return pd.DataFrame({
+        "xau_open": close + rng.normal(0, 0.2, n),
+        "xau_high": close + 1.0,
+        "xau_low": close - 1.0,
+        "xau_close": close,
+    }, index=pd.date_range("2024-01-01", periods=n, freq="15min"))
+
+
+def test_input_is_adopted_without_copy():
+    close = np.linspace(1.0, 2.0, 100)
+    buf = FrameBuffer({"xau_close": close})
+    assert np.shares_memory(buf["xau_close"], close)
+    assert np.shares_memory(buf.frame()["xau_close"].to_numpy(), close)
+    # The buffer's columns are read-only; the caller's array is not
+    with pytest.raises(ValueError):
+        buf["xau_close"][0] = 0.0
+    close[0] = 0.0
+
+
+def test_pipeline_matches_chained_stages():
+    df = create_bars()
+    before = df.copy()
+    regimes = RegimeDetector().detect(FeatureEngineer().add_features(df))
+    signals = SignalGenerator().generate(regimes)
+    chained = Validator().validate(regimes.assign(signal=signals["signal"]), state=None)
+
+    buf = FrameBuffer(df, trace=True)
+    buf.run(FeatureEngineer())
+    buf.run(RegimeDetector(), replace=("returns",))
+    buf.run(SignalGenerator())
+    buf.run(Validator(), replace=("signal",))
+    out = buf.frame()
+
+    pd.testing.assert_frame_equal(df, before)  # input untouched
+    assert np.shares_memory(out["xau_close"].to_numpy(), df["xau_close"].to_numpy())
+    np.testing.assert_array_equal(out["signal"].to_numpy(), chained["signal"].to_numpy())
+    np.testing.assert_allclose(out["vol_pct"], chained["vol_pct"])
+
+
+def test_existing_column_needs_replace():
+    buf = FrameBuffer(create_bars(50))
+    buf.run(FeatureEngineer())
+    with pytest.raises(ValueError, match="returns"):
+        buf.run(RegimeDetector())
+
+
+def test_memory_report_tracks_high_water():
+    buf = FrameBuffer(create_bars(1000), trace=True)
+    start = buf.nbytes
+    buf.run(FeatureEngineer())
+    grown = buf.nbytes
+    buf.drop("sma_5", "sma_10")
+
+    report = buf.memory_report()
+    assert grown > start
+    assert report["nbytes"] == grown - 2 * 1000 * 8
+    assert report["high_water"] >= grown
+    assert report["stage_peaks"]["FeatureEngineer"] > 0
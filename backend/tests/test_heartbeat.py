@@ -0,0 +1,112 @@
+# backend/tests/test_heartbeat.py
+import threading
+import asyncio
+from datetime import datetime, timezone
+import pytest
+from live.heartbeat import Heartbeat, ManualClock, TIMEFRAMES
+
+START = datetime(2024, 1, 1, tzinfo=timezone.utc).timestamp()
+
+
+def test_supports_m1_to_d1():
+    assert [Heartbeat(tf).interval for tf in ("M1", "M5", "M15", "M30", "H1", "H4", "D1")] == list(TIMEFRAMES.values())
+    with pytest.raises(ValueError):
+        Heartbeat("W1")
+
+
+def test_multi_timeframe_fires_on_boundaries_without_drift():
+    clock = ManualClock(START + 10)
+    hb = Heartbeat("M1", clock=clock)
+    fired = []
+    hb.subscribe("M1", lambda candle, tf: fired.append((tf, candle)))
+    hb.subscribe("M15", lambda candle, tf: fired.append((tf, candle)))
+    hb.run(until=START + 3600)
+
+    m1 = [c for tf, c in fired if tf == "M1"]
+    m15 = [c for tf, c in fired if tf == "M15"]
+    assert len(m1) == 60 and len(m15) == 4
+    assert m1[0] == datetime(2024, 1, 1, 0, 1) and m1[-1] == datetime(2024, 1, 1, 1, 0)
+    assert m15 == [datetime(2024, 1, 1, 0, 15 * k) for k in (1, 2, 3)] + [datetime(2024, 1, 1, 1, 0)]
+    assert hb.stats["M1"][0]["max_lag"] == 0 and hb.stats["M1"][0]["missed"] == 0
+
+
+def test_slow_inline_callback_reports_missed_candles():
+    clock = ManualClock(START)
+    hb = Heartbeat("M1", clock=clock)
+    candles = []
+
+    def slow(candle, tf):
+        candles.append(candle)
+        if len(candles) == 2:
+            clock.advance(150)  # blocks through two more boundaries
+
+    hb.subscribe("M1", slow)
+    hb.run(max_candles=4)
+
+    assert candles[1:3] == [datetime(2024, 1, 1, 0, 2), datetime(2024, 1, 1, 0, 4)]
+    assert hb.stats["M1"][0]["missed"] == 1
+    assert hb.stats["M1"][0]["max_lag"] == 30
+
+
+def test_slow_threaded_job_does_not_block_fast_timeframe():
+    clock = ManualClock(START)
+    hb = Heartbeat("M1", clock=clock, workers=2)
+    release = threading.Event()
+    m1, h1 = [], []
+    hb.subscribe("M1", lambda candle, tf: m1.append(candle), threaded=False)
+    hb.subscribe("H1", lambda candle, tf: h1.append(candle) or release.wait(5))
+    hb.run(until=START + 2 * 3600)
+    release.set()
+    hb.shutdown()
+
+    assert len(m1) == 120
+    assert h1 == [datetime(2024, 1, 1, 1, 0)]  # second H1 candle skipped: job still running
+    assert hb.stats["H1"][0]["overruns"] == 1
+
+
+def test_callback_errors_are_counted_and_loop_continues():
+    hb = Heartbeat("M5", clock=ManualClock(START))
+    hb.subscribe("M5", lambda candle, tf: 1 / 0)
+    hb.run(max_candles=3)
+    assert hb.stats["M5"][0] == {"fired": 3, "missed": 0, "overruns": 0, "errors": 3, "max_lag": 0.0}
+
+
+def test_async_wait_uses_clock():
+    clock = ManualClock(START + 61)
+    candle = asyncio.run(Heartbeat("M15", clock=clock).wait_for_next_candle_async())
+    assert candle == datetime(2024, 1, 1, 0, 15)
+    assert clock.time() == START + 900
+
+
+def test_resume_after_suspend_reanchors_and_counts_missed_candles():
+    clock = ManualClock(START)
+    hb = Heartbeat("M1", clock=clock)
+    candles = []
+
+    def on_candle(candle, tf):
+        candles.append(candle)
+        if len(candles) == 2:
+            clock.suspend(3600 + 20)  # wall time jumps, monotonic time does not
+
+    hb.subscribe("M1", on_candle)
+    hb.run(max_candles=4)
+
+    # Resumed at 01:02:20: the 01:02 candle fires at once (not the stale 00:03 one), then 01:03 on time
+    assert candles[2:] == [datetime(2024, 1, 1, 1, 2), datetime(2024, 1, 1, 1, 3)]
+    assert hb.stats["M1"][0]["missed"] == 59
+    assert hb.now() == clock.time()
+
+
+def test_long_waits_notice_a_suspend_mid_sleep():
+    clock = ManualClock(START)
+    hb = Heartbeat("H1", clock=clock)
+    sleep = clock.sleep
+
+    def sleep_through_suspend(seconds):
+        if clock.time() < START + 120:
+            clock.suspend(1800)  # host suspended while sleeping
+        sleep(seconds)
+
+    clock.sleep = sleep_through_suspend
+    assert hb.wait_for_next_candle() == datetime(2024, 1, 1, 1, 0)
+    assert clock.time() - START <= 3600 + 60  # woke within MAX_SLEEP of the boundary
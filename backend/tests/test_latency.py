@@ -0,0 +1,64 @@
+# backend/tests/test_latency.py
+import json
+import time
+import numpy as np
+from execution.mt5_executor import MT5Executor
+from execution.trade_logger import TradeLogger
+from trading.latency import LatencyRecorder, LatencyHistogram
+from trading.trading_loop import TradingLoop
+
+LOOP_STAGES = ("fetch", "features", "regime", "signal", "validate", "risk", "execute", "cycle", "signal_to_order")
+
+
+def test_histogram_quantiles_and_buckets():
+    hist = LatencyHistogram(buckets=(0.001, 0.01, 0.1), window=100)
+    for ms in range(1, 201):
+        hist.observe(ms / 1000)
+
+    assert hist.count == 200 and hist.max == 0.2
+    assert list(hist.counts) == [1, 9, 90, 100]  # <=1ms, <=10ms, <=100ms, +Inf
+    recent = np.arange(101, 201) / 1000  # rolling window keeps the last 100
+    assert hist.quantile(0.5) == np.quantile(recent, 0.5)
+    assert hist.summary()["p99"] == np.quantile(recent, 0.99)
+
+
+def test_stage_timer_and_exports(tmp_path):
+    rec = LatencyRecorder(buckets=(0.001, 0.1))
+    for _ in range(3):
+        with rec.stage("fetch"):
+            time.sleep(0.002)
+    rec.observe("signal_to_order", 0.0005)
+
+    summary = rec.summary()
+    assert summary["fetch"]["count"] == 3 and 0.002 <= summary["fetch"]["p50"] < 0.1
+
+    text = rec.to_prometheus()
+    assert 'trading_stage_seconds_bucket{stage="fetch",le="0.001"} 0' in text
+    assert 'trading_stage_seconds_bucket{stage="fetch",le="0.1"} 3' in text
+    assert 'trading_stage_seconds_count{stage="signal_to_order"} 1' in text
+    assert 'trading_stage_seconds_quantile{stage="signal_to_order",quantile="0.99"} 0.0005' in text
+
+    rec.export(tmp_path / "metrics.prom")
+    rec.export(tmp_path / "metrics.json")
+    assert (tmp_path / "metrics.prom").read_text() == text
+    assert json.loads((tmp_path / "metrics.json").read_text())["fetch"]["count"] == 3
+
+
+def test_trading_loop_records_every_stage(tmp_path):
+    # Paper mode without a history runs on the built-in dummy bars
+    executor = MT5Executor(mode="paper", trade_logger=TradeLogger(enabled=False))
+    loop = TradingLoop(mode="paper", executor=executor)
+    for _ in range(2):
+        loop.run_once(force_test_trade=True)
+
+    summary = loop.latency.summary()
+    assert {stage: summary[stage]["count"] for stage in LOOP_STAGES} == dict.fromkeys(LOOP_STAGES, 2)
+    assert summary["cycle"]["p50"] >= summary["features"]["p50"]
+
+    loop.export_metrics(tmp_path / "metrics.prom")
+    loop.export_metrics(tmp_path / "metrics.json")
+    text = (tmp_path / "metrics.prom").read_text()
+    exported = json.loads((tmp_path / "metrics.json").read_text())
+    for stage in LOOP_STAGES:
+        assert f'trading_stage_seconds_count{{stage="{stage}"}} 2' in text
+        assert exported[stage]["count"] == 2
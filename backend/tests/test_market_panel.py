@@ -0,0 +1,81 @@
+# backend/tests/test_market_panel.py
+import pandas as pd
+import numpy as np
+from core.beta_calculator import BetaCalculator
+from data.market_panel import MarketPanel
+
+
+def create_bars(index, seed, prefix=None):
+    rng = np.random.default_rng(seed)
+    close = np.cumsum(rng.normal(0, 1, len(index))) + 100
+    cols = {"open": close - 0.1, "high": close + 0.5, "low": close - 0.5, "close": close}
+    if prefix:
+        cols = {f"{prefix}_{k}": v for k, v in cols.items()}
+    return pd.DataFrame(cols, index=index)
+
+
+def test_alignment_and_forward_fill():
+    xau_index = pd.date_range("2024-01-01", periods=10, freq="h")
+    dxy_index = xau_index[1:].delete([3, 4])  # starts later, two gaps
+    xau = create_bars(xau_index, 0, prefix="xau")
+    dxy = create_bars(dxy_index, 1)
+
+    panel = MarketPanel.from_frames({"XAUUSD": xau, "DXY": dxy})
+
+    # First row dropped (no DXY yet), gaps carried forward and flagged
+    assert panel.index.equals(xau_index[1:])
+    assert panel.columns[:4] == ["xau_open", "xau_high", "xau_low", "xau_close"]
+    np.testing.assert_array_equal(panel.column("xau_close"), xau["xau_close"].iloc[1:])
+    dxy_close = panel.column("dxy_close")
+    assert dxy_close[2] == dxy_close[3] == dxy_close[4] == dxy.loc[xau_index[3], "close"]
+    np.testing.assert_array_equal(panel.is_filled("DXY"), [False] * 3 + [True, True] + [False] * 4)
+    assert not panel.is_filled("XAUUSD").any()
+
+
+def test_ffill_limit_leaves_stale_gaps():
+    index = pd.date_range("2024-01-01", periods=8, freq="h")
+    panel = MarketPanel.from_frames(
+        {"XAUUSD": create_bars(index, 0), "DXY": create_bars(index.delete([3, 4, 5]), 1)},
+        ffill_limit=1
+    )
+    dxy_close = panel.column("dxy_close")
+    assert not np.isnan(dxy_close[3])
+    assert np.isnan(dxy_close[4]) and np.isnan(dxy_close[5])
+
+
+def test_symbol_views_share_panel_memory():
+    index = pd.date_range("2024-01-01", periods=50, freq="h")
+    panel = MarketPanel.from_frames({"XAUUSD": create_bars(index, 0), "DXY": create_bars(index, 1)})
+
+    dxy = panel.symbol("DXY", as_prefix="xau")
+    assert list(dxy.columns) == ["xau_open", "xau_high", "xau_low", "xau_close"]
+    assert np.shares_memory(dxy["xau_close"].to_numpy(), panel.values)
+    assert np.shares_memory(panel.frame()["dxy_close"].to_numpy(), panel.values)
+
+
+def test_panel_beta_matches_concat_path():
+    index = pd.date_range("2024-01-01", periods=300, freq="h")
+    xau, dxy = create_bars(index, 0), create_bars(index.delete([40, 41]), 1)
+    panel = MarketPanel.from_frames({"XAUUSD": xau, "DXY": dxy})
+
+    calc = BetaCalculator(window=20)
+    fast = calc.compute_beta_panel(panel)
+    # Same returns as two separately indexed Series go through pd.concat
+    slow = calc.compute_beta(panel.returns("XAUUSD"), panel.returns("DXY").iloc[::-1].sort_index().copy())
+    pd.testing.assert_series_equal(fast, slow, check_names=False, check_freq=False)
+    assert panel.returns("XAUUSD") is panel.returns("XAUUSD")
+
+
+def test_panel_beta_with_gaps_matches_per_symbol_returns():
+    index = pd.date_range("2024-01-01", periods=400, freq="h")
+    # DXY misses whole sessions, XAUUSD a few bars DXY has
+    xau = create_bars(index.delete([10, 200, 201]), 0)
+    dxy = create_bars(index.delete(list(range(50, 70)) + list(range(150, 160))), 1)
+    panel = MarketPanel.from_frames({"XAUUSD": xau, "DXY": dxy})
+    assert panel.is_filled("DXY").sum() == 30
+
+    calc = BetaCalculator(window=20)
+    # Pre-panel behaviour: each symbol's own returns, joined on common bars
+    expected = calc.compute_beta(xau["close"].pct_change(), dxy["close"].pct_change())
+    np.testing.assert_allclose(calc.compute_beta_panel(panel).to_numpy(), expected.to_numpy())
+    assert np.isnan(panel.returns("DXY")[panel.is_filled("DXY")]).all()
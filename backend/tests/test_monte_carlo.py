@@ -0,0 +1,66 @@
+# backend/tests/test_monte_carlo.py
+import numpy as np
+import pytest
+from backtest.monte_carlo import MonteCarlo, path_stats
+from backtest.performance_audit import PerformanceAudit
+from risk.kill_switch import KillSwitch
+from tests.test_performance_audit import create_trades
+
+
+def test_path_stats_match_loop():
+    rng = np.random.default_rng(0)
+    equity = 1_000 + np.cumsum(rng.normal(0, 30, (20, 50)), axis=1)
+    max_dd, terminal, min_equity = path_stats(equity, 1_000)
+
+    for row, dd in zip(equity, max_dd):
+        peak, worst = 1_000, 0.0
+        for value in row:
+            peak = max(peak, value)
+            worst = max(worst, (peak - value) / peak)
+        assert np.isclose(dd, worst)
+    np.testing.assert_allclose(terminal, equity[:, -1])
+    np.testing.assert_allclose(min_equity, equity.min(axis=1))
+
+
+def test_blocks_and_jobs_are_reproducible():
+    pnl = np.random.default_rng(1).normal(5, 100, 200)
+    single = MonteCarlo(pnl, max_cells=4_000, seed=7).run(n_paths=500)
+    pooled = MonteCarlo(pnl, max_cells=4_000, seed=7, n_jobs=2).run(n_paths=500)
+    assert len(single) == 500
+    np.testing.assert_array_equal(single.to_numpy(), pooled.to_numpy())
+
+
+def test_permutation_keeps_terminal_equity():
+    pnl = np.random.default_rng(2).normal(0, 50, 100)
+    results = MonteCarlo(pnl, account_equity=10_000, method="permutation").run(n_paths=300)
+    np.testing.assert_allclose(results["terminal_equity"], 10_000 + pnl.sum())
+    assert results["max_drawdown"].nunique() > 1
+
+
+def test_bootstrap_distribution_and_ruin():
+    pnl = np.array([-300.0, 100.0, 150.0])
+    mc = MonteCarlo(pnl, account_equity=1_000, n_trades=20, seed=3)
+    results = mc.run(n_paths=20_000, ruin_pct=0.5)
+    stderr = np.sqrt(20) * pnl.std() / np.sqrt(20_000)
+    assert abs(results["terminal_equity"].mean() - (1_000 + 20 * pnl.mean())) < 4 * stderr
+    assert 0 < mc.risk_of_ruin() < 1
+    assert np.isclose(mc.risk_of_ruin(), (results["min_equity"] <= 500).mean())
+
+    assert MonteCarlo(np.full(10, 50.0)).run(n_paths=10)["max_drawdown"].eq(0).all()
+    losing = MonteCarlo(np.full(10, -100.0), account_equity=1_000)
+    losing.run(n_paths=10)
+    assert losing.risk_of_ruin() == 1
+
+
+def test_configures_kill_switch_from_audit():
+    audit = PerformanceAudit(create_trades(), account_equity=20_000)
+    mc = MonteCarlo.from_audit(audit)
+    with pytest.raises(ValueError):
+        mc.drawdown_limit()
+    results = mc.run(n_paths=2_000)
+
+    kill_switch = KillSwitch()
+    limit = mc.configure_kill_switch(kill_switch, confidence=0.95, buffer=1.2)
+    assert np.isclose(limit, np.quantile(results["max_drawdown"], 0.95) * 1.2)
+    assert kill_switch.max_drawdown_pct == limit
+    assert mc.summary()["Paths"] == 2_000
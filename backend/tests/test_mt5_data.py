@@ -0,0 +1,124 @@
+# backend/tests/test_mt5_data.py
+import numpy as np
+import pandas as pd
+from data.mt5_data import MT5HistoryCache, MT5DataFetcher
+from data.bar_store import BarStore
+
+RATE_DTYPE = [("time", "i8"), ("open", "f8"), ("high", "f8"), ("low", "f8"),
+              ("close", "f8"), ("tick_volume", "i8"), ("spread", "i4"), ("real_volume", "i8")]
+
+
+class FakeMT5:
+    """Minimal stand-in for the MetaTrader5 module"""
+    TIMEFRAME_M1 = 1
+    TIMEFRAME_M15 = 15
+
+    def __init__(self, n=1500, start=1_700_000_040):
+        self.init_calls = 0
+        self.requests = []
+        self.start = start
+        self.closes = list(2000 + np.cumsum(np.random.default_rng(0).normal(0, 1, n)))
+
+    def initialize(self):
+        self.init_calls += 1
+        return True
+
+    def add_bar(self, close):
+        self.closes.append(close)
+
+    def copy_rates_from_pos(self, symbol, timeframe, start_pos, count):
+        self.requests.append(count)
+        n = len(self.closes)
+        lo = max(0, n - start_pos - count)
+        hi = n - start_pos
+        rates = np.zeros(hi - lo, dtype=RATE_DTYPE)
+        rates["time"] = self.start + 60 * np.arange(lo, hi)
+        rates["close"] = self.closes[lo:hi]
+        rates["open"] = rates["close"] - 0.5
+        rates["high"] = rates["close"] + 1
+        rates["low"] = rates["close"] - 1
+        return rates
+
+    def copy_rates_range(self, symbol, timeframe, date_from, date_to):
+        rates = self.copy_rates_from_pos(symbol, timeframe, 0, len(self.closes))
+        lo, hi = date_from.timestamp(), date_to.timestamp()
+        return rates[(rates["time"] >= lo) & (rates["time"] <= hi)]
+
+
+def test_sync_fetches_only_new_bars():
+    fake = FakeMT5()
+    cache = MT5HistoryCache(mt5_module=fake, initial_bars=1000, max_bars=1200)
+    assert cache.sync("XAUUSD", "M1") == 1000
+
+    # Forming bar updated, three new bars closed
+    fake.closes[-1] += 5
+    for close in (2100.0, 2101.0, 2102.0):
+        fake.add_bar(close)
+    assert cache.sync("XAUUSD", "M1") == 3
+    assert fake.requests[-1] == 8  # small incremental request
+
+    window = cache.window("XAUUSD", "M1", 200)
+    assert len(window) == 200
+    np.testing.assert_allclose(window["close"].iloc[-4:], fake.closes[-4:])
+    assert cache.last_synced("XAUUSD", "M1") == window.index[-1]
+
+
+def test_large_gap_doubles_request_and_trims_memory():
+    fake = FakeMT5()
+    cache = MT5HistoryCache(mt5_module=fake, initial_bars=100, max_bars=300)
+    cache.sync("XAUUSD", "M1")
+    for close in range(50):
+        fake.add_bar(2000.0 + close)
+    assert cache.sync("XAUUSD", "M1") == 50
+    assert fake.requests[1:] == [8, 16, 32, 64]
+    assert len(cache.window("XAUUSD", "M1", 1000)) == 150
+
+
+def test_initialize_called_once_and_store_persistence(tmp_path):
+    fake = FakeMT5()
+    store = BarStore(tmp_path)
+    cache = MT5HistoryCache(mt5_module=fake, store=store, initial_bars=500)
+    MT5DataFetcher(mt5_module=fake)
+    cache.sync("XAUUSD", "M1")
+    assert fake.init_calls == 1
+    assert len(store.load("XAUUSD", "M1")) == 500
+
+    # A fresh cache resumes from the store and only asks for new bars
+    fake.add_bar(2200.0)
+    resumed = MT5HistoryCache(mt5_module=fake, store=store)
+    assert resumed.sync("XAUUSD", "M1") == 1
+    assert len(store.load("XAUUSD", "M1")) == 501
+    assert resumed.window("XAUUSD", "M1", 1)["close"].iloc[0] == 2200.0
+
+
+def test_downtime_beyond_max_bars_is_backfilled(tmp_path):
+    fake = FakeMT5(n=200)
+    store = BarStore(tmp_path)
+    cache = MT5HistoryCache(mt5_module=fake, store=store, initial_bars=200, max_bars=300)
+    cache.sync("XAUUSD", "M1")
+    for close in range(1000):
+        fake.add_bar(2000.0 + close)
+
+    assert cache.sync("XAUUSD", "M1") == 1000
+    stored = store.load("XAUUSD", "M1")
+    assert len(stored) == 1200 and (stored.index.to_series().diff().dropna() == pd.Timedelta("1min")).all()
+    np.testing.assert_allclose(stored["close"], fake.closes)
+    assert len(cache.window("XAUUSD", "M1", 1000)) == 300 and not cache.gaps
+
+
+def test_gap_without_range_backfill_is_recorded():
+    class NoRangeMT5(FakeMT5):
+        copy_rates_range = None
+
+    fake = NoRangeMT5(n=200)
+    cache = MT5HistoryCache(mt5_module=fake, initial_bars=200, max_bars=300)
+    cache.sync("XAUUSD", "M1")
+    last = cache.last_synced("XAUUSD", "M1")
+    for close in range(1000):
+        fake.add_bar(2000.0 + close)
+
+    received = cache.sync("XAUUSD", "M1")
+    (gap,) = cache.gaps
+    assert gap[:3] == ("XAUUSD", "M1", last)
+    # Everything before the first received bar is missing
+    assert gap[3] == pd.Timestamp(fake.start + 60 * (len(fake.closes) - received), unit="s")
@@ -0,0 +1,98 @@
+# backend/tests/test_performance_audit.py
+import numpy as np
+import pandas as pd
+from backtest.performance_audit import PerformanceAudit
+
+
+def create_trades(n=600, seed=4):
+    rng = np.random.default_rng(seed)
+    entry = 2000 + rng.normal(0, 20, n)
+    return pd.DataFrame({
+        "entry_price": entry,
+        "exit_price": entry + rng.normal(0.3, 4, n),
+        "direction": rng.choice([1, -1], n),
+        "size": rng.uniform(1, 20, n),
+        "entry_index": np.arange(n) * 3,
+        "exit_time": pd.date_range("2023-01-01", periods=n, freq="13h"),
+    })
+
+
+def test_legacy_metrics_unchanged():
+    trades = create_trades()
+    audit = PerformanceAudit(trades, commission_per_trade=1.5, slippage_pct=0.0001)
+
+    pnl = trades["direction"] * (trades["exit_price"] - trades["entry_price"] * 1.0001) * trades["size"] - 1.5
+    equity = pnl.cumsum()
+    dd = (equity.cummax() - equity) / equity.cummax() * 100
+    R = pnl / (trades["size"] * trades["entry_price"] * 0.01)
+    assert np.isclose(audit.profit_factor(), pnl[pnl > 0].sum() / -pnl[pnl < 0].sum())
+    assert np.isclose(audit.max_drawdown(), dd.max())
+    assert np.isclose(audit.expectancy(), R.mean())
+    assert "equity_curve" not in trades  # input left untouched
+
+
+def test_ratio_metrics_match_reference():
+    trades = create_trades()
+    audit = PerformanceAudit(trades, account_equity=50_000)
+    pnl = audit.pnl
+
+    equity = 50_000 + np.cumsum(pnl)
+    returns = pnl / np.concatenate([[50_000], equity[:-1]])
+    years = (trades["exit_time"].iloc[-1] - trades["exit_time"].iloc[0]).total_seconds() / (365.25 * 86400)
+    per_year = len(pnl) / years
+    peak = np.maximum.accumulate(np.concatenate([[50_000], equity]))[1:]
+    dd = (peak - equity) / peak
+
+    assert np.isclose(audit.sharpe(), returns.mean() / returns.std(ddof=1) * np.sqrt(per_year))
+    downside = np.sqrt(np.mean(np.minimum(returns, 0) ** 2))
+    assert np.isclose(audit.sortino(), returns.mean() / downside * np.sqrt(per_year))
+    cagr = (equity[-1] / 50_000) ** (1 / years) - 1
+    assert np.isclose(audit.calmar(), cagr / dd.max())
+    assert np.isclose(audit.ulcer_index(), np.sqrt(np.mean((dd * 100) ** 2)))
+
+
+def test_rolling_matches_pandas():
+    audit = PerformanceAudit(create_trades())
+    rolling = audit.rolling(window=40)
+    pnl = pd.Series(audit.pnl)
+
+    gains = pnl.clip(lower=0).rolling(40).sum()
+    losses = -pnl.clip(upper=0).rolling(40).sum()
+    np.testing.assert_allclose(rolling["pf"], gains / losses, rtol=1e-9)
+    np.testing.assert_allclose(rolling["win_rate"], (pnl > 0).astype(float).rolling(40).mean(), rtol=1e-9)
+    peak = pd.Series(audit.account).rolling(40).max()
+    np.testing.assert_allclose(rolling["drawdown_pct"], (peak - audit.account) / peak * 100, rtol=1e-9)
+
+
+def test_breakdowns_match_groupby():
+    trades = create_trades()
+    audit = PerformanceAudit(trades)
+    pnl = pd.Series(audit.pnl, index=trades.index)
+
+    monthly = audit.by_month()
+    expected = pnl.groupby(trades["exit_time"].dt.to_period("M"))
+    np.testing.assert_allclose(monthly["pnl"], expected.sum())
+    np.testing.assert_array_equal(monthly["trades"], expected.size())
+
+    regime = np.arange(trades["entry_index"].max() + 1) % 4
+    by_regime = audit.by_regime(regime)
+    keys = regime[trades["entry_index"]]
+    assert list(by_regime.index) == [0, 1, 2, 3]
+    np.testing.assert_allclose(by_regime["pnl"], pnl.groupby(keys).sum())
+    np.testing.assert_allclose(by_regime["win_rate"], (pnl > 0).groupby(keys).mean())
+
+
+def test_walk_forward_efficiency_accepts_trades_or_audit():
+    trades = create_trades()
+    is_audit = PerformanceAudit(trades.iloc[:300])
+    oos = trades.iloc[300:]
+    expected = PerformanceAudit(oos).profit_factor() / is_audit.profit_factor()
+    assert np.isclose(is_audit.walk_forward_efficiency(oos), expected)
+    assert np.isclose(is_audit.walk_forward_efficiency(PerformanceAudit(oos)), expected)
+
+
+def test_empty_trades():
+    audit = PerformanceAudit(create_trades().iloc[:0])
+    metrics = audit.metrics()
+    assert metrics["Trades"] == 0
+    assert np.isnan(metrics["Sharpe"]) and np.isnan(metrics["Ulcer"])
@@ -0,0 +1,119 @@
+# backend/tests/test_pipeline.py
+import numpy as np
+import pandas as pd
+from core.pipeline import Pipeline
+from core.feature_engineer import FeatureEngineer
+from core.regime_detector import RegimeDetector
+from core.signal_generator import SignalGenerator
+from core.validator import Validator
+from risk.risk_manager import RiskManager
+from risk.kill_switch import KillSwitch
+
+
+def create_bars(n=1500):
+    rng = np.random.default_rng(5)
+    close = 2000 + np.cumsum(rng.normal(0, 1.0, n))
+    return pd.DataFrame({
+        "xau_open": close + rng.normal(0, 0.2, n),
+        "xau_high": close + 1.0,
+        "xau_low": close - 1.0,
+        "xau_close": close,
+    }, index=pd.date_range("2024-01-01", periods=n, freq="15min"))
+
+
+class FakeExecutor:
+    def __init__(self):
+        self.orders = []
+
+    def send_order(self, symbol, direction, volume, price=None, sl=None, tp=None):
+        self.orders.append((symbol, direction, volume, price, sl, tp))
+        return {"symbol": symbol, "direction": direction, "volume": volume, "entry_price": price,
+                "sl": sl, "tp": tp, "status": "executed"}
+
+
+def test_batch_matches_chained_stages():
+    df = create_bars()
+    regimes = RegimeDetector().detect(FeatureEngineer().add_features(df))
+    expected = Validator().validate(regimes.assign(signal=SignalGenerator().generate(regimes)["signal"]), {})
+
+    out = Pipeline().run(df)
+    np.testing.assert_array_equal(out["signal"].to_numpy(), expected["signal"].to_numpy())
+    np.testing.assert_allclose(out["zscore"], expected["zscore"])
+    assert out["signal"].abs().sum() > 0
+
+
+def test_mt5_column_names_are_accepted():
+    df = create_bars(300)
+    mt5 = df.rename(columns=lambda c: c.replace("xau_", ""))
+    np.testing.assert_array_equal(Pipeline().run(mt5)["signal"], Pipeline().run(df)["signal"])
+
+
+def test_streaming_matches_batch():
+    df = create_bars()
+    batch = Pipeline().run(df)
+
+    pipeline = Pipeline()
+    rows = [pipeline.update(bar) for bar in df.to_dict("records")]
+    np.testing.assert_array_equal([row["signal"] for row in rows], batch["signal"].to_numpy())
+
+
+def test_step_only_streams_new_bars():
+    df = create_bars(400)
+    pipeline = Pipeline()
+    calls = []
+    update = pipeline.update
+    pipeline.update = lambda bar: calls.append(bar) or update(bar)
+
+    first = pipeline.step(df.iloc[:300], forming=False)
+    assert len(calls) == 300
+    assert pipeline.step(df.iloc[100:300], forming=False) is None  # nothing new
+    latest = pipeline.step(df.iloc[102:302], forming=False)  # overlapping window with two new bars
+    assert len(calls) == 302
+    assert latest["xau_close"] == df["xau_close"].iloc[301]
+    assert first["xau_close"] == df["xau_close"].iloc[299]
+
+
+def test_step_skips_the_forming_bar_until_it_closes():
+    df = create_bars(400)
+    pipeline = Pipeline()
+    rows = []
+    for end in range(300, 401):
+        # The newest bar of each window is still forming: its close differs from the final one
+        window = df.iloc[:end].copy()
+        window.iloc[-1, window.columns.get_loc("xau_close")] += 7.5
+        row = pipeline.step(window)
+        assert row is not None and row["xau_close"] == df["xau_close"].iloc[end - 2]
+        rows.append(row)
+
+    expected = Pipeline().run(df.iloc[:399]).iloc[-len(rows):]
+    np.testing.assert_array_equal([r["signal"] for r in rows], expected["signal"].to_numpy())
+    np.testing.assert_allclose([r["zscore"] for r in rows], expected["zscore"].to_numpy())
+
+
+def test_after_hook_runs_before_validation():
+    df = create_bars(300)
+    pipeline = Pipeline()
+    out = pipeline.run(df, after={"signal": lambda frame: {"signal": np.full(len(frame), 1)}})
+    chaos = out["regime"].to_numpy() == 2
+    assert (out["signal"].to_numpy()[~chaos] == 1).all()
+    assert (out["signal"].to_numpy()[chaos] == 0).all()
+
+
+def test_order_applies_risk_and_kill_switch():
+    executor = FakeExecutor()
+    kill_switch = KillSwitch(max_drawdown_pct=0.2, min_expectancy=0.1)
+    kill_switch.reset(100_000)
+    pipeline = Pipeline(risk_manager=RiskManager(100_000, 0.01), kill_switch=kill_switch, executor=executor)
+
+    assert pipeline.order("XAUUSD", {"signal": 0, "xau_close": 2000.0}) is None
+    trade = pipeline.order("XAUUSD", {"signal": -1, "xau_close": 2000.0, "atr": 5.0})
+    assert executor.orders == [("XAUUSD", -1, 200.0, 2000.0, 2005.0, 1990.0)]
+    assert trade["status"] == "executed"
+
+    # Past the cycle deadline the order is refused
+    assert pipeline.order("XAUUSD", {"signal": -1, "xau_close": 2000.0, "atr": 5.0}, expired=lambda: True) is None
+    assert len(executor.orders) == 1
+
+    # 25% drawdown halts trading
+    assert pipeline.order("XAUUSD", {"signal": 1, "xau_close": 2000.0}, equity=75_000) is None
+    assert len(executor.orders) == 1
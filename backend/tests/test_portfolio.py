@@ -0,0 +1,65 @@
+# backend/tests/test_portfolio.py
+import numpy as np
+import pandas as pd
+from backtest.backtester import Backtester
+from backtest.portfolio import PortfolioBacktester
+from risk.kill_switch import KillSwitch
+from tests.test_backtester import create_random_bars
+
+
+def create_frames():
+    index = pd.date_range("2024-01-01", periods=3000, freq="15min")
+    xau = create_random_bars(3000, seed=1).set_axis(index)
+    # Second symbol on an offset, partly overlapping clock
+    dxy = create_random_bars(2000, seed=2).set_axis(index[500:2500] + pd.Timedelta("5min"))
+    return {"XAUUSD": xau, "DXY": dxy}
+
+
+def test_symbols_keep_their_own_entries_and_exits():
+    frames = create_frames()
+    kill_switch = KillSwitch(max_drawdown_pct=1.0)
+    trades = PortfolioBacktester(frames, log_trades=False, kill_switch=kill_switch).run()
+
+    assert set(trades["symbol"]) == {"XAUUSD", "DXY"}
+    for symbol, df in frames.items():
+        bt = Backtester(df, log_trades=False, symbol=symbol)
+        bt.kill_switch.max_drawdown_pct = 1.0
+        expected = bt.run()
+        got = trades[trades["symbol"] == symbol].reset_index(drop=True)
+        assert (expected["symbol"] == symbol).all()
+        for col in ["entry_index", "exit_index", "exit_reason", "exit_price", "direction"]:
+            np.testing.assert_array_equal(got[col], expected[col])
+
+
+def test_shared_equity_drives_sizing_and_curve():
+    frames = create_frames()
+    pf = PortfolioBacktester(frames, account_equity=50_000, risk_per_trade=0.02,
+                             log_trades=False, kill_switch=KillSwitch(max_drawdown_pct=1.0))
+    trades = pf.run()
+
+    # Entries in time order, sized on the equity realized up to the entry (exits first)
+    assert trades["entry_time"].is_monotonic_increasing
+    for trade in trades.itertuples():
+        closed = trades["exit_time"] <= trade.entry_time
+        equity = 50_000 + trades.loc[closed, "pnl"].sum()
+        assert np.isclose(trade.size, max(equity * 0.02 / 2.0, 1))
+
+    assert pf.equity_curve.index.equals(frames["XAUUSD"].index.union(frames["DXY"].index))
+    assert np.isclose(pf.equity_curve.iloc[-1], 50_000 + trades["pnl"].sum())
+    assert np.isclose(pf.equity, pf.equity_curve.iloc[-1])
+    by_exit = trades.sort_values("exit_time", kind="stable")
+    np.testing.assert_allclose(by_exit["equity"], 50_000 + by_exit["pnl"].cumsum())
+
+
+def test_kill_switch_halts_every_symbol():
+    frames = create_frames()
+    kill_switch = KillSwitch(max_drawdown_pct=0.001)
+    trades = PortfolioBacktester(frames, log_trades=False, kill_switch=kill_switch).run()
+
+    assert kill_switch.triggered
+    by_exit = trades.sort_values("exit_time")
+    equity = 100000 + by_exit["pnl"].cumsum()
+    breach = by_exit["exit_time"][(equity.cummax().clip(lower=100000) - equity) / equity.cummax().clip(lower=100000) >= 0.001]
+    assert len(breach)
+    # Nothing opens after the first exit that breached the limit
+    assert (trades["entry_time"] < breach.iloc[0]).all()
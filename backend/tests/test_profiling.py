@@ -0,0 +1,73 @@
+# backend/tests/test_profiling.py
+import re
+import pytest
+import pandas as pd
+import numpy as np
+from backtest.backtester import Backtester
+from backtest.walk_forward import WalkForward
+from backtest import profiling
+from backtest.profiling import RunProfiler
+from core.feature_engineer import FeatureEngineer
+from core.regime_detector import RegimeDetector
+
+
+def create_bars(n=3000, seed=8):
+    rng = np.random.default_rng(seed)
+    close = np.cumsum(rng.normal(0, 0.5, n)) + 2000
+    opens = close - rng.normal(0, 0.2, n)
+    return pd.DataFrame({
+        "xau_open": opens,
+        "xau_high": np.maximum(opens, close) + rng.random(n) * 0.5,
+        "xau_low": np.minimum(opens, close) - rng.random(n) * 0.5,
+        "xau_close": close,
+        "atr": 2.0
+    }, index=pd.date_range("2024-01-01", periods=n, freq="15min"))
+
+
+def test_backtest_profile_writes_collapsed_stacks_and_counters(tmp_path):
+    data = RegimeDetector().detect(FeatureEngineer().add_features(create_bars()))
+    bt = Backtester(data, log_trades=False)
+    trades = bt.run(profile=str(tmp_path / "bt"))
+    report = bt.profile_report
+
+    assert report["mode"] in ("cprofile", "sampling")
+    assert (tmp_path / "bt.collapsed").exists()
+    lines = (tmp_path / "bt.collapsed").read_text().splitlines()
+    assert lines and all(re.fullmatch(r".+ \d+", line) for line in lines)
+    assert any("_run (backtester.py" in line for line in lines)
+
+    counters = report["counters"]
+    assert counters["orders_sent"] == len(trades)
+    assert counters["signals_evaluated"] == len(bt.df)  # signal column generated once
+    assert counters["log_writes"] >= len(trades)  # one Backtester record per trade
+
+
+def test_instrumentation_is_removed_after_run(tmp_path):
+    copy, send_order = pd.DataFrame.copy, Backtester(create_bars(), log_trades=False).executor.send_order.__func__
+    with RunProfiler(path=str(tmp_path / "p"), mode="cprofile") as prof:
+        pd.DataFrame({"a": [1]}).copy()
+    assert prof.report()["counters"]["dataframe_copies"] == 1
+    assert pd.DataFrame.copy is copy and "copy" not in pd.DataFrame.__dict__
+    assert Backtester(create_bars(), log_trades=False).executor.send_order.__func__ is send_order
+
+
+def test_instrumentation_is_removed_when_profile_teardown_fails(tmp_path, monkeypatch):
+    def broken(stats):
+        raise RuntimeError("corrupt profile")
+
+    copy = pd.DataFrame.copy
+    monkeypatch.setattr(profiling, "_cprofile_stacks", broken)
+    with pytest.raises(RuntimeError, match="corrupt profile"):
+        with RunProfiler(path=str(tmp_path / "p"), mode="cprofile"):
+            pd.DataFrame({"a": [1]}).copy()
+    assert pd.DataFrame.copy is copy and "copy" not in pd.DataFrame.__dict__
+
+
+def test_walk_forward_profile(tmp_path):
+    wf = WalkForward(create_bars(), Backtester, is_window=1000, oos_window=500,
+                     param_grid={"z_thresh": [0.5, 1.0]})
+    results = wf.run(profile=str(tmp_path / "wf"))
+    counters = wf.profile_report["counters"]
+    # At least every candidate on every IS window
+    assert counters["signals_evaluated"] >= len(results) * 2 * 1000
+    assert (tmp_path / "wf.prof").exists()
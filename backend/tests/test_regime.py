@@ -25,3 +25,44 @@ def test_detect_regime_output():
     
     # Volatility percentile column exists
     assert "vol_pct" in df_out.columns
+
+
+
+def create_ohlc(n=1500):
+    np.random.seed(3)
+    close = np.cumsum(np.random.randn(n)) + 2000
+    return pd.DataFrame({
+        "xau_open": close + np.random.randn(n) * 0.1,
+        "xau_high": close + 1,
+        "xau_low": close - 1,
+        "xau_close": close
+    })
+
+
+def test_detect_does_not_mutate_input():
+    df = create_ohlc(300)
+    before = list(df.columns)
+    out = RegimeDetector().detect(df)
+    assert list(df.columns) == before
+    assert {"vol", "vol_pct", "sma_slope", "regime", "bias"} <= set(out.columns)
+
+
+def test_streaming_matches_batch():
+    df = create_ohlc()
+    detector = RegimeDetector(vol_window=20, sma_window=10, lookback=200)
+    batch = detector.detect(df)
+
+    detector.reset()
+    stream = pd.DataFrame([detector.update(bar) for bar in df.to_dict("records")], index=df.index)
+
+    for col in ["returns", "vol", "vol_pct", "sma_slope", "bias"]:
+        np.testing.assert_allclose(stream[col], batch[col], rtol=1e-9, atol=1e-12, err_msg=col)
+    np.testing.assert_array_equal(stream["regime"], batch["regime"])
+
+
+def test_vol_pct_is_causal():
+    df = create_ohlc(600)
+    detector = RegimeDetector(lookback=100)
+    full = detector.detect(df)
+    head = detector.detect(df.iloc[:400])
+    np.testing.assert_allclose(full["vol_pct"].iloc[:400], head["vol_pct"])
@@ -0,0 +1,112 @@
+# backend/tests/test_replay.py
+from types import SimpleNamespace
+import numpy as np
+import pandas as pd
+import pytest
+from data.bar_store import BarStore
+from live.heartbeat import ManualClock
+from execution.mt5_executor import MT5Executor
+from execution.trade_logger import TradeLogger
+from trading.trading_loop import TradingLoop
+from live.replay import (Replay, ReplayHistory, read_chunks, ticks_to_bars, trading_loop_callback,
+                         live_runner_callback, TICK_TIMEFRAME)
+
+
+def create_ticks(n=20_000, seed=0):
+    rng = np.random.default_rng(seed)
+    # Irregular tick times over ~2 months, so M1 bars span chunks and partitions
+    times = pd.Timestamp("2024-01-31") + pd.to_timedelta(np.cumsum(rng.integers(1, 600, n)), unit="s")
+    return pd.DataFrame({"bid": 2000 + np.cumsum(rng.normal(0, 0.1, n))}, index=pd.DatetimeIndex(times, name="time"))
+
+
+def create_bars(start, periods, seed):
+    index = pd.date_range(start, periods=periods, freq="15min", name="time")
+    close = 2000 + np.cumsum(np.random.default_rng(seed).normal(0, 1, periods))
+    return pd.DataFrame({"open": close - 0.5, "high": close + 1, "low": close - 1, "close": close,
+                         "tick_volume": 10.0}, index=index)
+
+
+def test_ticks_aggregate_like_resample(tmp_path):
+    store = BarStore(tmp_path)
+    ticks = create_ticks()
+    store.write("XAUUSD", TICK_TIMEFRAME, ticks)
+
+    bars = pd.concat(ticks_to_bars(read_chunks(store, "XAUUSD", TICK_TIMEFRAME, chunk_size=777), "M5"))
+    expected = ticks["bid"].resample("5min").ohlc().dropna()
+    expected["tick_volume"] = ticks["bid"].resample("5min").count()[expected.index].astype(float)
+    pd.testing.assert_frame_equal(bars, expected.set_axis(expected.index.as_unit("ns")),
+                                  check_freq=False, check_names=False)
+
+
+def test_history_serves_rolling_window():
+    history = ReplayHistory(max_bars=50)
+    bars = create_bars("2024-01-01", 175, 1)
+    for t, row in zip(bars.index.as_unit("ns").asi8, bars.to_numpy()):
+        history.push("XAUUSD", "M15", t, row)
+    assert history.sync("XAUUSD", "M15") == 175
+    assert history.sync("XAUUSD", "M15") == 0
+    assert history.last_synced("XAUUSD", "M15") == bars.index[-1]
+    pd.testing.assert_frame_equal(history.window("XAUUSD", "M15", 30), bars.iloc[-30:].set_axis(bars.index[-30:].as_unit("ns")), check_freq=False)
+    assert len(history.window("XAUUSD", "M15", 500)) == 50
+
+
+def test_replay_merges_symbols_and_paces(tmp_path):
+    store = BarStore(tmp_path)
+    xau, dxy = create_bars("2024-01-01", 300, 1), create_bars("2024-01-01 00:05", 200, 2)
+    store.write("XAUUSD", "M15", xau)
+    store.write("DXY", "M15", dxy)
+
+    seen = []
+    clock = ManualClock(1_000)
+    replay = Replay.from_store(store, ["XAUUSD", "DXY"], timeframe="M15", speed=900, clock=clock)
+
+    def on_bar(symbol, candle):
+        replay.history.sync(symbol, "M15")
+        window = replay.history.window(symbol, "M15", 1)
+        assert window.index[-1] == candle
+        assert window["close"].iloc[-1] == {"XAUUSD": xau, "DXY": dxy}[symbol]["close"][candle]
+        seen.append((candle, symbol))
+
+    stats = replay.run(on_bar)
+    assert stats["bars"] == 500
+    assert seen == sorted(seen)
+    # 900 market seconds per wall second: one M15 bar per second of the manual clock
+    assert clock.now - 1_000 == (xau.index[-1] - xau.index[0]).total_seconds() / 900
+
+    fast = Replay.from_store(store, ["XAUUSD"], timeframe="M15", clock=ManualClock(0))
+    assert fast.run(lambda symbol, candle: None, max_bars=100)["bars"] == 100
+    assert fast.clock.now == 0
+
+
+def test_trading_loop_runs_once_per_bar_of_its_symbol(tmp_path):
+    store = BarStore(tmp_path)
+    xau, dxy = create_bars("2024-01-01", 80, 1), create_bars("2024-01-01 00:05", 50, 2)
+    store.write("XAUUSD", "M1", xau)
+    store.write("DXY", "M1", dxy)
+
+    executor = MT5Executor(mode="paper", trade_logger=TradeLogger(enabled=False))
+    loop = TradingLoop(mode="paper", executor=executor)
+    windows = []
+    fetch = loop.fetch_market_data
+    loop.fetch_market_data = lambda: windows.append(fetch()) or windows[-1]
+
+    replay = Replay.from_store(store, ["XAUUSD", "DXY"], timeframe="M1", clock=ManualClock(0))
+    assert replay.run(trading_loop_callback(loop, replay, force_test_trade=True))["bars"] == 130
+    assert loop.history is replay.history
+
+    # One cycle per XAUUSD bar, each on the XAUUSD window ending at that bar
+    assert [w.index[-1] for w in windows] == list(xau.index)
+    np.testing.assert_array_equal(windows[-1]["xau_close"], xau["close"].to_numpy())
+    assert loop.latency.summary()["cycle"]["count"] == len(xau)
+
+
+def test_live_runner_replay_refuses_live_orders():
+    replay = Replay({}, clock=ManualClock(0))
+    runner = SimpleNamespace(MODE="live", executor=SimpleNamespace(mode="live"))
+    with pytest.raises(ValueError, match="paper"):
+        live_runner_callback(runner, replay)
+    assert not hasattr(runner, "history")
+
+    runner = SimpleNamespace(MODE="paper", executor=SimpleNamespace(mode="paper"))
+    live_runner_callback(runner, replay)
+    assert runner.history is replay.history
@@ -0,0 +1,153 @@
+# backend/tests/test_trade_logger.py
+import time
+import threading
+import numpy as np
+import pandas as pd
+from execution.trade_logger import TradeLogger, TRADE_FIELDS
+from execution.trade_journal import TradeJournal, read_journal, HEADER_SIZE, JOURNAL_DTYPE
+
+TRADE = {"symbol": "XAUUSD", "direction": "BUY", "size": 1.0, "entry": 2000.0, "sl": 1990.0, "tp": 2020.0}
+
+
+def make_logger(tmp_path, **kwargs):
+    return TradeLogger(trades_file=tmp_path / "trades.csv", rejected_file=tmp_path / "rejected.csv", **kwargs)
+
+
+def test_batches_are_written_on_size_and_close(tmp_path, monkeypatch):
+    writes = []
+    write = TradeLogger._write
+    monkeypatch.setattr(TradeLogger, "_write", lambda self, rows: writes.append(len(rows)) or write(self, rows))
+
+    logger = make_logger(tmp_path, batch_size=100, flush_interval=60)
+    for _ in range(250):
+        logger.log_trade(TRADE)
+    logger.log_rejected(TRADE, reason="kill switch")
+    logger.close()
+
+    assert writes[:2] == [100, 100] and sum(writes) == 251
+    trades = pd.read_csv(tmp_path / "trades.csv")
+    assert list(trades.columns) == TRADE_FIELDS
+    assert len(trades) == 250 and (trades["status"] == "executed").all()
+    assert pd.read_csv(tmp_path / "rejected.csv")["reason"].tolist() == ["kill switch"]
+
+    logger.log_trade(TRADE)  # dropped after close
+    assert len(pd.read_csv(tmp_path / "trades.csv")) == 250
+
+
+def test_time_based_flush_and_explicit_flush(tmp_path):
+    logger = make_logger(tmp_path, batch_size=1000, flush_interval=0.05)
+    logger.log_trade(TRADE)
+    time.sleep(0.5)
+    assert len(pd.read_csv(tmp_path / "trades.csv")) == 1
+
+    logger.log_trade(TRADE)
+    logger.flush()
+    assert len(pd.read_csv(tmp_path / "trades.csv")) == 2
+    logger.close()
+
+
+def test_disabled_logger_skips_disk(tmp_path):
+    logger = make_logger(tmp_path, enabled=False)
+    logger.log_trade(TRADE)
+    logger.flush()
+    logger.close()
+    assert not (tmp_path / "trades.csv").exists()
+    assert logger._thread is None
+
+
+def test_class_level_calls_use_the_default_logger(tmp_path, monkeypatch):
+    shared = make_logger(tmp_path)
+    monkeypatch.setattr(TradeLogger, "_default", shared)
+    TradeLogger.log_trade(TRADE)
+    TradeLogger.log_rejected(TRADE, reason="kill switch")
+    shared.close()
+
+    assert len(pd.read_csv(tmp_path / "trades.csv")) == 1
+    assert pd.read_csv(tmp_path / "rejected.csv")["reason"].tolist() == ["kill switch"]
+
+
+def test_failing_writer_keeps_serving_the_queue(tmp_path, monkeypatch):
+    write = TradeLogger._write
+    failures = [OSError("disk full")]
+
+    def flaky_write(self, rows):
+        if failures:
+            raise failures.pop()
+        write(self, rows)
+
+    monkeypatch.setattr(TradeLogger, "_write", flaky_write)
+    logger = make_logger(tmp_path, batch_size=1000, flush_interval=60)
+    logger.log_trade(TRADE)
+    logger.flush()  # the failed batch is dropped, flush still returns
+    assert not (tmp_path / "trades.csv").exists()
+
+    logger.log_trade(TRADE)
+    logger.flush()
+    assert logger._thread.is_alive()
+    assert len(pd.read_csv(tmp_path / "trades.csv")) == 1
+    logger.close()
+
+
+def test_dead_writer_thread_falls_back_to_sync_writes(tmp_path):
+    logger = make_logger(tmp_path, max_queue=1)
+    logger._thread = threading.Thread(target=lambda: None)  # a writer that has died
+    logger._thread.start()
+    logger._thread.join()
+    for _ in range(3):
+        logger.log_trade(TRADE)  # would block on the full queue without the fallback
+    logger.flush()
+    logger.close()
+    assert len(pd.read_csv(tmp_path / "trades.csv")) == 3
+
+
+def test_journal_roundtrip_matches_csv(tmp_path):
+    logger = make_logger(tmp_path, batch_size=64, journal_file=tmp_path / "trades.journal")
+    for i in range(200):
+        logger.log_trade(dict(TRADE, direction="SELL" if i % 3 else "BUY", entry=2000.0 + i, symbol=f"S{i % 4}"))
+    logger.log_rejected(TRADE, reason="kill switch")
+    logger.close()
+
+    journal = read_journal(tmp_path / "trades.journal")
+    csv = pd.read_csv(tmp_path / "trades.csv")
+    executed = journal[journal["kind"] == "executed"]
+    assert len(journal) == 201 and len(executed) == 200
+    np.testing.assert_array_equal(executed["entry"], csv["entry"])
+    np.testing.assert_array_equal(executed["direction"], np.where(csv["direction"] == "BUY", 1, -1))
+    assert executed["symbol"].astype(str).tolist() == csv["symbol"].tolist()
+    assert (executed["timestamp"].to_numpy() == pd.to_datetime(csv["timestamp"]).to_numpy()).all()
+    rejected = read_journal(tmp_path / "trades.journal", kind="rejected")
+    assert rejected["reason"].tolist() == ["kill switch"]
+
+
+def test_journal_kind_without_records_is_empty(tmp_path):
+    logger = make_logger(tmp_path, journal_file=tmp_path / "trades.journal")
+    logger.log_trade(TRADE)
+    logger.close()
+
+    rejected = read_journal(tmp_path / "trades.journal", kind="rejected")
+    assert len(rejected) == 0
+    assert list(rejected.columns) == list(read_journal(tmp_path / "trades.journal").columns)
+
+
+def test_journal_truncates_long_text_on_character_boundary(tmp_path, caplog):
+    path = tmp_path / "trades.journal"
+    reason = "x" * 47 + "é"  # the 48-byte cut splits the two-byte "é"
+    with caplog.at_level("WARNING", logger="TradeJournal"):
+        TradeJournal(path).append([dict(TRADE, timestamp="2024-01-01", kind=1, reason=reason)])
+    assert "reason truncated" in caplog.text
+
+    TradeJournal(path).append([dict(TRADE, timestamp="2024-01-02", kind=1, reason="ok")])
+    assert read_journal(path)["reason"].tolist() == ["x" * 47, "ok"]
+
+
+def test_journal_ignores_and_repairs_partial_record(tmp_path):
+    path = tmp_path / "trades.journal"
+    journal = TradeJournal(path)
+    journal.append([dict(TRADE, timestamp="2024-01-01", status="executed")] * 3)
+    with open(path, "ab") as f:
+        f.write(b"\x01" * 40)  # interrupted write
+    assert len(read_journal(path)) == 3
+
+    journal.append([dict(TRADE, timestamp="2024-01-02", status="executed")])
+    assert (path.stat().st_size - HEADER_SIZE) % JOURNAL_DTYPE.itemsize == 0
+    assert read_journal(path)["timestamp"].iloc[-1] == pd.Timestamp("2024-01-02")
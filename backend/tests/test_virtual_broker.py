@@ -0,0 +1,58 @@
+# backend/tests/test_virtual_broker.py
+import numpy as np
+import pytest
+from execution.mt5_executor import MT5Executor
+from execution.trade_logger import TradeLogger
+from execution.virtual_broker import VirtualBroker
+
+
+def create_broker():
+    return VirtualBroker(executor=MT5Executor(slippage_pct=0.0, trade_logger=TradeLogger(enabled=False)))
+
+
+def test_close_trade_and_summary():
+    broker = create_broker()
+    a = broker.place_trade("XAUUSD", 1, 2.0, price=2000.0, sl=1990.0, tp=2020.0)
+    b = broker.place_trade("DXY", -1, 1.0, price=102.0)
+    assert (a["id"], b["id"]) == (1, 2)
+
+    closed = broker.close_trade(a, exit_price=2010.0)
+    assert closed["status"] == "closed" and closed["pnl"] == pytest.approx(20.0)
+    assert broker.close_trade(a["id"]) is None
+    assert broker.get_open_trades() == [b]
+    assert broker.get_open_trades("XAUUSD") == []
+    assert broker.summary() == {"open_trades": 1, "closed_trades": 1, "realized_pnl": pytest.approx(20.0)}
+
+    broker.close_all_trades({"DXY": 101.0})
+    assert broker.summary()["closed_trades"] == 2 and not broker.active_trades
+
+
+def test_price_updates_trigger_stops_like_brute_force():
+    rng = np.random.default_rng(5)
+    broker = create_broker()
+    for _ in range(3000):
+        symbol = rng.choice(["XAUUSD", "DXY"])
+        direction = int(rng.choice([1, -1]))
+        price = 2000.0 + rng.normal(0, 5)
+        sl_dist, tp_dist = rng.uniform(1, 30, 2)
+        broker.place_trade(symbol, direction, 1.0, price=price,
+                           sl=price - direction * sl_dist, tp=price + direction * tp_dist)
+    # Trailing a few stops leaves stale heap entries that must be ignored
+    for trade in broker.get_open_trades("XAUUSD")[:200]:
+        broker.modify_trade(trade, sl=trade["entry_price"] - trade["direction"] * 50)
+
+    prices = 2000.0 + np.cumsum(rng.normal(0, 2, 400))
+    for price in prices:
+        for symbol in ("XAUUSD", "DXY"):
+            expected = {
+                t["id"]: "sl" if (price - t["sl"]) * t["direction"] <= 0 else "tp"
+                for t in broker.get_open_trades(symbol)
+                if (price - t["sl"]) * t["direction"] <= 0 or (price - t["tp"]) * t["direction"] >= 0
+            }
+            closed = broker.update_price(symbol, price)
+            assert {t["id"]: t["exit_reason"] for t in closed} == expected
+            assert all(t["exit_price"] == price for t in closed)
+
+    summary = broker.summary()
+    assert summary["open_trades"] + summary["closed_trades"] == 3000
+    assert summary["realized_pnl"] == pytest.approx(sum(t["pnl"] for t in broker.closed_trades))
@@ -0,0 +1,109 @@
+# backend/tests/test_walk_forward.py
+import pandas as pd
+import numpy as np
+from backtest.backtester import Backtester
+from backtest.walk_forward import WalkForward
+
+
+def create_bars(n=3000, seed=8):
+    rng = np.random.default_rng(seed)
+    close = np.cumsum(rng.normal(0, 0.5, n)) + 2000
+    opens = close - rng.normal(0, 0.2, n)
+    return pd.DataFrame({
+        "xau_open": opens,
+        "xau_high": np.maximum(opens, close) + rng.random(n) * 0.5,
+        "xau_low": np.minimum(opens, close) - rng.random(n) * 0.5,
+        "xau_close": close,
+        "signal": rng.choice([0, 0, 0, 0, 0, 0, 1, -1], n),
+        "atr": 2.0
+    }, index=pd.date_range("2024-01-01", periods=n, freq="15min"))
+
+
+def test_parallel_matches_serial():
+    data = create_bars()
+    kwargs = dict(is_window=1000, oos_window=500, slippage_pct=0.0002, log_trades=False)
+    serial = WalkForward(data, Backtester, n_jobs=1, **kwargs).run()
+    parallel = WalkForward(data, Backtester, n_jobs=2, **kwargs).run()
+
+    assert len(serial) == 4
+    metrics = ["IS_start", "OOS_end", "IS_PF", "OOS_PF", "IS_MaxDD%", "OOS_Expectancy", "WFE"]
+    pd.testing.assert_frame_equal(serial[metrics], parallel[metrics])
+    for a, b in zip(serial["OOS_trades"], parallel["OOS_trades"]):
+        pd.testing.assert_frame_equal(a.drop(columns="timestamp"), b.drop(columns="timestamp"))
+
+
+def test_optimizer_computes_features_once():
+    data = create_bars().drop(columns="signal")
+    grid = {"z_thresh": [0.5, 1.0, 1.5, 2.0], "mom_thresh": [0.0, 0.5]}
+    wf = WalkForward(data, Backtester, is_window=1000, oos_window=500, param_grid=grid, log_trades=False)
+
+    calls = []
+    detect = wf.search.regime_detector.detect
+    wf.search.regime_detector.detect = lambda df: calls.append(len(df)) or detect(df)
+    results = wf.run()
+
+    # One feature pass over the whole frame, whatever the number of windows or the grid size
+    assert calls == [len(data)]
+    for _, row in results.iterrows():
+        assert row["Best_Params"] in wf.search.candidates()
+
+
+def test_oos_windows_use_warm_full_frame_features():
+    from core.signal_generator import compute_signals
+    from backtest.optimizer import FEATURE_COLUMNS
+
+    data = create_bars().drop(columns="signal")
+    wf = WalkForward(data, Backtester, is_window=1000, oos_window=500,
+                     param_grid={"z_thresh": [1.0], "mom_thresh": [0.0]}, log_trades=False)
+    results = wf.run()
+
+    prepared = wf.search.prepare(data)
+    for (_, is_end, oos_end), oos_trades in zip(wf.windows(), results["OOS_trades"]):
+        window = prepared.iloc[is_end:oos_end]
+        assert not window[list(FEATURE_COLUMNS)].iloc[:50].isna().any().any()
+        signal = compute_signals(*(window[c].to_numpy() for c in FEATURE_COLUMNS), z_thresh=1.0, mom_thresh=0.0)
+        expected = Backtester(window, log_trades=False).run_vectorized(signal=signal)
+        columns = [c for c in expected.columns if c != "timestamp"]
+        pd.testing.assert_frame_equal(oos_trades[columns], expected[columns], check_dtype=False)
+
+
+def test_optimizer_accepts_unhashable_strategy_kwargs():
+    class TaggedBacktester(Backtester):
+        def __init__(self, df, tags=None, **kwargs):
+            super().__init__(df, **kwargs)
+            self.tags = tags
+
+    wf = WalkForward(create_bars().drop(columns="signal"), TaggedBacktester, is_window=1000, oos_window=500,
+                     param_grid={"z_thresh": [0.5, 1.0]}, tags=["gold", {"session": "london"}], log_trades=False)
+    assert len(wf.run()) == 4
+
+
+def test_random_search_draws_within_bounds():
+    wf = WalkForward(create_bars(), Backtester, param_grid={"z_thresh": (0.5, 2.5), "mom_thresh": [0.0, 0.1]},
+                     n_iter=20, seed=3)
+    draws = wf.search.candidates()
+    assert len(draws) == 20
+    assert all(0.5 <= d["z_thresh"] <= 2.5 and d["mom_thresh"] in (0.0, 0.1) for d in draws)
+    assert draws == wf.search.candidates()  # seeded
+
+
+def test_summary_reports_every_metric():
+    wf = WalkForward(create_bars(), Backtester, is_window=1000, oos_window=500, log_trades=False)
+    wf.run()
+    summary = wf.summary()
+    for key in ("Avg_IS_PF", "Avg_OOS_MaxDD%", "Avg_WFE", "Avg_OOS_Sharpe", "Avg_IS_Sortino",
+                "Avg_OOS_Calmar", "Avg_OOS_Ulcer", "Combined_OOS_Sharpe"):
+        assert key in summary
+    assert summary["Combined_OOS_Trades"] == sum(len(r["OOS_trades"]) for r in wf.results)
+    assert len(wf.oos_audit().by_month()) >= 1
+
+
+def test_serial_run_leaves_global_rngs_alone():
+    import random
+    random.seed(42)
+    np.random.seed(42)
+    expected = (random.random(), np.random.random())
+    random.seed(42)
+    np.random.seed(42)
+    WalkForward(create_bars(), Backtester, is_window=1000, oos_window=500, log_trades=False).run()
+    assert (random.random(), np.random.random()) == expected
@@ -0,0 +1,139 @@
+# backend/trading/latency.py
+
+import os
+import json
+import time
+from collections import deque
+from contextlib import contextmanager
+import numpy as np
+
+# Histogram bucket upper bounds in seconds (100us .. 10s, Prometheus 'le' labels)
+DEFAULT_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025,
+                   0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+QUANTILES = (0.5, 0.99)
+
+
+class LatencyHistogram:
+    """
+    Latency distribution of one stage.
+
+    Keeps cumulative bucket counts, count and sum for the whole lifetime
+    (exported as a Prometheus histogram) plus the last `window` samples,
+    from which p50/p99 are computed exactly.
+    """
+
+    def __init__(self, buckets=DEFAULT_BUCKETS, window=1024):
+        self.buckets = np.asarray(buckets, dtype=float)
+        self.counts = np.zeros(len(self.buckets) + 1, dtype=np.int64)  # last = +Inf
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+        self.recent = deque(maxlen=window)
+
+    def observe(self, seconds):
+        self.counts[np.searchsorted(self.buckets, seconds)] += 1
+        self.count += 1
+        self.sum += seconds
+        self.max = max(self.max, seconds)
+        self.recent.append(seconds)
+
+    def quantile(self, q):
+        """q-quantile over the rolling window (NaN before any sample)"""
+        if not self.recent:
+            return np.nan
+        return float(np.quantile(np.fromiter(self.recent, float, len(self.recent)), q))
+
+    def summary(self):
+        return {
+            "count": self.count,
+            "mean": self.sum / self.count if self.count else np.nan,
+            "p50": self.quantile(0.5),
+            "p99": self.quantile(0.99),
+            "max": self.max,
+            "last": self.recent[-1] if self.recent else np.nan,
+        }
+
+
+class LatencyRecorder:
+    """
+    Per-stage latency timers for a trading cycle.
+
+        with recorder.stage("features"):
+            ...
+        recorder.observe("signal_to_order", seconds)
+
+    summary() gives count/mean/p50/p99/max per stage; to_prometheus() and
+    to_json() render the same data, and export(path) writes it atomically
+    (.json -> JSON, anything else -> Prometheus text format, e.g. for the
+    node_exporter textfile collector).
+    """
+
+    def __init__(self, prefix="trading", buckets=DEFAULT_BUCKETS, window=1024):
+        """
+        prefix: metric name prefix (<prefix>_stage_seconds)
+        buckets: histogram bucket bounds in seconds
+        window: samples kept per stage for p50/p99
+        """
+        self.prefix = prefix
+        self.buckets = buckets
+        self.window = window
+        self.stages = {}
+
+    def histogram(self, name):
+        if name not in self.stages:
+            self.stages[name] = LatencyHistogram(self.buckets, self.window)
+        return self.stages[name]
+
+    def observe(self, name, seconds):
+        self.histogram(name).observe(seconds)
+
+    @contextmanager
+    def stage(self, name):
+        """Time the enclosed block as one sample of stage `name`"""
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - t0)
+
+    def summary(self):
+        return {name: hist.summary() for name, hist in self.stages.items()}
+
+    def to_json(self):
+        return json.dumps(
+            {name: {k: (None if v != v else v) for k, v in stats.items()} for name, stats in self.summary().items()},
+            indent=2
+        )
+
+    def to_prometheus(self):
+        metric = f"{self.prefix}_stage_seconds"
+        lines = [
+            f"# HELP {metric} Latency of each trading pipeline stage in seconds.",
+            f"# TYPE {metric} histogram",
+        ]
+        for name, hist in self.stages.items():
+            cumulative = np.cumsum(hist.counts)
+            for bound, n in zip(hist.buckets, cumulative):
+                lines.append(f'{metric}_bucket{{stage="{name}",le="{bound:g}"}} {n}')
+            lines.append(f'{metric}_bucket{{stage="{name}",le="+Inf"}} {cumulative[-1]}')
+            lines.append(f'{metric}_sum{{stage="{name}"}} {hist.sum:.9g}')
+            lines.append(f'{metric}_count{{stage="{name}"}} {hist.count}')
+
+        quantiles = f"{metric}_quantile"
+        lines += [
+            f"# HELP {quantiles} Rolling-window latency quantiles of each stage in seconds.",
+            f"# TYPE {quantiles} gauge",
+        ]
+        for name, hist in self.stages.items():
+            for q in QUANTILES:
+                lines.append(f'{quantiles}{{stage="{name}",quantile="{q:g}"}} {hist.quantile(q):.9g}')
+        return "\n".join(lines) + "\n"
+
+    def export(self, path):
+        """Write metrics to path (JSON for *.json, Prometheus text otherwise)"""
+        text = self.to_json() if str(path).endswith(".json") else self.to_prometheus()
+        tmp = f"{path}.tmp"
+        with open(tmp, "w") as f:
+            f.write(text)
+        os.replace(tmp, path)
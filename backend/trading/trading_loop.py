@@ -3,45 +3,59 @@
 import time
 import pandas as pd
 import numpy as np
-import MetaTrader5 as mt5
 
-from backend.data.mt5_data import MT5DataFetcher
-from backend.core.regime_detector import RegimeDetector
-from backend.core.feature_engineer import FeatureEngineer
-from backend.core.signal_generator import SignalGenerator
-from backend.core.validator import Validator
-from backend.risk.risk_manager import RiskManager
-from backend.risk.kill_switch import KillSwitch
-from backend.execution.mt5_executor import MT5Executor
+from data.mt5_data import MT5HistoryCache
+from core.pipeline import Pipeline, PRICE_COLUMNS
+from risk.risk_manager import RiskManager
+from risk.kill_switch import KillSwitch
+from execution.mt5_executor import MT5Executor
+from trading.latency import LatencyRecorder
+
 
 
 class TradingLoop:
-    def __init__(self, mode="paper"):
+    def __init__(self, mode="paper", history=None, latency=None, symbol="XAUUSD", executor=None):
+        """
+        mode: "paper" or "live"
+        symbol: symbol traded by the loop
+        executor: MT5Executor to send orders through (a new one for `mode` if not given)
+        history: MT5HistoryCache to fetch bars from (created in live mode if not given;
+                 paper mode uses dummy bars without one, e.g. a live.replay.ReplayHistory)
+        latency: LatencyRecorder collecting per-stage timings (a new one if not given)
+        """
         self.mode = mode
-
-        # Core components
-        self.feature_engineer = FeatureEngineer()
-        self.regime_detector = RegimeDetector()
-        self.signal_generator = SignalGenerator()
-        self.validator = Validator()
+        self.symbol = symbol
+        self.history = history
+        self.latency = latency or LatencyRecorder()
 
         # Risk & execution
         self.risk_manager = RiskManager(account_equity=100_000, risk_per_trade=0.01)
         self.kill_switch = KillSwitch(max_drawdown_pct=0.2, min_expectancy=0.1)
-        self.executor = MT5Executor(mode=mode)
+        self.executor = executor or MT5Executor(mode=mode)
+
+        # Core components (each batch stage is timed as a latency stage)
+        self.pipeline = Pipeline(
+            risk_manager=self.risk_manager,
+            kill_switch=self.kill_switch,
+            executor=self.executor,
+            expectancy=0.5,
+            timer=self.latency.stage
+        )
 
         # Reset kill switch state
         self.kill_switch.reset(equity=100_000)
 
         # Ensure MT5 initialized (paper trading can bypass)
-        if not mt5.initialize() and self.mode != "paper":
-            raise RuntimeError(f"MT5 initialization failed: {mt5.last_error()}")
+        if self.mode != "paper" and self.history is None:
+            self.history = MT5HistoryCache()
 
-    def fetch_market_data(self, symbol="XAUUSD", bars=200, timeframe=mt5.TIMEFRAME_M1):
+    def fetch_market_data(self, symbol=None, bars=200, timeframe="M1"):
         """
-        Fetch OHLC data from MT5. Falls back to dummy data if MT5 fails.
+        Fetch OHLC data from MT5 (symbol: default self.symbol). Falls back to dummy data if MT5 fails.
+        Only bars newer than the previous cycle are requested; the window is
+        served from the history cache.
         """
-        if self.mode == "paper":
+        if self.mode == "paper" and self.history is None:
             # Dummy historical data for paper trading
             df = pd.DataFrame({
                 "xau_open": [1900 + i for i in range(bars)],
@@ -51,13 +65,14 @@ class TradingLoop:
             })
             return df
 
-        # Live MT5 fetch
+        # Live MT5 (or replayed) fetch (incremental)
+        symbol = symbol or self.symbol
         try:
-            fetcher = MT5DataFetcher(symbol=symbol, timeframe=timeframe, bars=bars)
-            df = fetcher.fetch()
+            self.history.sync(symbol, timeframe)
+            df = self.history.window(symbol, timeframe, bars)
             if df is None or df.empty:
                 raise ValueError("No data fetched from MT5, using dummy fallback.")
-            return df
+            return df.rename(columns=PRICE_COLUMNS)
         except Exception as e:
             print("MT5 fetch failed:", e)
             # fallback
@@ -70,74 +85,70 @@ class TradingLoop:
             return df
 
     def run_once(self, force_test_trade=True):
+        """
+        One cycle: fetch -> features -> regime -> signal -> validate -> risk -> execute.
+        Each stage, the whole cycle and the signal-to-order latency are
+        recorded in self.latency.
+        """
+        with self.latency.stage("cycle"):
+            return self._run_once(force_test_trade)
+
+    def _run_once(self, force_test_trade):
+        stage = self.latency.stage
+
         # 1️⃣ Fetch market data
-        data = self.fetch_market_data()
+        with stage("fetch"):
+            data = self.fetch_market_data()
         if data is None or len(data) < 50:
             print("Not enough data to trade.")
             return
 
-        # 2️⃣ Feature engineering
-        data = self.feature_engineer.add_features(data)
-
-        # Ensure key columns exist
-        if "xau_close" not in data.columns:
-            data["xau_close"] = 1900 + np.arange(len(data))
-        if "volatility_10" not in data.columns:
-            data["volatility_10"] = data["xau_close"].pct_change().rolling(10).std().fillna(0.001)
-        data["volatility_10"] = data["volatility_10"].replace(0, 0.001)
-
-        # 3️⃣ Regime detection
-        data = self.regime_detector.detect(data)
-
-        # 4️⃣ Signal generation
-        data = self.signal_generator.generate(data)
-
-        # 🚨 Force a test signal if requested
+        # 2️⃣-5️⃣ Features, regime, signal, validation
+        after = {}
         if force_test_trade:
+            # 🚨 Force a test signal on the last bar (before validation)
             print("FORCED TEST SIGNAL TRIGGERED")
-            data.loc[data.index[-1], "signal"] = 1
-
-        # 5️⃣ Validation
-        data = self.validator.validate(data, state={})
+            after["signal"] = lambda frame: {"signal": np.append(frame["signal"].to_numpy()[:-1], 1)}
+        data = self.pipeline.run(data, after=after)
+        signal_time = time.perf_counter()
 
         # 6️⃣ Grab latest row
         latest = data.iloc[-1]
         signal = int(latest.get("signal", 0))
-        entry_price = float(latest.get("xau_close", 1900))
-        atr = float(latest.get("volatility_10", 5))
+        # Return volatility as SL distance (floored so the stop is never at the entry)
+        atr = float(latest.get("volatility_10", 5)) or 0.001
 
         if signal == 0:
             print("No trade signal.")
             return
 
-        # 7️⃣ Kill switch
-        if not self.kill_switch.is_system_active(equity=self.risk_manager.account_equity, expectancy=0.5):
+        # 7️⃣-8️⃣ Kill switch, SL/TP and position size
+        with stage("risk"):
+            params = self.pipeline.plan(self.symbol, latest, atr=atr)
+        if params is None:
             print("Kill switch active – trading halted")
             return
 
-        # 8️⃣ Risk management: SL/TP
-        sl, tp, sl_dist, tp_dist = self.risk_manager.apply_sl_tp(entry_price=entry_price, direction=signal, atr=atr)
-
-        # Ensure valid SL/TP values
-        if sl is None or np.isnan(sl):
-            sl = entry_price - atr if signal > 0 else entry_price + atr
-        if tp is None or np.isnan(tp):
-            tp = entry_price + 2 * atr if signal > 0 else entry_price - 2 * atr
-
-        # Calculate position size safely
-        volume = self.risk_manager.calculate_position_size(entry_price=entry_price, stop_loss_price=sl)
-        if volume is None or np.isnan(volume):
-            volume = 1  # fallback
-
         # 9️⃣ Execute trade
-        trade = self.executor.send_order(symbol="XAUUSD", direction=signal, volume=volume, price=entry_price, sl=sl, tp=tp)
+        with stage("execute"):
+            trade = self.executor.send_order(**params)
+        self.latency.observe("signal_to_order", time.perf_counter() - signal_time)
         print("Trade executed:", trade)
 
-    def run_forever(self, interval_seconds=60):
+    def export_metrics(self, path):
+        """Write latency metrics (Prometheus text, or JSON for *.json)"""
+        self.latency.export(path)
+
+    def run_forever(self, interval_seconds=60, metrics_file=None):
+        """
+        metrics_file: latency metrics rewritten after every cycle (optional)
+        """
         print(f"Starting trading loop in {self.mode.upper()} mode...")
         while True:
             try:
                 self.run_once(force_test_trade=False)
+                if metrics_file:
+                    self.export_metrics(metrics_file)
                 time.sleep(interval_seconds)
             except Exception as e:
                 print("Trading loop error:", e)